@@ -8,19 +8,126 @@ class Settings:
     # AI Model Configuration - Gemini first, OpenAI as fallback
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+    # Structured outputs need a model that supports json_schema response formats
+    OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    
+    # LLM routing: comma-separated provider order, e.g. "gemini,openai,local"
+    LLM_PROVIDERS = os.getenv("LLM_PROVIDERS", "")
+    LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+    LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "1.0"))
+    LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    LLM_FAILURE_COOLDOWN = float(os.getenv("LLM_FAILURE_COOLDOWN", "30"))
+    LLM_QUOTA_COOLDOWN = float(os.getenv("LLM_QUOTA_COOLDOWN", "300"))
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    LOCAL_LLM_LATENCY_MS = int(os.getenv("LOCAL_LLM_LATENCY_MS", "0"))
+    
+    # Alternative API endpoints, e.g. the local stand-ins of the load test (loadtest/)
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
+    GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
+    
+    # Token budget for the job description and resume text sent to the LLM
+    LLM_PROMPT_TOKEN_BUDGET = int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", "1200"))
     
     # Google Calendar
     GOOGLE_CALENDAR_CREDENTIALS_FILE = os.getenv("GOOGLE_CALENDAR_CREDENTIALS_FILE", "app/credentials.json")
     GOOGLE_CALENDAR_TOKEN_FILE = os.getenv("GOOGLE_CALENDAR_TOKEN_FILE", "token.json")
+    # Calendar API base URL including the service path, e.g. http://127.0.0.1:8602/calendar/v3/;
+    # when set, requests go there without OAuth credentials
+    GOOGLE_CALENDAR_API_ENDPOINT = os.getenv("GOOGLE_CALENDAR_API_ENDPOINT")
     
     # Email Configuration
     EMAIL_USER = os.getenv("EMAIL_USER")
     EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
+    SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+    SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+    SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
     
     # Database
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./hr_agent.db")
     
     # File Upload
     UPLOAD_DIR = "uploads"
+    MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 ** 2)))
+    UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 ** 2)))
+    
+    # Upload storage compaction (compact.py, or in the API process every
+    # STORAGE_COMPACTION_INTERVAL seconds; 0 disables the background task)
+    STORAGE_COMPACTION_INTERVAL = int(os.getenv("STORAGE_COMPACTION_INTERVAL", "0"))
+    # Files no candidate refers to are deleted once untouched for this long
+    STORAGE_ORPHAN_GRACE_HOURS = float(os.getenv("STORAGE_ORPHAN_GRACE_HOURS", "24"))
+    # Resumes are deleted this many days after upload, or after the interview
+    # for scheduled candidates; candidates of the newest job are kept. 0 keeps forever
+    RESUME_RETENTION_DAYS = int(os.getenv("RESUME_RETENTION_DAYS", "0"))
+    RESUME_RETENTION_SCHEDULED_DAYS = int(os.getenv("RESUME_RETENTION_SCHEDULED_DAYS", "0"))
+    # Resumes not uploaded again for this many days are gzip-compressed; 0 disables
+    RESUME_COMPRESS_AFTER_DAYS = int(os.getenv("RESUME_COMPRESS_AFTER_DAYS", "0"))
+    
+    # First-page PDF thumbnails, cached on disk by content hash
+    THUMBNAILS_ENABLED = os.getenv("THUMBNAILS_ENABLED", "true").lower() == "true"
+    THUMBNAIL_DIR = os.getenv("THUMBNAIL_DIR", "thumbnails")
+    THUMBNAIL_WIDTHS = [int(width) for width in os.getenv("THUMBNAIL_WIDTHS", "160,320,640").split(",")]
+    THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "2"))
+    
+    # PDF extraction limits
+    MAX_PDF_BYTES = int(os.getenv("MAX_PDF_BYTES", str(20 * 1024 ** 2)))
+    MAX_PDF_PAGES = int(os.getenv("MAX_PDF_PAGES", "500"))
+    PDF_PAGE_LIMIT = int(os.getenv("PDF_PAGE_LIMIT", "10"))
+    PDF_CHAR_BUDGET = int(os.getenv("PDF_CHAR_BUDGET", "20000"))
+    CONTACT_SCAN_PAGES = int(os.getenv("CONTACT_SCAN_PAGES", "2"))
+    
+    # ZIP archive upload limits
+    MAX_ZIP_ARCHIVE_BYTES = int(os.getenv("MAX_ZIP_ARCHIVE_BYTES", str(2 * 1024 ** 3)))
+    MAX_ZIP_UNCOMPRESSED_BYTES = int(os.getenv("MAX_ZIP_UNCOMPRESSED_BYTES", str(4 * 1024 ** 3)))
+    MAX_ZIP_MEMBER_BYTES = int(os.getenv("MAX_ZIP_MEMBER_BYTES", str(25 * 1024 ** 2)))
+    MAX_ZIP_MEMBERS = int(os.getenv("MAX_ZIP_MEMBERS", "10000"))
+    MAX_ZIP_COMPRESSION_RATIO = float(os.getenv("MAX_ZIP_COMPRESSION_RATIO", "100"))
+    
+    # Near-duplicate detection (MinHash LSH)
+    DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.9"))
+    DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "128"))
+    DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "16"))
+    # Signatures stored by other processes (screening workers) are picked up this often, in seconds
+    DEDUP_REFRESH_INTERVAL = float(os.getenv("DEDUP_REFRESH_INTERVAL", "5"))
+    
+    # Scoring features stored by other processes are picked up this often, in seconds
+    FEATURES_REFRESH_INTERVAL = float(os.getenv("FEATURES_REFRESH_INTERVAL", "5"))
+    
+    # Candidate x job matching: LLM refinement is limited to the best cells
+    MATCH_MAX_REFINE = int(os.getenv("MATCH_MAX_REFINE", "50"))
+    MATCH_REFINE_CONCURRENCY = int(os.getenv("MATCH_REFINE_CONCURRENCY", "4"))
+    
+    # Logging and request tracing
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # "text" or "json"
+    TRACE_SLOW_MS = float(os.getenv("TRACE_SLOW_MS", "2000"))
+    TRACE_KEEP = int(os.getenv("TRACE_KEEP", "100"))
+    # Opt-in /api/debug/traces listing recent slow requests
+    TRACE_DEBUG_ENABLED = os.getenv("TRACE_DEBUG_ENABLED", "false").lower() == "true"
+    
+    # Admission control for upload and scheduling endpoints
+    ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "4"))
+    ADMISSION_MAX_PER_USER = int(os.getenv("ADMISSION_MAX_PER_USER", "2"))
+    ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+    ADMISSION_MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "30"))
+    # Requests are attributed to users by this header, else by client address
+    ADMISSION_USER_HEADER = os.getenv("ADMISSION_USER_HEADER", "X-User-Id")
+    
+    # Durable screening queue and its workers (worker.py)
+    SCREENING_QUEUE_ENABLED = os.getenv("SCREENING_QUEUE_ENABLED", "false").lower() == "true"
+    SCREENING_LEASE_SECONDS = int(os.getenv("SCREENING_LEASE_SECONDS", "600"))
+    SCREENING_MAX_ATTEMPTS = int(os.getenv("SCREENING_MAX_ATTEMPTS", "3"))
+    WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", "1"))
+    WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "4"))
+    WORKER_POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "1.0"))
+    # Worker processes serve /metrics on consecutive ports from here; 0 disables
+    WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", "0"))
+    
+    # Bulk ingestion (ingest.py)
+    INGEST_PARSE_WORKERS = int(os.getenv("INGEST_PARSE_WORKERS", os.cpu_count() or 2))
+    INGEST_SCORE_CONCURRENCY = int(os.getenv("INGEST_SCORE_CONCURRENCY", "4"))
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "200"))
 
 settings = Settings()
\ No newline at end of file
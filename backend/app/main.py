@@ -1,22 +1,70 @@
-from fastapi import FastAPI, UploadFile, File, Depends, HTTPException
+from fastapi import FastAPI, UploadFile, File, Depends, HTTPException, Request, Response, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
 import os
-import shutil
+import uuid
 from datetime import datetime, timedelta
 
-from app.models.schemas import JobDescription, CandidateScore
-from app.services.resume_parser import ResumeParser
+from app.models.schemas import JobDescription, CandidateScore, MatchRequest
+from app.services.resume_parser import ResumeParser, ResumeRejected
 from app.services.ai_agent import AIAgent
 from app.services.calendar_service import GoogleCalendarService
 from app.services.email_service import EmailService
-from app.utils.database import get_db, Candidate, Job
+from app.services.dedup import DuplicateDetector
+from app.services.feature_store import FeatureStore
+from app.services.ranking import Ranking
+from app.services.matching_engine import MatchingEngine
+from app.services.thumbnails import ThumbnailService, THUMBNAIL_FORMATS
+from app.services.events import EventBroker
+from app.services.resume_document import job_profile, job_text
+from app.services.screening import ScreeningPipeline, ScreeningQueue
+from app.services.admission import AdmissionController, AdmissionMiddleware
+from app.services.compaction import StorageCompactor
+from app.utils.database import get_db, SessionLocal, Candidate, Job
+from app.utils.archive import iter_zip_pdfs, ArchiveLimitError
+from app.utils.uploads import save_upload, UploadRejected
+from app.utils.ids import file_content_hash
+from app.utils.payload_cache import PayloadCache, payload_response
+from app.utils import export
+from app.utils.metrics import QUEUE_DEPTH, METRICS_CONTENT_TYPE, register_memo_cache, render_metrics
+from app.utils.tracing import SlowTraceLog, TracingMiddleware, start_trace
+from app.utils.log import configure_logging
 from app.config import settings
 
+configure_logging()
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="HR AI Agent", version="1.0.0")
 
+# Admission control: bounded concurrency for the expensive endpoints.
+# Added before CORS so that 429 responses still carry CORS headers.
+# A batch upload holds its slot until run_batch, its background task, is done.
+admission = AdmissionController(
+    max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+    max_per_user=settings.ADMISSION_MAX_PER_USER,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    max_wait=settings.ADMISSION_MAX_WAIT
+)
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission,
+        routes=[
+            ("POST", "/api/upload-resumes"),
+            ("POST", "/api/upload-resumes-zip"),
+            ("POST", "/api/batches"),
+            ("POST", "/api/schedule-interviews"),
+        ],
+        user_header=settings.ADMISSION_USER_HEADER
+    )
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -24,8 +72,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After", "Server-Timing", "X-Request-ID"],
 )
 
+# Request tracing: outermost, so Server-Timing covers admission and CORS too
+slow_traces = SlowTraceLog(threshold_ms=settings.TRACE_SLOW_MS, keep=settings.TRACE_KEEP)
+app.add_middleware(TracingMiddleware, slow_traces=slow_traces, logger=logger)
+
 # Static files
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
@@ -34,18 +87,42 @@ resume_parser = ResumeParser()
 ai_agent = AIAgent()
 calendar_service = GoogleCalendarService()
 email_service = EmailService()
+duplicate_detector = DuplicateDetector()
+feature_store = FeatureStore()
+matching_engine = MatchingEngine(feature_store, ai_agent, resume_parser)
+thumbnail_service = ThumbnailService()
+event_broker = EventBroker()
+screening_pipeline = ScreeningPipeline(resume_parser, ai_agent, duplicate_detector, feature_store, thumbnail_service)
+screening_queue = ScreeningQueue()
+storage_compactor = StorageCompactor()
 
 # Create uploads directory
 os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 
 # Global storage for current job and candidates
 current_job = None
-current_candidates = []
+current_job_id = None
+current_ranking = Ranking.from_scores([])
+# Bumped whenever current_ranking changes; keys the serialized list cache
+ranking_version = 0
+candidates_cache = PayloadCache("candidates")
+
+# Queue depths of in-process work are read when metrics are scraped
+QUEUE_DEPTH.labels("admission_waiting").set_function(lambda: admission.stats()["waiting"])
+QUEUE_DEPTH.labels("admission_in_flight").set_function(lambda: admission.stats()["in_flight"])
+QUEUE_DEPTH.labels("thumbnails").set_function(lambda: thumbnail_service.pending)
+register_memo_cache("job_profile", job_profile)
+
+def publish_ranking(ranking: Ranking):
+    """Replace the current ranking"""
+    global current_ranking, ranking_version
+    current_ranking = ranking
+    ranking_version += 1
 
 @app.post("/api/job-description")
 async def create_job_description(job_desc: JobDescription, db: Session = Depends(get_db)):
     """Create a new job description"""
-    global current_job
+    global current_job, current_job_id
     
     job = Job(
         title=job_desc.title,
@@ -61,75 +138,428 @@ async def create_job_description(job_desc: JobDescription, db: Session = Depends
     db.refresh(job)
     
     current_job = job_desc
+    current_job_id = job.id
     return {"message": "Job description created", "job_id": job.id}
 
+@app.put("/api/job-description/{job_id}")
+async def update_job_description(job_id: str, job_desc: JobDescription, limit: int = 50, db: Session = Depends(get_db)):
+    """Edit a job description and re-rank every stored resume against it"""
+    global current_job, current_job_id
+    
+    job = db.get(Job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    job.title = job_desc.title
+    job.description = job_desc.description
+    job.requirements = job_desc.requirements
+    job.location = job_desc.location
+    job.department = job_desc.department
+    db.commit()
+    
+    current_job = job_desc
+    current_job_id = job_id
+    candidates = await run_in_threadpool(rescore_pool, db, limit)
+    publish_ranking(Ranking.from_scores(candidates, summarize=rescore_summary))
+    
+    return {
+        "message": f"Job description updated, re-ranked {len(candidates)} candidates",
+        "job_id": job_id,
+        "candidates": candidates
+    }
+
+@app.post("/api/rescore")
+async def rescore_candidates(limit: int = 50, db: Session = Depends(get_db)):
+    """Re-rank every stored resume against the current job without any LLM calls"""
+    if not current_job:
+        raise HTTPException(status_code=400, detail="Please create a job description first")
+    
+    candidates = await run_in_threadpool(rescore_pool, db, limit)
+    publish_ranking(Ranking.from_scores(candidates, summarize=rescore_summary))
+    return {
+        "message": f"Re-ranked {len(candidates)} candidates",
+        "candidates": candidates
+    }
+
+@app.post("/api/match-matrix")
+async def match_matrix(request: MatchRequest, db: Session = Depends(get_db)):
+    """Score a set of candidates against a set of jobs and list each candidate's best-fit jobs"""
+    return await run_in_threadpool(
+        matching_engine.match,
+        db,
+        job_ids=request.job_ids,
+        candidate_ids=request.candidate_ids,
+        top_jobs=request.top_jobs,
+        refine_top=request.refine_top,
+        include_matrix=request.include_matrix
+    )
+
+def rescore_summary(score: float, skills_match: List[str]) -> str:
+    """Summary of a rule-based re-score; re-scored rankings write it again when listed"""
+    key_match = f"Technical skills: {', '.join(skills_match[:3])}" if skills_match else None
+    return f"Rule-based re-score: {int(score)}/100. " + (
+        f"Key match: {key_match}" if key_match else "Needs detailed review"
+    )
+
+def rescore_pool(db: Session, limit: int) -> List[CandidateScore]:
+    """Rule-based scores for the whole stored pool against the current job, best first"""
+    # Screening workers may have stored resumes since the last re-score
+    feature_store.refresh(db)
+    
+    ranked = feature_store.rank(job_profile(job_text(current_job)), limit)
+    logger.debug("Re-scored stored resumes", extra={"count": len(feature_store)})
+    
+    # Only the rows that made the cut are loaded from the database
+    rows = {
+        candidate.id: candidate
+        for candidate in db.query(Candidate).filter(Candidate.id.in_([candidate_id for candidate_id, _, _ in ranked]))
+    }
+    
+    candidates = []
+    for candidate_id, score, skills_match in ranked:
+        row = rows.get(candidate_id)
+        if row is None:
+            continue
+        candidates.append(CandidateScore(
+            candidate_id=row.id,
+            name=row.name,
+            email=row.email,
+            phone=row.phone,
+            score=float(score),
+            summary=rescore_summary(score, skills_match),
+            skills_match=skills_match,
+            experience_years=row.experience_years,
+            resume_path=row.resume_path or ''
+        ))
+    return candidates
+
+def process_resume(file_path: str, db: Session, notify: Optional[Callable[[str, Dict], None]] = None) -> CandidateScore:
+    """Parse, score and store a single resume saved at file_path against the current job
+
+    notify, if given, is called with (event, data) as the resume moves through
+    the pipeline. The resume is committed once stored.
+    """
+    return screening_pipeline.process(file_path, db, current_job_id, job_text(current_job), notify)
+
 @app.post("/api/upload-resumes")
 async def upload_resumes(files: List[UploadFile] = File(...), db: Session = Depends(get_db)):
-    """Upload and process multiple resumes"""
-    global current_candidates
-    
+    """Upload and process multiple resumes
+
+    With SCREENING_QUEUE_ENABLED the files are only stored and queued for the
+    screening workers (worker.py); the response carries the screening job id
+    to follow at /api/jobs/{id}.
+    """
     if not current_job:
         raise HTTPException(status_code=400, detail="Please create a job description first")
     
     candidates = []
+    skipped = []
+    saved = []
     
     for file in files:
-        if not file.filename.endswith('.pdf'):
-            continue
-            
         # Save file
-        file_path = os.path.join(settings.UPLOAD_DIR, file.filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Parse resume
-        resume_data = resume_parser.parse_resume(file_path)
+        try:
+            file_path = await save_upload(file, settings.UPLOAD_DIR)
+        except UploadRejected as e:
+            skipped.append({"file": file.filename, "reason": str(e)})
+            continue
         
-        # AI analysis
-        job_text = f"{current_job.title}\n{current_job.description}\n{current_job.requirements}"
-        candidate_score = ai_agent.analyze_resume_match(
-            resume_data['full_text'], 
-            job_text, 
-            resume_data
-        )
+        if settings.SCREENING_QUEUE_ENABLED:
+            saved.append((file.filename, file_path))
+            continue
         
-        # Save to database
-        candidate = Candidate(
-            name=candidate_score.name,
-            email=candidate_score.email,
-            phone=candidate_score.phone,
-            score=candidate_score.score,
-            summary=candidate_score.summary,
-            skills_match=str(candidate_score.skills_match),
-            experience_years=candidate_score.experience_years,
-            resume_path=file_path,
-            created_at=datetime.now()
-        )
+        try:
+            candidates.append(await run_in_threadpool(process_resume, file_path, db))
+        except ResumeRejected as e:
+            skipped.append({"file": file.filename, "reason": str(e)})
+    
+    if settings.SCREENING_QUEUE_ENABLED:
+        screening_job = await run_in_threadpool(screening_queue.enqueue, db, current_job_id, saved)
+        return JSONResponse(status_code=202, content={
+            "message": f"Queued {len(saved)} resumes for screening",
+            "screening_job_id": screening_job.id,
+            "status_url": f"/api/jobs/{screening_job.id}",
+            "skipped": skipped
+        })
+    
+    # Rank candidates, listing a resume uploaded twice only once
+    unique = {candidate.candidate_id: candidate for candidate in candidates}
+    ranked = ai_agent.rank_candidates(list(unique.values()))
+    publish_ranking(Ranking.from_scores(ranked))
+    
+    return {
+        "message": f"Processed {len(candidates)} resumes",
+        "skipped": skipped,
+        "candidates": ranked
+    }
+
+@app.get("/api/jobs/{screening_job_id}")
+async def get_screening_job(screening_job_id: str, include_tasks: bool = False, include_results: bool = False,
+                            db: Session = Depends(get_db)):
+    """Progress of a queued screening job, optionally with per-file status and ranked results"""
+    progress = await run_in_threadpool(screening_queue.progress, db, screening_job_id, include_tasks or include_results)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Screening job not found")
+    
+    if include_results:
+        candidate_ids = [task["candidate_id"] for task in progress["tasks"] if task["candidate_id"]]
+        rows = await run_in_threadpool(lambda: db.query(Candidate).filter(Candidate.id.in_(candidate_ids)).all())
+        progress["results"] = ai_agent.rank_candidates([row.to_score() for row in rows])
+        if not include_tasks:
+            del progress["tasks"]
+    
+    return progress
+
+@app.post("/api/batches")
+async def start_batch(background_tasks: BackgroundTasks, files: List[UploadFile] = File(...)):
+    """Upload resumes and screen them in the background
+
+    Returns immediately with a batch id; progress and results stream from
+    /api/batches/{batch_id}/events as each resume is processed.
+    """
+    if not current_job:
+        raise HTTPException(status_code=400, detail="Please create a job description first")
+    
+    batch_id = str(uuid.uuid4())
+    event_broker.open(batch_id)
+    
+    saved = []
+    rejected = 0
+    for file in files:
+        try:
+            file_path = await save_upload(file, settings.UPLOAD_DIR)
+        except UploadRejected as e:
+            rejected += 1
+            event_broker.publish(batch_id, "skipped", {"file": file.filename, "reason": str(e)})
+            continue
+        saved.append((file.filename, file_path))
+        event_broker.publish(batch_id, "uploaded", {"file": file.filename})
+    
+    background_tasks.add_task(run_batch, batch_id, saved, rejected)
+    
+    return {
+        "batch_id": batch_id,
+        "files": len(saved),
+        "events_url": f"/api/batches/{batch_id}/events"
+    }
+
+def run_batch(batch_id: str, files: List[Tuple[str, str]], skipped: int = 0):
+    """Screen an uploaded batch, publishing an event for every step"""
+    # Runs after the upload request has been answered, so it gets its own trace
+    with start_trace(f"batch {batch_id}") as trace:
+        db = SessionLocal()
+        # Only the compact ranking is kept, however many resumes the batch has
+        ranking = Ranking.from_scores([])
         
-        db.add(candidate)
-        candidates.append(candidate_score)
+        try:
+            for filename, file_path in files:
+                def notify(event: str, data: Dict):
+                    event_broker.publish(batch_id, event, {"file": filename, **data})
+                
+                try:
+                    candidate_score = process_resume(file_path, db, notify)
+                except ResumeRejected as e:
+                    db.rollback()
+                    skipped += 1
+                    notify("skipped", {"reason": str(e)})
+                    continue
+                except Exception as e:
+                    db.rollback()
+                    skipped += 1
+                    logger.exception("Failed to process resume", extra={"file": filename})
+                    notify("failed", {"reason": str(e)})
+                    continue
+                
+                # Publish the partial ranking so reviewers can start on the top candidates
+                ranking, rank = ranking.insert(candidate_score)
+                publish_ranking(ranking)
+                
+                notify("scored", {
+                    "candidate": candidate_score.model_dump(),
+                    "rank": rank,
+                    "ranked": len(ranking)
+                })
+            
+            event_broker.publish(batch_id, "done", {"processed": len(ranking), "skipped": skipped})
+        finally:
+            event_broker.close(batch_id)
+            db.close()
     
-    db.commit()
+    slow_traces.offer(trace)
+    logger.info("Batch finished", extra={
+        "batch_id": batch_id,
+        "processed": len(ranking),
+        "skipped": skipped,
+        "duration_ms": round(trace.duration_ms, 1),
+        **{f"{name}_ms": round(ms, 1) for name, ms in trace.totals().items()}
+    })
+
+@app.get("/api/batches/{batch_id}/events")
+async def batch_events(batch_id: str, request: Request):
+    """Server-Sent Events stream of a batch's progress"""
+    if not event_broker.exists(batch_id):
+        raise HTTPException(status_code=404, detail="Batch not found")
     
-    # Rank candidates
-    current_candidates = ai_agent.rank_candidates(candidates)
+    # EventSource sends the last id it saw when it reconnects
+    try:
+        last_event_id = int(request.headers.get("last-event-id", 0))
+    except ValueError:
+        last_event_id = 0
+    
+    async def stream():
+        yield b"retry: 3000\n\n"
+        async for event in event_broker.subscribe(batch_id, last_event_id):
+            if await request.is_disconnected():
+                break
+            yield event.to_sse() if event is not None else b": keepalive\n\n"
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/upload-resumes-zip")
+async def upload_resumes_zip(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """Upload a ZIP archive of resumes and process each PDF as it is extracted"""
+    if not current_job:
+        raise HTTPException(status_code=400, detail="Please create a job description first")
+    
+    # The upload is spooled to a temporary file, so its size is known without reading it
+    if file.size is not None and file.size > settings.MAX_ZIP_ARCHIVE_BYTES:
+        raise HTTPException(status_code=413, detail="Archive too large")
+    
+    candidates = []
+    skipped = []
+    members = iter_zip_pdfs(file.file, settings.UPLOAD_DIR)
+    
+    try:
+        # Extraction is blocking file I/O, so pull each member in the threadpool
+        while (item := await run_in_threadpool(next, members, None)) is not None:
+            member, file_path, error = item
+            if error:
+                skipped.append({"file": member, "reason": error})
+                continue
+            
+            try:
+                candidates.append(await run_in_threadpool(process_resume, file_path, db))
+            except ResumeRejected as e:
+                skipped.append({"file": member, "reason": str(e)})
+    except ArchiveLimitError as e:
+        # Members screened before the limit was hit stay stored, like separate uploads
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    # Rank candidates, listing a resume uploaded twice only once
+    unique = {candidate.candidate_id: candidate for candidate in candidates}
+    ranked = ai_agent.rank_candidates(list(unique.values()))
+    publish_ranking(Ranking.from_scores(ranked))
     
     return {
         "message": f"Processed {len(candidates)} resumes",
-        "candidates": current_candidates
+        "skipped": skipped,
+        "candidates": ranked
     }
 
 @app.get("/api/candidates")
-async def get_candidates():
-    """Get ranked candidates"""
-    return {"candidates": current_candidates}
+async def get_candidates(request: Request, db: Session = Depends(get_db)):
+    """Get ranked candidates
+
+    The list is serialized once per ranking, so repeated polls only pay for
+    an ETag comparison or a cached compressed body.
+    """
+    ranking, key = current_ranking, (current_job_id, ranking_version)
+    payload = await run_in_threadpool(candidates_cache.get, key, lambda: {"candidates": ranking.load(db)})
+    return payload_response(request, payload)
+
+@app.get("/api/candidates/export")
+async def export_candidates(format: str = "csv", job_id: Optional[str] = None, all_jobs: bool = False,
+                            min_score: Optional[float] = None, max_score: Optional[float] = None,
+                            min_experience: Optional[int] = None, skill: Optional[str] = None,
+                            created_after: Optional[datetime] = None, created_before: Optional[datetime] = None,
+                            scheduled: Optional[bool] = None, limit: Optional[int] = None):
+    """Download stored candidates, best first, as CSV, NDJSON or Parquet
+
+    Candidates of job_id (default: the current job), or of every job with
+    all_jobs. Rows are read from the database page by page while the
+    response is sent, so memory use does not grow with the export.
+    """
+    if format not in export.EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Supported formats: {list(export.EXPORT_FORMATS)}")
+    if format == "parquet" and export.pyarrow is None:
+        raise HTTPException(status_code=400, detail="Parquet export needs pyarrow to be installed")
+    
+    if not all_jobs:
+        job_id = job_id or current_job_id
+        if job_id is None:
+            raise HTTPException(status_code=400, detail="Pass job_id or all_jobs=true, or create a job description first")
+    
+    filters = export.ExportFilter(
+        job_id=None if all_jobs else job_id,
+        min_score=min_score,
+        max_score=max_score,
+        min_experience=min_experience,
+        skill=skill,
+        created_after=created_after,
+        created_before=created_before,
+        scheduled=scheduled,
+        limit=limit
+    )
+    media_type, extension = export.EXPORT_FORMATS[format]
+    filename = f"candidates-{'all' if all_jobs else job_id[:8]}-{datetime.now():%Y%m%d}.{extension}"
+    return StreamingResponse(
+        export.export_chunks(format, filters),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/api/candidates/{candidate_id}/thumbnail")
+async def get_candidate_thumbnail(candidate_id: str, request: Request, width: int = 320, format: str = "png", db: Session = Depends(get_db)):
+    """First-page preview of a candidate's resume, cached by content hash"""
+    if width not in thumbnail_service.widths or format not in THUMBNAIL_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Supported widths: {list(thumbnail_service.widths)}, formats: {list(THUMBNAIL_FORMATS)}"
+        )
+    
+    candidate = db.get(Candidate, candidate_id)
+    if candidate is None or not candidate.resume_path or not os.path.exists(candidate.resume_path):
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    # Rows stored before content hashes were recorded are hashed on first use
+    content_hash = candidate.content_hash or await run_in_threadpool(file_content_hash, candidate.resume_path)
+    
+    # The content hash names the image, so a cached copy never needs revalidation
+    headers = {
+        "ETag": thumbnail_service.etag(content_hash, width, format),
+        "Cache-Control": "public, max-age=31536000, immutable"
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    
+    try:
+        path = await thumbnail_service.get(candidate.resume_path, content_hash, width, format)
+    except Exception as e:
+        raise HTTPException(status_code=422, detail=f"Cannot render preview: {e}")
+    
+    return FileResponse(path, media_type=THUMBNAIL_FORMATS[format], headers=headers)
+
+def record_interview(db: Session, candidate_id: str, slot_time: datetime):
+    """Record a scheduled interview, for exports and for resume retention, which counts from it"""
+    try:
+        db.query(Candidate).filter(Candidate.id == candidate_id).update({Candidate.interview_scheduled: slot_time})
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
 
 @app.post("/api/schedule-interviews")
-async def schedule_interviews(candidate_ids: List[str]):
+async def schedule_interviews(candidate_ids: List[str], db: Session = Depends(get_db)):
     """Schedule interviews for selected candidates"""
-    global current_candidates
-    
-    selected_candidates = [c for c in current_candidates if c.candidate_id in candidate_ids]
+    ranking = current_ranking
+    selected_candidates = [
+        CandidateScore(**candidate)
+        for candidate in await run_in_threadpool(ranking.load, db, ranking.rows_for(candidate_ids))
+    ]
     available_slots = calendar_service.get_available_slots()
     
     scheduled_interviews = []
@@ -163,12 +593,21 @@ async def schedule_interviews(candidate_ids: List[str]):
                 email_body
             )
             
+            # The invitation is out either way, so a failure to record it is reported, not raised
+            try:
+                await run_in_threadpool(record_interview, db, candidate.candidate_id, slot_time)
+                record_status = 'saved'
+            except SQLAlchemyError:
+                logger.exception("Failed to record scheduled interview", extra={"candidate_id": candidate.candidate_id})
+                record_status = 'failed'
+            
             scheduled_interviews.append({
                 'candidate': candidate.name,
                 'email': candidate.email,
                 'interview_time': slot_time.isoformat(),
                 'calendar_status': calendar_result['status'],
                 'email_status': email_result['status'],
+                'record_status': record_status,
                 'meet_link': calendar_result.get('meet_link')
             })
     
@@ -177,10 +616,58 @@ async def schedule_interviews(candidate_ids: List[str]):
         "interviews": scheduled_interviews
     }
 
+async def compact_storage_periodically():
+    """Run storage compaction every STORAGE_COMPACTION_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(settings.STORAGE_COMPACTION_INTERVAL)
+        try:
+            await run_in_threadpool(storage_compactor.run)
+        except Exception:
+            logger.exception("Storage compaction failed")
+
+compaction_task: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_workers():
+    global compaction_task
+    if settings.THUMBNAILS_ENABLED:
+        thumbnail_service.start()
+    if settings.STORAGE_COMPACTION_INTERVAL > 0:
+        compaction_task = asyncio.create_task(compact_storage_periodically())
+
+@app.on_event("shutdown")
+def shutdown_workers():
+    if compaction_task is not None:
+        compaction_task.cancel()
+    thumbnail_service.shutdown()
+
+@app.get("/metrics")
+async def metrics(db: Session = Depends(get_db)):
+    """Prometheus metrics: stage latencies, LLM usage, queue depths and cache hits"""
+    if settings.SCREENING_QUEUE_ENABLED:
+        depths = await run_in_threadpool(screening_queue.depths, db)
+        for status, count in depths.items():
+            QUEUE_DEPTH.labels(f"screening_{status}").set(count)
+    
+    return Response(content=render_metrics(), headers={"Content-Type": METRICS_CONTENT_TYPE})
+
+@app.get("/api/debug/traces", include_in_schema=settings.TRACE_DEBUG_ENABLED)
+async def debug_traces(limit: int = 20):
+    """Recent requests slower than TRACE_SLOW_MS with their stage breakdown (TRACE_DEBUG_ENABLED only)"""
+    if not settings.TRACE_DEBUG_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    
+    return {"threshold_ms": slow_traces.threshold_ms, "traces": slow_traces.recent(limit)}
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "llm_providers": ai_agent.router.stats(),
+        "admission": admission.stats()
+    }
 
 if __name__ == "__main__":
     import uvicorn
@@ -20,6 +20,13 @@ class CandidateScore(BaseModel):
     experience_years: Optional[int]
     resume_path: str
 
+class MatchRequest(BaseModel):
+    job_ids: Optional[List[str]] = None  # Defaults to every job
+    candidate_ids: Optional[List[str]] = None  # Defaults to every stored resume
+    top_jobs: int = 3
+    refine_top: int = 0  # Number of best cells to re-score with the LLM
+    include_matrix: bool = True
+
 class InterviewSlot(BaseModel):
     candidate_id: str
     start_time: datetime
@@ -6,18 +6,31 @@ Each service handles a specific domain of functionality.
 
 Modules:
     resume_parser: Handles PDF resume parsing and text extraction
+    resume_document: Single-pass structured view of resume text shared by all stages
+    prompt_builder: Section-aware LLM prompt compaction under a token budget
+    structured_output: LLM response schemas and streaming score extraction
+    llm_providers: Pluggable LLM provider interface (Gemini, OpenAI, local stub)
+    llm_router: Health-aware provider routing with hedged requests
+    admission: Per-user and global admission control with a priority wait queue
+    dedup: Near-duplicate resume detection with MinHash LSH
+    feature_store: Vectorized rule-based re-scoring of every stored resume
+    matching_engine: Candidate x job score matrices with optional LLM refinement
+    screening: Per-resume screening pipeline and the durable worker queue
     ai_agent: Manages AI-powered candidate analysis and ranking
     calendar_service: Integrates with Google Calendar for interview scheduling
     email_service: Handles email notifications and confirmations
 """
 
-from app.services.resume_parser import ResumeParser
+from app.services.resume_parser import ResumeParser, ResumeRejected
+from app.services.resume_document import ResumeDocument
 from app.services.ai_agent import AIAgent
 from app.services.calendar_service import GoogleCalendarService
 from app.services.email_service import EmailService
 
 __all__ = [
     'ResumeParser',
+    'ResumeRejected',
+    'ResumeDocument',
     'AIAgent',
     'GoogleCalendarService',
     'EmailService'
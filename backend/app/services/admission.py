@@ -0,0 +1,190 @@
+import asyncio
+import itertools
+import math
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from app.utils.tracing import record_span
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted; retry_after is in seconds"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+@dataclass
+class _Waiter:
+    user: str
+    cost: int
+    seq: int
+    enqueued_at: float
+    future: asyncio.Future = field(repr=False)
+
+
+class AdmissionController:
+    """Global and per-user in-flight limits with a bounded priority wait queue
+
+    Requests over the limits wait in the queue, cheapest first, so a handful of
+    resumes is not stuck behind a 500-resume upload; waiting time slowly
+    raises a request's priority so large batches still get through. When the
+    queue is full, or a request has waited max_wait seconds, it is rejected
+    right away with an estimate of when to retry.
+
+    Runs on the event loop; it is not thread-safe.
+    """
+
+    def __init__(self, max_in_flight: int = 4, max_per_user: int = 2, max_queue: int = 32,
+                 max_wait: float = 30.0, aging_per_second: float = 1024 * 1024):
+        self.max_in_flight = max_in_flight
+        self.max_per_user = max_per_user
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.aging_per_second = aging_per_second
+        self._in_flight = 0
+        self._user_in_flight: Dict[str, int] = defaultdict(int)
+        self._user_waiting: Dict[str, int] = defaultdict(int)
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        # Moving average of how long an admitted request runs, for Retry-After
+        self._avg_service = 5.0
+        self.admitted = 0
+        self.rejected = 0
+
+    def _has_capacity(self, user: str) -> bool:
+        return self._in_flight < self.max_in_flight and self._user_in_flight[user] < self.max_per_user
+
+    def _start(self, user: str):
+        self._in_flight += 1
+        self._user_in_flight[user] += 1
+        self.admitted += 1
+
+    def retry_after(self) -> int:
+        backlog = len(self._waiters) + 1
+        return max(1, math.ceil(self._avg_service * backlog / self.max_in_flight))
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self.rejected += 1
+        return AdmissionRejected(reason, self.retry_after())
+
+    async def acquire(self, user: str, cost: int = 0):
+        """Wait for a slot; cost orders the queue (smaller goes first)"""
+        if len(self._waiters) >= self.max_queue and not self._has_capacity(user):
+            raise self._reject("Server is busy, please retry later")
+        if self._user_waiting[user] >= self.max_per_user:
+            raise self._reject("Too many requests in progress for this user")
+
+        waiter = _Waiter(user, cost, next(self._seq), time.monotonic(), asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        self._user_waiting[user] += 1
+
+        # Admitted straight away when nothing more urgent is waiting
+        self._dispatch()
+        if waiter.future.done():
+            return
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted at the same moment; hand the slot back
+                self.release(user)
+            else:
+                waiter.future.cancel()
+                self._waiters.remove(waiter)
+                self._user_waiting[user] -= 1
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._reject("Timed out waiting for capacity")
+            raise
+
+    def release(self, user: str, duration: float = None):
+        self._in_flight -= 1
+        self._user_in_flight[user] -= 1
+        if not self._user_in_flight[user]:
+            del self._user_in_flight[user]
+        if duration is not None:
+            self._avg_service = 0.8 * self._avg_service + 0.2 * duration
+        self._dispatch()
+
+    def _dispatch(self):
+        """Admit waiting requests in priority order while there is capacity"""
+        now = time.monotonic()
+        while self._waiters and self._in_flight < self.max_in_flight:
+            # Users at their own limit are passed over rather than blocking the queue
+            eligible = [waiter for waiter in self._waiters if self._user_in_flight[waiter.user] < self.max_per_user]
+            if not eligible:
+                return
+            waiter = min(
+                eligible,
+                key=lambda w: (w.cost - (now - w.enqueued_at) * self.aging_per_second, w.seq)
+            )
+            self._waiters.remove(waiter)
+            self._user_waiting[waiter.user] -= 1
+            self._start(waiter.user)
+            waiter.future.set_result(None)
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "retry_after": self.retry_after()
+        }
+
+
+class AdmissionMiddleware:
+    """Applies an AdmissionController to selected routes before their body is read
+
+    Requests are keyed to a user by user_header (falling back to the client
+    address) and prioritized by Content-Length, so an overloaded server answers
+    429 without first receiving a large upload.
+
+    The slot is held until the wrapped app returns. Starlette runs a response's
+    background tasks before that, so work a route hands to BackgroundTasks
+    (screening a batch upload, say) counts against the slot too.
+    """
+
+    def __init__(self, app, controller: AdmissionController, routes: Iterable[Tuple[str, str]],
+                 user_header: str = "X-User-Id"):
+        self.app = app
+        self.controller = controller
+        self.routes = set(routes)
+        self.user_header = user_header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (scope["method"], scope["path"]) not in self.routes:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        client = scope.get("client")
+        user = headers.get(self.user_header) or (client[0] if client else "anonymous")
+        try:
+            cost = int(headers.get("content-length") or 0)
+        except ValueError:
+            cost = 0
+
+        waiting_since = time.perf_counter()
+        try:
+            await self.controller.acquire(user, cost)
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": str(e)},
+                headers={"Retry-After": str(e.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        record_span("admission", waiting_since, time.perf_counter() - waiting_since)
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(user, time.monotonic() - started)
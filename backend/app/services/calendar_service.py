@@ -1,12 +1,18 @@
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
+from google.auth.credentials import AnonymousCredentials
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+import logging
 import os
 import pickle
 from datetime import datetime, timedelta
 from typing import List, Dict
 from app.config import settings
+from app.utils.metrics import STAGE_SECONDS
+from app.utils.tracing import span
+
+logger = logging.getLogger(__name__)
 
 class GoogleCalendarService:
     def __init__(self):
@@ -19,20 +25,31 @@ class GoogleCalendarService:
         """Authenticate with Google Calendar API"""
         creds = None
         
+        # A configured endpoint (such as the load test's fake Calendar) needs no OAuth
+        if settings.GOOGLE_CALENDAR_API_ENDPOINT:
+            self.service = build(
+                'calendar', 'v3',
+                credentials=AnonymousCredentials(),
+                client_options={'api_endpoint': settings.GOOGLE_CALENDAR_API_ENDPOINT}
+            )
+            self.authenticated = True
+            logger.info("Using Google Calendar API endpoint", extra={"endpoint": settings.GOOGLE_CALENDAR_API_ENDPOINT})
+            return
+        
         # Load existing token
         if os.path.exists(settings.GOOGLE_CALENDAR_TOKEN_FILE):
             try:
                 with open(settings.GOOGLE_CALENDAR_TOKEN_FILE, 'rb') as token:
                     creds = pickle.load(token)
             except Exception as e:
-                print(f"Error loading token file: {e}")
+                logger.warning("Cannot load Google Calendar token file", extra={"error": str(e)})
                 creds = None
         
         # Check if credentials are valid
         if creds and creds.valid:
             self.service = build('calendar', 'v3', credentials=creds)
             self.authenticated = True
-            print("✅ Google Calendar authentication successful")
+            logger.info("Google Calendar authentication successful")
             return
         
         # Try to refresh expired credentials
@@ -43,16 +60,13 @@ class GoogleCalendarService:
                     pickle.dump(creds, token)
                 self.service = build('calendar', 'v3', credentials=creds)
                 self.authenticated = True
-                print("✅ Google Calendar credentials refreshed")
+                logger.info("Google Calendar credentials refreshed")
                 return
             except Exception as e:
-                print(f"Error refreshing credentials: {e}")
+                logger.warning("Cannot refresh Google Calendar credentials", extra={"error": str(e)})
         
         # If we reach here, we need new authentication
-        print("❌ Google Calendar authentication required")
-        print("🔧 Please run the authentication setup script:")
-        print("   python auth_setup.py")
-        print("📝 Or manually authenticate by visiting Google Calendar API setup")
+        logger.warning("Google Calendar authentication required - run 'python auth_setup.py'")
         
         self.authenticated = False
         self.service = None
@@ -109,12 +123,13 @@ class GoogleCalendarService:
         }
         
         try:
-            event_result = self.service.events().insert(
-                calendarId='primary', 
-                body=event,
-                conferenceDataVersion=1,
-                sendUpdates='all'  # Send email invitations
-            ).execute()
+            with STAGE_SECONDS.labels("calendar_insert").time(), span("calendar"):
+                event_result = self.service.events().insert(
+                    calendarId='primary', 
+                    body=event,
+                    conferenceDataVersion=1,
+                    sendUpdates='all'  # Send email invitations
+                ).execute()
             
             # Extract meet link
             meet_link = 'No meet link generated'
@@ -135,7 +150,7 @@ class GoogleCalendarService:
             }
             
         except Exception as e:
-            print(f"Error scheduling interview: {e}")
+            logger.error("Cannot schedule interview", extra={"error": str(e)})
             return {
                 'status': 'failed', 
                 'error': str(e),
@@ -195,7 +210,7 @@ class GoogleCalendarService:
             return busy_times
             
         except Exception as e:
-            print(f"Error fetching busy times: {e}")
+            logger.warning("Cannot fetch busy times", extra={"error": str(e)})
             return []
     
     def test_connection(self) -> Dict:
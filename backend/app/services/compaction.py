@@ -0,0 +1,218 @@
+import gzip
+import logging
+import os
+import shutil
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.services.thumbnails import THUMBNAIL_FORMATS, thumbnail_path
+from app.utils.database import Candidate, Job, ScreeningTask, SessionLocal
+from app.utils.ids import file_content_hash
+from app.utils.storage import INCOMING_DIR, commit_file, incoming_path, is_compressed, is_sharded, shard_path
+
+logger = logging.getLogger(__name__)
+
+
+class StorageCompactor:
+    """Keeps the uploads directory in step with the candidates that use it
+
+    Each run walks UPLOAD_DIR in batches and, for every file:
+    - deletes it when no candidate or pending screening task refers to it and
+      it has not been touched for STORAGE_ORPHAN_GRACE_HOURS (uploads are only
+      referenced once screened, so younger files may still be in flight)
+    - moves flat files from before content-addressed storage into the shards
+    - deletes it once every candidate referring to it has passed retention,
+      clearing their resume_path
+    - gzip-compresses it once not uploaded again for RESUME_COMPRESS_AFTER_DAYS
+
+    Files referenced by queued or running screening tasks are never moved.
+    Database paths are updated and committed before the old file is removed,
+    so a crash leaves at worst an extra file for the next run to delete.
+    """
+
+    def __init__(self, upload_dir: Optional[str] = None, thumbnail_dir: Optional[str] = None,
+                 batch_size: int = 500):
+        self.upload_dir = upload_dir or settings.UPLOAD_DIR
+        self.thumbnail_dir = thumbnail_dir or settings.THUMBNAIL_DIR
+        self.batch_size = batch_size
+
+    def run(self, dry_run: bool = False) -> Dict[str, int]:
+        """One compaction pass; returns counts of what was (or, on a dry run, would be) done"""
+        stats = Counter()
+        now = time.time()
+        self._clean_incoming(now, stats, dry_run)
+
+        batch: List[str] = []
+        for path in self._walk():
+            batch.append(path)
+            if len(batch) >= self.batch_size:
+                self._compact_batch(batch, now, stats, dry_run)
+                batch = []
+        if batch:
+            self._compact_batch(batch, now, stats, dry_run)
+
+        logger.info("Storage compaction finished", extra={"dry_run": dry_run, **stats})
+        return dict(stats)
+
+    def _walk(self) -> Iterator[str]:
+        for root, dirs, files in os.walk(self.upload_dir):
+            if root == self.upload_dir and INCOMING_DIR in dirs:
+                dirs.remove(INCOMING_DIR)
+            for name in files:
+                if not name.startswith("."):
+                    yield os.path.join(root, name)
+
+    def _clean_incoming(self, now: float, stats: Counter, dry_run: bool):
+        # Left behind by uploads that were interrupted before they were stored
+        directory = os.path.join(self.upload_dir, INCOMING_DIR)
+        if not os.path.isdir(directory):
+            return
+        for entry in os.scandir(directory):
+            if self._is_stale(entry.path, now):
+                stats["incoming_removed"] += 1
+                if not dry_run:
+                    _remove(entry.path)
+
+    def _is_stale(self, path: str, now: float) -> bool:
+        try:
+            return now - os.stat(path).st_mtime > settings.STORAGE_ORPHAN_GRACE_HOURS * 3600
+        except FileNotFoundError:
+            return False
+
+    def _compact_batch(self, paths: List[str], now: float, stats: Counter, dry_run: bool):
+        with SessionLocal() as db:
+            rows: Dict[str, List] = {}
+            for row in db.execute(
+                select(Candidate.resume_path, Candidate.content_hash, Candidate.job_id, Candidate.created_at,
+                       Candidate.interview_scheduled)
+                .where(Candidate.resume_path.in_(paths))
+            ):
+                rows.setdefault(row.resume_path, []).append(row)
+            pending = set(db.scalars(
+                select(ScreeningTask.file_path)
+                .where(ScreeningTask.file_path.in_(paths), ScreeningTask.status.in_(("queued", "running")))
+            ))
+            newest_job = db.scalar(select(Job.id).order_by(Job.created_at.desc()).limit(1))
+
+            for path in paths:
+                stats["files"] += 1
+                if path in pending:
+                    continue
+                if path not in rows:
+                    # Checked again right before deleting: a re-upload of the same content touches it
+                    if self._is_stale(path, now):
+                        stats["orphans_removed"] += 1
+                        if not dry_run:
+                            _remove(path)
+                            self._drop_thumbnails(db, _hash_of(self.upload_dir, path))
+                    continue
+                if all(self._expired(row, newest_job) for row in rows[path]):
+                    stats["expired"] += 1
+                    if not dry_run:
+                        self._expire(db, path, {row.content_hash for row in rows[path]})
+                    continue
+                if not is_sharded(self.upload_dir, path):
+                    stats["migrated"] += 1
+                    if not dry_run:
+                        path = self._migrate(db, path)
+                if path and self._is_cold(path, now):
+                    stats["compressed"] += 1
+                    if not dry_run:
+                        self._compress(db, path, now)
+
+    def _expired(self, row, newest_job: Optional[str]) -> bool:
+        # Candidates of the job being hired for are kept whatever their age
+        if row.job_id is not None and row.job_id == newest_job:
+            return False
+        if row.interview_scheduled is not None:
+            days, since = settings.RESUME_RETENTION_SCHEDULED_DAYS, row.interview_scheduled
+        else:
+            days, since = settings.RESUME_RETENTION_DAYS, row.created_at
+        return bool(days) and since is not None and since < datetime.now() - timedelta(days=days)
+
+    def _is_cold(self, path: str, now: float) -> bool:
+        if not settings.RESUME_COMPRESS_AFTER_DAYS or is_compressed(path):
+            return False
+        try:
+            return now - os.stat(path).st_mtime > settings.RESUME_COMPRESS_AFTER_DAYS * 86400
+        except FileNotFoundError:
+            return False
+
+    def _expire(self, db: Session, path: str, content_hashes: Set[str]):
+        db.execute(update(Candidate).where(Candidate.resume_path == path).values(resume_path=None))
+        db.commit()
+        _remove(path)
+        for content_hash in content_hashes | {_hash_of(self.upload_dir, path)}:
+            self._drop_thumbnails(db, content_hash)
+
+    def _drop_thumbnails(self, db: Session, content_hash: Optional[str]):
+        """Delete a resume's cached previews unless another stored copy still needs them"""
+        if not content_hash:
+            return
+        in_use = db.scalar(
+            select(Candidate.id)
+            .where(Candidate.content_hash == content_hash, Candidate.resume_path.isnot(None))
+            .limit(1)
+        )
+        if in_use is not None:
+            return
+        for width in settings.THUMBNAIL_WIDTHS:
+            for fmt in THUMBNAIL_FORMATS:
+                _remove(thumbnail_path(self.thumbnail_dir, content_hash, width, fmt))
+
+    def _migrate(self, db: Session, path: str) -> Optional[str]:
+        """Move a flat upload into its shard; returns the new path, or None if it failed"""
+        try:
+            content_hash = file_content_hash(path)
+            temp_path = incoming_path(self.upload_dir)
+            try:
+                os.link(path, temp_path)
+            except OSError:
+                shutil.copyfile(path, temp_path)
+            new_path = commit_file(temp_path, self.upload_dir, content_hash)
+            self._repoint(db, path, new_path)
+        except Exception as e:
+            db.rollback()
+            logger.warning("Failed to migrate upload", extra={"file": path, "error": str(e)})
+            return None
+        _remove(path)
+        return new_path
+
+    def _compress(self, db: Session, path: str, now: float):
+        content_hash = _hash_of(self.upload_dir, path)
+        new_path = shard_path(self.upload_dir, content_hash, compressed=True)
+        temp_path = incoming_path(self.upload_dir)
+        try:
+            with open(path, 'rb') as src, gzip.open(temp_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, settings.UPLOAD_CHUNK_SIZE)
+            os.replace(temp_path, new_path)
+            self._repoint(db, path, new_path)
+        except Exception as e:
+            db.rollback()
+            _remove(temp_path)
+            logger.warning("Failed to compress resume", extra={"file": path, "error": str(e)})
+            return
+        # Uploaded again meanwhile: the new row refers to the plain file, so keep it
+        if self._is_cold(path, now):
+            _remove(path)
+
+    def _repoint(self, db: Session, old_path: str, new_path: str):
+        db.execute(update(Candidate).where(Candidate.resume_path == old_path).values(resume_path=new_path))
+        db.execute(update(ScreeningTask).where(ScreeningTask.file_path == old_path).values(file_path=new_path))
+        db.commit()
+
+
+def _hash_of(root: str, path: str) -> Optional[str]:
+    """Content hash a sharded file is named by"""
+    return os.path.basename(path).split(".")[0] if is_sharded(root, path) else None
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,297 @@
+import logging
+import re
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.schemas import CandidateScore
+from app.utils.database import Candidate, CandidateSignature, next_sequence, stage_for_commit, upsert
+from app.utils.ids import candidate_id_for
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_TOKEN = re.compile(r'\w+')
+
+
+class MinHasher:
+    """MinHash signatures over word shingles
+
+    Shingles are hashed with crc32 and the permutations come from a fixed seed,
+    so signatures are identical across processes and can be stored.
+    """
+
+    def __init__(self, num_perm: int = None, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm or settings.DEDUP_NUM_PERM
+        self.shingle_size = shingle_size
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, (1 << 61) - 1, size=self.num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, (1 << 61) - 1, size=self.num_perm, dtype=np.uint64)
+
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        tokens = _TOKEN.findall(text.lower())
+        size = self.shingle_size
+        if len(tokens) < size:
+            shingles = {' '.join(tokens)} if tokens else set()
+        else:
+            shingles = {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+        return np.fromiter(
+            (zlib.crc32(shingle.encode()) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = self._shingle_hashes(text)
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        # (a * x + b) mod p, truncated to 32 bits; uint64 overflow wraps, which is fine for hashing
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def estimate_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+class LSHIndex:
+    """Banded LSH over MinHash signatures with sublinear lookups
+
+    Each band keeps a sorted array of band hashes plus the matching row numbers,
+    searched with np.searchsorted. New entries go to a small per-band dict and
+    are merged into the sorted arrays in bulk, so inserts stay cheap and memory
+    is a few bytes per band per stored resume.
+    """
+
+    def __init__(self, num_perm: int, bands: int = None, merge_threshold: int = 4096):
+        self.bands = bands or settings.DEDUP_BANDS
+        if num_perm % self.bands:
+            raise ValueError("num_perm must be divisible by the number of bands")
+        self.rows = num_perm // self.bands
+        self.merge_threshold = merge_threshold
+
+        generator = np.random.RandomState(7)
+        self._mix = generator.randint(1, 1 << 62, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+        self._sorted_hashes = [np.empty(0, dtype=np.uint64) for _ in range(self.bands)]
+        self._sorted_rows = [np.empty(0, dtype=np.int64) for _ in range(self.bands)]
+        self._pending: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        self._pending_count = 0
+
+    def band_hashes(self, signature: np.ndarray) -> np.ndarray:
+        bands = signature.astype(np.uint64).reshape(self.bands, self.rows)
+        return (bands * self._mix).sum(axis=1, dtype=np.uint64) + np.arange(self.bands, dtype=np.uint64)
+
+    def insert(self, row: int, signature: np.ndarray):
+        for band, value in enumerate(self.band_hashes(signature).tolist()):
+            self._pending[band].setdefault(value, []).append(row)
+        self._pending_count += 1
+        if self._pending_count >= self.merge_threshold:
+            self._merge()
+
+    def query(self, signature: np.ndarray) -> set:
+        matches = set()
+        for band, value in enumerate(self.band_hashes(signature).tolist()):
+            matches.update(self._pending[band].get(value, ()))
+            hashes = self._sorted_hashes[band]
+            lo = np.searchsorted(hashes, value, side='left')
+            hi = np.searchsorted(hashes, value, side='right')
+            if hi > lo:
+                matches.update(self._sorted_rows[band][lo:hi].tolist())
+        return matches
+
+    def _merge(self):
+        for band in range(self.bands):
+            pending = self._pending[band]
+            if not pending:
+                continue
+            new_hashes = np.fromiter(
+                (value for value, rows in pending.items() for _ in rows), dtype=np.uint64
+            )
+            new_rows = np.fromiter(
+                (row for rows in pending.values() for row in rows), dtype=np.int64
+            )
+            hashes = np.concatenate([self._sorted_hashes[band], new_hashes])
+            rows = np.concatenate([self._sorted_rows[band], new_rows])
+            order = np.argsort(hashes, kind='stable')
+            self._sorted_hashes[band] = hashes[order]
+            self._sorted_rows[band] = rows[order]
+            self._pending[band] = {}
+        self._pending_count = 0
+
+
+class DuplicateDetector:
+    """Finds near-duplicate resumes as they arrive
+
+    Signatures are persisted per candidate in candidate_signatures and the
+    index is rebuilt from them lazily on first use, then topped up with rows
+    other processes store.
+    """
+
+    def __init__(self, threshold: float = None):
+        self.threshold = threshold or settings.DEDUP_THRESHOLD
+        self.hasher = MinHasher()
+        self.index = LSHIndex(self.hasher.num_perm)
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._job_ids: List[Optional[str]] = []
+        self._signatures = np.empty((1024, self.hasher.num_perm), dtype=np.uint32)
+        self._loaded = False
+        self._seq = 0  # Highest seq loaded from candidate_signatures
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def ensure_loaded(self, db: Session):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._load(db)
+            self._loaded = True
+            logger.info("Loaded resume signatures for duplicate detection", extra={"count": len(self._keys)})
+
+    def refresh(self, db: Session):
+        """Pick up signatures stored by other processes, such as screening workers
+
+        Every check calls this, so the table is read at most every
+        DEDUP_REFRESH_INTERVAL seconds.
+        """
+        if not self._loaded:
+            self.ensure_loaded(db)
+            return
+        if time.monotonic() - self._refreshed_at < settings.DEDUP_REFRESH_INTERVAL:
+            return
+        with self._lock:
+            # seq follows commit order, so nothing committed since the last load is below it
+            self._load(db, after=self._seq)
+
+    def _load(self, db: Session, after: Optional[int] = None):
+        query = db.query(
+            CandidateSignature.candidate_id,
+            CandidateSignature.job_id,
+            CandidateSignature.signature,
+            CandidateSignature.seq
+        )
+        if after is not None:
+            # Signatures already indexed are skipped by _add
+            query = query.filter(CandidateSignature.seq > after)
+        for candidate_id, job_id, signature, seq in query.yield_per(5000):
+            self._add(candidate_id, job_id, np.frombuffer(signature, dtype=np.uint32))
+            self._seq = max(self._seq, seq or 0)
+        self._refreshed_at = time.monotonic()
+
+    def _add(self, candidate_id: str, job_id: Optional[str], signature: np.ndarray):
+        if candidate_id in self._rows:
+            # Re-uploads of the same resume keep their candidate ID
+            return
+        row = len(self._keys)
+        if row == len(self._signatures):
+            grown = np.empty((row * 2, self.hasher.num_perm), dtype=np.uint32)
+            grown[:row] = self._signatures
+            self._signatures = grown
+        self._signatures[row] = signature
+        self._keys.append(candidate_id)
+        self._rows[candidate_id] = row
+        self._job_ids.append(job_id)
+        self.index.insert(row, signature)
+
+    def add(self, candidate_id: str, job_id: Optional[str], signature: np.ndarray):
+        with self._lock:
+            self._add(candidate_id, job_id, signature)
+
+    def _add_all(self, entries: List[Tuple[str, Optional[str], np.ndarray]]):
+        with self._lock:
+            for candidate_id, job_id, signature in entries:
+                self._add(candidate_id, job_id, signature)
+
+    def _staged(self, db: Session) -> List[Tuple[str, Optional[str], np.ndarray]]:
+        """Signatures recorded in db's open transaction; they join the index once it commits"""
+        return stage_for_commit(db, self, self._add_all)
+
+    def find(self, signature: np.ndarray, job_id: Optional[str] = None,
+             staged: List[Tuple[str, Optional[str], np.ndarray]] = ()) -> Optional[Tuple[str, float]]:
+        """Return (candidate_id, estimated similarity) of the closest near-duplicate
+
+        staged signatures, not yet in the index, are compared as well.
+        """
+        with self._lock:
+            rows = [row for row in self.index.query(signature)
+                    if job_id is None or self._job_ids[row] == job_id]
+            keys = [self._keys[row] for row in rows]
+            signatures = [self._signatures[rows]]
+        staged = [(candidate_id, other) for candidate_id, other_job_id, other in staged
+                  if job_id is None or other_job_id == job_id]
+        if staged:
+            keys += [candidate_id for candidate_id, _ in staged]
+            signatures.append(np.stack([other for _, other in staged]))
+        if not keys:
+            return None
+
+        similarities = (np.concatenate(signatures) == signature).mean(axis=1)
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return keys[best], float(similarities[best])
+
+    def check(self, db: Session, resume_data: Dict, job_id: Optional[str],
+              unsaved: Optional[Dict[str, Tuple[Candidate, np.ndarray]]] = None) -> Optional[Candidate]:
+        """Signature the resume and return an already-scored duplicate for the same job
+
+        unsaved maps candidate IDs to (row, signature) of resumes scored but not
+        stored yet, such as a bulk import's pending batch; they are compared too.
+        """
+        self.refresh(db)
+
+        signature = resume_data.get('signature')
+        if signature is None:
+            signature = self.hasher.signature(resume_data['full_text'])
+            resume_data['signature'] = signature
+
+        unsaved = unsaved or {}
+        staged = self._staged(db) + [
+            (candidate_id, row.job_id, other) for candidate_id, (row, other) in unsaved.items()
+        ]
+        match = self.find(signature, job_id, staged)
+        if match is None:
+            return None
+
+        candidate_id, similarity = match
+        existing = unsaved[candidate_id][0] if candidate_id in unsaved else db.get(Candidate, candidate_id)
+        if existing is not None:
+            logger.debug("Near-duplicate resume - reusing score", extra={"duplicate_of": existing.id, "similarity": round(similarity, 3)})
+        return existing
+
+    def record(self, db: Session, candidate: Candidate, resume_data: Dict, duplicate_of: Optional[str] = None):
+        """Persist the signature of a stored candidate; it joins the index when db commits"""
+        signature = resume_data['signature']
+        if duplicate_of == candidate.id:
+            # An exact re-upload is the same candidate, not a duplicate of it
+            duplicate_of = None
+        upsert(db, CandidateSignature(
+            candidate_id=candidate.id,
+            job_id=candidate.job_id,
+            signature=signature.astype(np.uint32).tobytes(),
+            duplicate_of=duplicate_of,
+            seq=next_sequence(CandidateSignature.seq)
+        ))
+        self._staged(db).append((candidate.id, candidate.job_id, signature))
+
+
+def reuse_score(existing: Candidate, candidate_info: Dict) -> CandidateScore:
+    """Score a near-duplicate resume with the analysis already paid for"""
+    return CandidateScore(
+        candidate_id=candidate_id_for(candidate_info),
+        name=candidate_info.get('name') or existing.name,
+        email=candidate_info.get('email') or existing.email,
+        phone=candidate_info.get('phone') or existing.phone,
+        score=existing.score,
+        summary=existing.summary,
+        skills_match=existing.skills_list(),
+        experience_years=existing.experience_years,
+        resume_path=candidate_info.get('file_path', '')
+    )
@@ -1,13 +1,18 @@
+import logging
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.config import settings
+from app.utils.metrics import STAGE_SECONDS
+from app.utils.tracing import span
 from typing import Dict
 
+logger = logging.getLogger(__name__)
+
 class EmailService:
     def __init__(self):
-        self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
+        self.smtp_server = settings.SMTP_HOST
+        self.smtp_port = settings.SMTP_PORT
         self.email_user = settings.EMAIL_USER
         self.email_password = settings.EMAIL_PASSWORD
     
@@ -24,16 +29,19 @@ class EmailService:
             msg.attach(MIMEText(body, 'plain'))
             
             # Send email
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.email_user, self.email_password)
-            
-            text = msg.as_string()
-            server.sendmail(self.email_user, recipient_email, text)
-            server.quit()
+            with STAGE_SECONDS.labels("smtp_send").time(), span("email"):
+                server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+                if settings.SMTP_STARTTLS:
+                    server.starttls()
+                if self.email_password:
+                    server.login(self.email_user, self.email_password)
+                
+                text = msg.as_string()
+                server.sendmail(self.email_user, recipient_email, text)
+                server.quit()
             
             return {'status': 'sent', 'message': 'Email sent successfully'}
             
         except Exception as e:
-            print(f"Error sending email: {e}")
+            logger.error("Cannot send email", extra={"error": str(e)})
             return {'status': 'failed', 'error': str(e)}
\ No newline at end of file
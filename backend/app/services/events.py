@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+import orjson
+
+
+@dataclass
+class BatchEvent:
+    id: int
+    event: str
+    data: Dict
+
+    def to_sse(self) -> bytes:
+        return f"id: {self.id}\nevent: {self.event}\ndata: ".encode() + orjson.dumps(self.data) + b"\n\n"
+
+
+@dataclass
+class _Batch:
+    events: List[BatchEvent] = field(default_factory=list)
+    subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = field(default_factory=set)
+    closed_at: Optional[float] = None
+
+
+class EventBroker:
+    """In-process fan-out of batch progress events to SSE subscribers
+
+    Events are kept for the life of a batch (and a while after it closes), so
+    a client that connects late or reconnects with Last-Event-ID replays what
+    it missed. publish may be called from any thread.
+    """
+
+    def __init__(self, retention: float = 3600, keepalive: float = 15):
+        self.retention = retention
+        self.keepalive = keepalive
+        self._batches: Dict[str, _Batch] = {}
+        self._lock = threading.Lock()
+
+    def open(self, batch_id: str):
+        with self._lock:
+            self._prune()
+            self._batches.setdefault(batch_id, _Batch())
+
+    def exists(self, batch_id: str) -> bool:
+        with self._lock:
+            return batch_id in self._batches
+
+    def publish(self, batch_id: str, event: str, data: Dict):
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None or batch.closed_at is not None:
+                return
+            batch.events.append(BatchEvent(len(batch.events) + 1, event, data))
+            subscribers = list(batch.subscribers)
+        self._wake(subscribers)
+
+    def close(self, batch_id: str):
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return
+            batch.closed_at = time.monotonic()
+            subscribers = list(batch.subscribers)
+        self._wake(subscribers)
+
+    def _wake(self, subscribers):
+        for loop, wakeup in subscribers:
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.retention
+        expired = [
+            batch_id for batch_id, batch in self._batches.items()
+            if batch.closed_at is not None and batch.closed_at < cutoff
+        ]
+        for batch_id in expired:
+            del self._batches[batch_id]
+
+    async def subscribe(self, batch_id: str, last_event_id: int = 0) -> AsyncIterator[Optional[BatchEvent]]:
+        """Yield events after last_event_id until the batch closes
+
+        None is yielded after keepalive seconds without events, so the caller
+        can keep idle connections open through proxies.
+        """
+        wakeup = asyncio.Event()
+        subscriber = (asyncio.get_running_loop(), wakeup)
+        position = last_event_id
+
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return
+            batch.subscribers.add(subscriber)
+
+        try:
+            while True:
+                # Clear before reading, so a publish in between still wakes us
+                wakeup.clear()
+                with self._lock:
+                    pending = batch.events[position:]
+                    closed = batch.closed_at is not None
+
+                for event in pending:
+                    yield event
+                position += len(pending)
+
+                if closed and not pending:
+                    return
+                if pending:
+                    continue
+
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=self.keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                batch.subscribers.discard(subscriber)
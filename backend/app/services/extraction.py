@@ -0,0 +1,150 @@
+import re
+from datetime import date
+from typing import List, NamedTuple, Optional
+
+# Every pattern here runs on whole resumes, often adversarial ones, so each is
+# written to cost time linear in the text: repeats are bounded and lookbehinds
+# stop a match from starting again inside a run the previous attempt covered.
+
+EMAIL_PATTERN = re.compile(
+    r'(?<![\w.%+-])[\w.%+-]{1,64}@(?:[A-Za-z0-9-]{1,63}\.){1,8}[A-Za-z]{2,24}\b'
+)
+
+# Digit groups split by single separators or a parenthesized area code, e.g.
+# +1 (415) 555-0134, +44 (0)20 7946 0958, 415.555.0134, +919876543210.
+# Spaces here exclude newlines, so numbers on separate lines are not joined.
+PHONE_PATTERN = re.compile(
+    r'(?<![\w+])\+?(?:\(\d{1,5}\)[^\S\n]?)?\d+'
+    r'(?:(?:[^\S\n]?[.\-][^\S\n]?|[^\S\n]|[^\S\n]?\(\d{1,5}\)[^\S\n]?)\d+){0,6}'
+    r'(?!\d)'
+)
+# Phone-shaped matches that are really years or dates
+_NOT_PHONE = re.compile(r'(?:19|20)\d{2} ?[.\-] ?(?:19|20)\d{2}|\d{1,4}[./\-]\d{1,2}[./\-]\d{1,4}')
+_PHONE_DIGITS = (7, 15)  # E.164 allows at most 15
+
+# "7+ years of experience", else "5 years in ..."; matched from the word "years"
+# (a rare letter to skip ahead to, unlike digits) and the number looked up before it
+_STATED_YEARS = re.compile(
+    r'(?:years?|yrs?)(?:(?P<experience>\.?\s{0,3}(?:of\s{1,3})?experience)|\s{1,3}in\b)', re.IGNORECASE
+)
+_YEARS_COUNT = re.compile(r'(?<!\d)(\d{1,2})\+?\s{0,3}\Z')
+_YEARS_COUNT_CHARS = 6  # "15+   "
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+_MONTH_NAME = (
+    r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+    r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)'
+)
+
+
+def _point(prefix: str) -> str:
+    # Jan 2020, January 2020, 01/2020, 1.2020 or 2020
+    return (
+        rf'(?:(?P<{prefix}_name>{_MONTH_NAME})\.?\s{{1,3}}|(?P<{prefix}_number>0?[1-9]|1[0-2])\s?[/.]\s?)?'
+        rf'(?P<{prefix}_year>(?:19|20)\d{{2}})'
+    )
+
+
+# Starts at the year of the range start, so the regex engine can skip ahead to
+# digits; its month, if written, is looked up right before the match
+DATE_RANGE_PATTERN = re.compile(
+    rf'(?P<start_year>(?:19|20)\d{{2}})\s{{0,3}}(?:[-–—]|to|until|till)\s{{0,3}}'
+    rf'(?:{_point("end")}|(?P<ongoing>present|current|now|today|date))\b',
+    re.IGNORECASE
+)
+_START_MONTH = re.compile(
+    rf'(?:\b(?P<start_name>{_MONTH_NAME})\.?\s{{1,3}}|(?<!\d)(?P<start_number>0?[1-9]|1[0-2])\s?[/.]\s?)\Z',
+    re.IGNORECASE
+)
+_START_MONTH_CHARS = 16  # "September.   " and the like
+
+
+class DateRange(NamedTuple):
+    """A period in months since year 0; start inclusive, end exclusive, None if ongoing"""
+    start: int
+    end: Optional[int]
+
+
+def find_email(text: str) -> Optional[str]:
+    match = EMAIL_PATTERN.search(text)
+    return match.group() if match else None
+
+
+def find_phone(text: str) -> Optional[str]:
+    """The first phone number in text, as written"""
+    for match in PHONE_PATTERN.finditer(text):
+        candidate = match.group()
+        digits = sum(char.isdigit() for char in candidate)
+        if _PHONE_DIGITS[0] <= digits <= _PHONE_DIGITS[1] and not _NOT_PHONE.fullmatch(candidate):
+            return candidate
+    return None
+
+
+def find_stated_experience(text: str) -> Optional[int]:
+    """Years of experience the resume states, e.g. "5+ years of experience" """
+    years_in = None
+    for match in _STATED_YEARS.finditer(text):
+        count = _YEARS_COUNT.search(text, max(0, match.start() - _YEARS_COUNT_CHARS), match.start())
+        if count is None:
+            continue
+        if match.group('experience'):
+            return int(count.group(1))
+        if years_in is None:
+            years_in = int(count.group(1))
+    return years_in
+
+
+def _month(match: re.Match, prefix: str, year: str, default: int) -> int:
+    name = match.group(f'{prefix}_name') if match else None
+    if name:
+        month = MONTHS[name[:3].lower()]
+    elif match and match.group(f'{prefix}_number'):
+        month = int(match.group(f'{prefix}_number'))
+    else:
+        month = default
+    return int(year) * 12 + month - 1
+
+
+def find_date_ranges(text: str) -> List[DateRange]:
+    """Every date range in text, e.g. "Jan 2020 - Mar 2023", "01/2019 – Present", "2016-2018"
+
+    An end month counts as worked; a bare year is taken as mid-year, so
+    "2019 - 2021" is two years.
+    """
+    ranges = []
+    for match in DATE_RANGE_PATTERN.finditer(text):
+        at = match.start()
+        if at and text[at - 1].isalnum():
+            continue  # Digits inside a longer number or word
+        month = _START_MONTH.search(text, max(0, at - _START_MONTH_CHARS), at)
+        start = _month(month, 'start', match.group('start_year'), 7)
+        if match.group('ongoing'):
+            ranges.append(DateRange(start, None))
+            continue
+        end = _month(match, 'end', match.group('end_year'), 6) + 1
+        if end > start:
+            ranges.append(DateRange(start, end))
+    return ranges
+
+
+def tenure_years(date_ranges: List[DateRange], today: Optional[date] = None) -> int:
+    """Years covered by the ranges, rounded; overlapping periods count once"""
+    today = today or date.today()
+    now = today.year * 12 + today.month
+    periods = sorted(
+        (start, min(end if end is not None else now, now))
+        for start, end in date_ranges if start < now
+    )
+
+    months = 0
+    covered_until = None
+    for start, end in periods:
+        if covered_until is not None and start < covered_until:
+            start = covered_until
+        if end > start:
+            months += end - start
+            covered_until = end
+    return (months + 6) // 12
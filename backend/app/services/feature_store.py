@@ -0,0 +1,223 @@
+import logging
+import threading
+import time
+from typing import Dict, FrozenSet, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.services.resume_document import ALL_SKILLS, JOB_TITLES, ResumeDocument, JobProfile
+from app.utils.database import Candidate, CandidateFeatures, next_sequence, stage_for_commit, upsert
+from app.utils.metrics import STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# One bit per taxonomy entry; the skill taxonomy fits in a single uint64
+SKILL_BITS = {skill: 1 << bit for bit, skill in enumerate(ALL_SKILLS)}
+TITLE_BITS = {title: 1 << bit for bit, title in enumerate(JOB_TITLES)}
+
+if hasattr(np, 'bitwise_count'):
+    def popcount(values: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(values)
+else:
+    _BYTE_COUNTS = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def popcount(values: np.ndarray) -> np.ndarray:
+        return _BYTE_COUNTS[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+def encode_skills(skills: FrozenSet[str]) -> int:
+    return sum(SKILL_BITS[skill] for skill in skills)
+
+
+def encode_titles(titles: FrozenSet[str]) -> int:
+    return sum(TITLE_BITS[title] for title in titles)
+
+
+def decode_skills(bits: int) -> List[str]:
+    return [skill for skill in ALL_SKILLS if bits & SKILL_BITS[skill]]
+
+
+class FeatureStore:
+    """Columnar rule-based scoring features for every stored resume
+
+    Each resume is reduced to a skill bitset, a title bitset, years of
+    experience and an education flag, persisted in candidate_features and held
+    here as NumPy arrays. Scoring the whole pool against a job is then a handful
+    of array operations with the same weights as the rule-based analysis.
+    Rows are unique per resume content, so a resume screened for several jobs
+    is scored once.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._skills = np.zeros(capacity, dtype=np.uint64)
+        self._titles = np.zeros(capacity, dtype=np.uint8)
+        self._years = np.zeros(capacity, dtype=np.int16)
+        self._education = np.zeros(capacity, dtype=bool)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._loaded = False
+        self._seq = 0  # Highest seq loaded from candidate_features
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def ensure_loaded(self, db: Session):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._load(db)
+            self._loaded = True
+            logger.info("Loaded scoring features", extra={"count": len(self._ids)})
+
+    def refresh(self, db: Session):
+        """Pick up rows stored by other processes, such as screening workers
+
+        Every re-score and match calls this, so the table is read at most every
+        FEATURES_REFRESH_INTERVAL seconds.
+        """
+        if not self._loaded:
+            self.ensure_loaded(db)
+            return
+        if time.monotonic() - self._refreshed_at < settings.FEATURES_REFRESH_INTERVAL:
+            return
+        with self._lock:
+            # seq follows commit order, so nothing committed since the last load is below it
+            self._load(db, after=self._seq)
+
+    def _load(self, db: Session, after: Optional[int] = None):
+        query = db.query(
+            CandidateFeatures.candidate_id,
+            CandidateFeatures.content_hash,
+            CandidateFeatures.skills,
+            CandidateFeatures.titles,
+            CandidateFeatures.experience_years,
+            CandidateFeatures.has_education,
+            CandidateFeatures.seq
+        )
+        if after is not None:
+            # Re-applying a row seen before is harmless
+            query = query.filter(CandidateFeatures.seq > after)
+        for *row, seq in query.yield_per(5000):
+            self._set(*row)
+            self._seq = max(self._seq, seq or 0)
+        self._refreshed_at = time.monotonic()
+
+    def _set(self, candidate_id: str, content_hash: Optional[str], skills: int, titles: int,
+             experience_years: int, has_education: bool):
+        key = content_hash or candidate_id
+        row = self._rows.get(key)
+        if row is None:
+            row = len(self._ids)
+            if row == len(self._skills):
+                self._grow()
+            self._ids.append(candidate_id)
+            self._rows[key] = row
+        else:
+            # Latest upload of the same resume wins
+            self._ids[row] = candidate_id
+
+        self._skills[row] = skills
+        self._titles[row] = titles
+        self._years[row] = experience_years
+        self._education[row] = has_education
+
+    def _grow(self):
+        size = len(self._skills) * 2
+        for name in ('_skills', '_titles', '_years', '_education'):
+            current = getattr(self, name)
+            grown = np.zeros(size, dtype=current.dtype)
+            grown[:len(current)] = current
+            setattr(self, name, grown)
+
+    def _set_all(self, rows: List[Tuple]):
+        with self._lock:
+            for row in rows:
+                self._set(*row)
+
+    def record(self, db: Session, candidate: Candidate, document: ResumeDocument):
+        """Persist the features of a stored candidate; they join the pool once db commits
+
+        Rolled-back resumes therefore never take up ranking slots.
+        """
+        self.ensure_loaded(db)
+        features = CandidateFeatures(
+            candidate_id=candidate.id,
+            content_hash=candidate.content_hash,
+            skills=encode_skills(document.skill_hits),
+            titles=encode_titles(document.title_hits),
+            experience_years=document.experience_years,
+            has_education=document.has_education,
+            seq=next_sequence(CandidateFeatures.seq)
+        )
+        upsert(db, features)
+        stage_for_commit(db, self, self._set_all).append((
+            features.candidate_id,
+            features.content_hash,
+            features.skills,
+            features.titles,
+            features.experience_years,
+            features.has_education
+        ))
+
+    def rows_for(self, candidate_ids: List[str]) -> Tuple[List[str], np.ndarray]:
+        """Pool rows for the given candidate IDs, skipping IDs without features"""
+        with self._lock:
+            lookup = {candidate_id: row for row, candidate_id in enumerate(self._ids)}
+        found = [candidate_id for candidate_id in candidate_ids if candidate_id in lookup]
+        return found, np.array([lookup[candidate_id] for candidate_id in found], dtype=np.int64)
+
+    def candidate_ids(self, rows: np.ndarray) -> List[str]:
+        with self._lock:
+            return [self._ids[row] for row in rows.tolist()]
+
+    @STAGE_SECONDS.labels("vector_scoring").time()
+    def score_matrix(self, jobs: List[JobProfile], rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rule-based scores of resumes (rows) against jobs (columns), in one pass
+
+        rows selects a subset of the pool; by default every stored resume is scored.
+        """
+        with self._lock:
+            count = len(self._ids)
+            if rows is None:
+                rows = np.arange(count)
+            skills = self._skills[rows]
+            titles = self._titles[rows]
+            years = self._years[rows]
+            education = self._education[rows]
+
+        job_skills = np.array([encode_skills(job.skill_hits) for job in jobs], dtype=np.uint64)
+        job_titles = np.array([encode_titles(job.title_hits) for job in jobs], dtype=np.uint8)
+
+        # Job-independent part: 5 points per recognised skill, experience and education
+        base = popcount(skills).astype(np.int32) * 5
+        base += np.minimum(30, years.astype(np.int32) * 5)
+        base += education * 10
+
+        # Skills shared with the job earn another 10 (15 in total), a matching title 20
+        scores = base[:, None] + popcount(skills[:, None] & job_skills[None, :]).astype(np.int32) * 10
+        scores += ((titles[:, None] & job_titles[None, :]) != 0) * 20
+        return np.minimum(scores, 100)
+
+    def score(self, job: JobProfile) -> np.ndarray:
+        """Rule-based score of every stored resume against a job, in one pass"""
+        return self.score_matrix([job])[:, 0]
+
+    def rank(self, job: JobProfile, limit: Optional[int] = None) -> List[Tuple[str, int, List[str]]]:
+        """Best-scoring resumes as (candidate_id, score, matched skills)"""
+        scores = self.score(job)
+        if limit is not None and limit < len(scores):
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        job_skills = encode_skills(job.skill_hits)
+        with self._lock:
+            return [
+                (self._ids[row], int(scores[row]), decode_skills(int(self._skills[row]) & job_skills))
+                for row in top.tolist()
+            ]
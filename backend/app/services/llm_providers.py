@@ -0,0 +1,194 @@
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional
+from app.config import settings
+from app.services.prompt_builder import GEMINI_ANALYSIS_TEMPLATE, OPENAI_ANALYSIS_TEMPLATE, estimate_tokens
+from app.services.structured_output import GEMINI_RESPONSE_SCHEMA, OPENAI_RESPONSE_FORMAT
+from app.utils.metrics import record_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class LLMProvider(ABC):
+    """Interface every LLM backend implements
+
+    stream_analysis yields the text of a JSON analysis as it arrives;
+    generate_text returns free-form text such as an email body, or None when
+    the provider cannot write it and callers should use their template.
+    """
+    name = "base"
+    template = OPENAI_ANALYSIS_TEMPLATE
+
+    @abstractmethod
+    def stream_analysis(self, prompt: str) -> Iterator[str]:
+        ...
+
+    @abstractmethod
+    def generate_text(self, prompt: str) -> Optional[str]:
+        ...
+
+
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+    template = GEMINI_ANALYSIS_TEMPLATE
+
+    def __init__(self, api_key: str, model: str = None):
+        import google.generativeai as genai
+        self._genai = genai
+        if settings.GEMINI_API_ENDPOINT:
+            genai.configure(api_key=api_key, transport="rest",
+                            client_options={"api_endpoint": settings.GEMINI_API_ENDPOINT})
+        else:
+            genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model or settings.GEMINI_MODEL)
+        self.response_schema = self._sdk_schema(GEMINI_RESPONSE_SCHEMA)
+
+    def _sdk_schema(self, schema: Dict) -> Dict:
+        """The response schema with its keys named as the installed SDK's Schema proto has them"""
+        schema = dict(schema)
+        ordering = schema.pop('propertyOrdering', None)
+        if ordering is not None:
+            # Only google-ai-generativelanguage 0.6.18 and later know the field; older
+            # releases reject the whole schema, so it is left out there instead
+            if 'property_ordering' in self._genai.protos.Schema.meta.fields:
+                schema['property_ordering'] = ordering
+            else:
+                logger.warning("Gemini SDK cannot order response fields; early scores arrive after "
+                               "concerns and recommendation", extra={"provider": self.name})
+        return schema
+
+    def stream_analysis(self, prompt: str) -> Iterator[str]:
+        response = self.model.generate_content(
+            prompt,
+            generation_config=self._genai.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=self.response_schema,
+                temperature=0.3
+            ),
+            stream=True
+        )
+        for chunk in response:
+            yield chunk.text
+        self._record_usage(response)
+
+    def generate_text(self, prompt: str) -> str:
+        response = self.model.generate_content(prompt)
+        self._record_usage(response)
+        return response.text.strip()
+
+    def _record_usage(self, response):
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            record_tokens(self.name, usage.prompt_token_count, usage.candidates_token_count)
+
+
+class OpenAIProvider(LLMProvider):
+    name = "openai"
+    template = OPENAI_ANALYSIS_TEMPLATE
+
+    def __init__(self, api_key: str, model: str = None):
+        from openai import OpenAI
+        self.client = OpenAI(api_key=api_key, base_url=settings.OPENAI_BASE_URL)
+        self.model = model or settings.OPENAI_MODEL
+
+    def stream_analysis(self, prompt: str) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "You are an HR analyst. Return only valid JSON."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=500,
+            response_format=OPENAI_RESPONSE_FORMAT,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        for chunk in stream:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
+            # The final chunk carries token usage and no choices
+            if chunk.usage is not None:
+                record_tokens(self.name, chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+
+    def generate_text(self, prompt: str) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7,
+            max_tokens=400
+        )
+        if response.usage is not None:
+            record_tokens(self.name, response.usage.prompt_tokens, response.usage.completion_tokens)
+        return response.choices[0].message.content.strip()
+
+
+class LocalStubProvider(LLMProvider):
+    """Deterministic offline provider for development, tests and load tests
+
+    The same prompt always produces the same analysis. An optional fixed latency
+    makes it usable as a stand-in when exercising routing and hedging. It writes
+    no free-form text, so emails fall back to their templates, which carry the
+    candidate's name and interview details.
+    """
+    name = "local"
+
+    def __init__(self, latency_ms: int = None):
+        self.latency = (latency_ms if latency_ms is not None else settings.LOCAL_LLM_LATENCY_MS) / 1000
+
+    def stream_analysis(self, prompt: str) -> Iterator[str]:
+        digest = int(hashlib.sha256(prompt.encode()).hexdigest(), 16)
+        analysis = {
+            "score": round((digest % 10001) / 100, 1),
+            "summary": "Deterministic local analysis",
+            "skills_match": [],
+            "experience_years": digest % 15,
+            "strengths": [],
+            "concerns": [],
+            "recommendation": "review"
+        }
+        if self.latency:
+            time.sleep(self.latency)
+
+        # Stream in small pieces so callers exercise incremental parsing
+        text = json.dumps(analysis)
+        record_tokens(self.name, estimate_tokens(prompt), estimate_tokens(text))
+        for start in range(0, len(text), 32):
+            yield text[start:start + 32]
+
+    def generate_text(self, prompt: str) -> Optional[str]:
+        if self.latency:
+            time.sleep(self.latency)
+        return None
+
+
+def build_providers() -> List[LLMProvider]:
+    """Instantiate the configured providers in priority order
+
+    LLM_PROVIDERS is a comma-separated list (e.g. "gemini,openai,local"). When it
+    is unset, Gemini and then OpenAI are used for whichever keys are present.
+    """
+    names = [name.strip() for name in settings.LLM_PROVIDERS.split(',') if name.strip()]
+    configured = bool(names)
+    if not configured:
+        names = ["gemini", "openai"]
+
+    keys = {"gemini": settings.GEMINI_API_KEY, "openai": settings.OPENAI_API_KEY}
+    providers = []
+    for name in names:
+        if name == "local":
+            providers.append(LocalStubProvider())
+        elif name not in keys:
+            logger.warning("Ignoring unknown LLM provider", extra={"provider": name})
+        elif not keys[name]:
+            # Expected for the default list; a provider asked for by name should have a key
+            if configured:
+                logger.warning("Skipping LLM provider without an API key", extra={"provider": name})
+        elif name == "gemini":
+            providers.append(GeminiProvider(keys[name]))
+        else:
+            providers.append(OpenAIProvider(keys[name]))
+    return providers
@@ -0,0 +1,187 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+from app.config import settings
+from app.services.llm_providers import LLMProvider
+from app.utils.metrics import LLM_CALL_SECONDS, LLM_ERRORS, QUEUE_DEPTH
+from app.utils.tracing import span
+
+T = TypeVar("T")
+
+QUOTA_TERMS = ("quota", "rate limit", "billing", "429", "403")
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderHealth:
+    """Rolling latency and error statistics for one provider"""
+
+    def __init__(self, window: int = 200):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.cooldown_until = 0.0
+        self.calls = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self.calls += 1
+            self.latencies.append(latency)
+            self.outcomes.append(True)
+
+    def record_failure(self, error: Exception):
+        with self._lock:
+            self.calls += 1
+            self.failures += 1
+            self.outcomes.append(False)
+
+            # Quota and rate-limit errors take much longer to clear than blips
+            recent = list(self.outcomes)[-3:]
+            if any(term in str(error).lower() for term in QUOTA_TERMS):
+                self.cooldown_until = time.monotonic() + settings.LLM_QUOTA_COOLDOWN
+            elif len(recent) == 3 and not any(recent):
+                self.cooldown_until = time.monotonic() + settings.LLM_FAILURE_COOLDOWN
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    @property
+    def error_rate(self) -> float:
+        outcomes = list(self.outcomes)
+        return outcomes.count(False) / len(outcomes) if outcomes else 0.0
+
+    def percentile(self, q: float) -> Optional[float]:
+        latencies = sorted(self.latencies)
+        if len(latencies) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    def snapshot(self) -> Dict:
+        p50 = self.percentile(0.5)
+        p95 = self.percentile(0.95)
+        return {
+            'calls': self.calls,
+            'failures': self.failures,
+            'error_rate': round(self.error_rate, 3),
+            'p50_ms': round(p50 * 1000) if p50 is not None else None,
+            'p95_ms': round(p95 * 1000) if p95 is not None else None,
+            'available': self.available
+        }
+
+
+class LLMRouter:
+    """Routes each call across providers with health-based failover and hedging
+
+    The healthiest provider is tried first. If it has not answered within its
+    own p95 latency of starting, a duplicate request goes to the next provider
+    and whichever finishes first wins. Failed attempts fail over to the next
+    provider; providers in cooldown are skipped while any other is available.
+    """
+
+    def __init__(self, providers: List[LLMProvider], hedge: bool = None):
+        self.providers = providers
+        self.hedge = settings.LLM_HEDGE_ENABLED if hedge is None else hedge
+        self.health: Dict[str, ProviderHealth] = {p.name: ProviderHealth() for p in providers}
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.LLM_MAX_CONCURRENCY,
+            thread_name_prefix="llm"
+        )
+
+    def ordered(self) -> List[LLMProvider]:
+        """Providers to try in preference order: low error rate, then configured order
+
+        Providers in cooldown are left out, unless all of them are.
+        """
+        available = [p for p in self.providers if self.health[p.name].available]
+        return sorted(available or self.providers, key=lambda p: self.health[p.name].error_rate > 0.5)
+
+    def _hedge_delay(self, provider: LLMProvider) -> Optional[float]:
+        if not self.hedge:
+            return None
+        p95 = self.health[provider.name].percentile(0.95)
+        if p95 is None:
+            return None
+        return max(p95, settings.LLM_HEDGE_MIN_DELAY)
+
+    def _submit(self, provider: LLMProvider, call: Callable[[LLMProvider], T]) -> Tuple[Future, threading.Event]:
+        """Run call(provider) in the executor; the event is set once it leaves the queue and starts"""
+        health = self.health[provider.name]
+        waiting = QUEUE_DEPTH.labels("llm_calls")
+        running = threading.Event()
+
+        def timed():
+            waiting.dec()
+            running.set()
+            started = time.monotonic()
+            try:
+                with span("llm", provider=provider.name):
+                    result = call(provider)
+            except Exception as e:
+                health.record_failure(e)
+                LLM_CALL_SECONDS.labels(provider.name, "error").observe(time.monotonic() - started)
+                LLM_ERRORS.labels(provider.name, type(e).__name__).inc()
+                raise
+            latency = time.monotonic() - started
+            health.record_success(latency)
+            LLM_CALL_SECONDS.labels(provider.name, "success").observe(latency)
+            return result
+
+        waiting.inc()
+        # Carry the caller's trace into the executor thread
+        return self.executor.submit(contextvars.copy_context().run, timed), running
+
+    def call(self, call: Callable[[LLMProvider], T]) -> T:
+        """Run call(provider) against the best provider, hedging and failing over as needed"""
+        if not self.providers:
+            raise RuntimeError("No LLM providers configured")
+
+        queue = self.ordered()
+        in_flight: Dict[Future, LLMProvider] = {}
+        last_error: Optional[Exception] = None
+
+        primary = queue.pop(0)
+        future, running = self._submit(primary, call)
+        in_flight[future] = primary
+        hedge_delay = self._hedge_delay(primary) if queue else None
+
+        while in_flight:
+            if hedge_delay is not None:
+                # Time the primary from when it starts: a call still queued for an
+                # executor thread is not slow, and hedging it would add load when
+                # the executor is already saturated
+                running.wait()
+            done, _ = wait(list(in_flight), timeout=hedge_delay, return_when=FIRST_COMPLETED)
+
+            if not done:
+                # Primary is slower than its usual p95: race a duplicate on the next provider
+                backup = queue.pop(0)
+                logger.info("Hedging slow LLM call", extra={"provider": primary.name, "backup": backup.name})
+                in_flight[self._submit(backup, call)[0]] = backup
+                hedge_delay = None
+                continue
+
+            for future in done:
+                provider = in_flight.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    logger.warning("LLM call failed", extra={"provider": provider.name, "error": str(e)})
+                    last_error = e
+
+            # Everything in flight failed: fail over to the next provider
+            if not in_flight and queue:
+                primary = queue.pop(0)
+                future, running = self._submit(primary, call)
+                in_flight[future] = primary
+                hedge_delay = self._hedge_delay(primary) if queue else None
+
+        raise last_error
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: health.snapshot() for name, health in self.health.items()}
@@ -0,0 +1,115 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.services.ai_agent import AIAgent
+from app.services.feature_store import FeatureStore
+from app.services.resume_document import job_profile, job_text
+from app.services.resume_parser import ResumeParser, ResumeRejected
+from app.utils.database import Candidate, Job
+
+logger = logging.getLogger(__name__)
+
+
+class MatchingEngine:
+    """Scores many candidates against many jobs at once
+
+    The full matrix comes from the vectorized rule-based features in the
+    FeatureStore. Optionally the best cells are then re-scored with the LLM,
+    which keeps the number of paid calls independent of the matrix size.
+    """
+
+    def __init__(self, feature_store: FeatureStore, ai_agent: AIAgent, resume_parser: ResumeParser):
+        self.feature_store = feature_store
+        self.ai_agent = ai_agent
+        self.resume_parser = resume_parser
+
+    def match(self, db: Session, job_ids: Optional[List[str]] = None, candidate_ids: Optional[List[str]] = None,
+              top_jobs: int = 3, refine_top: int = 0, include_matrix: bool = True) -> Dict:
+        self.feature_store.refresh(db)
+
+        query = db.query(Job)
+        if job_ids is not None:
+            query = query.filter(Job.id.in_(job_ids))
+        jobs = query.order_by(Job.created_at).all()
+
+        if candidate_ids is None:
+            rows = None
+        else:
+            candidate_ids, rows = self.feature_store.rows_for(candidate_ids)
+
+        scores = self.feature_store.score_matrix([job_profile(job_text(job)) for job in jobs], rows)
+        if candidate_ids is None:
+            candidate_ids = self.feature_store.candidate_ids(np.arange(scores.shape[0]))
+        logger.debug("Scored match matrix", extra={"candidates": scores.shape[0], "jobs": scores.shape[1]})
+
+        refined = []
+        if refine_top > 0 and scores.size:
+            refined = self._refine(db, scores, candidate_ids, jobs, min(refine_top, settings.MATCH_MAX_REFINE))
+            for row, column, score in refined:
+                scores[row, column] = score
+
+        best_fit = {}
+        if jobs:
+            top_jobs = max(1, min(top_jobs, len(jobs)))
+            best = np.argsort(-scores, axis=1, kind='stable')[:, :top_jobs]
+            for row, candidate_id in enumerate(candidate_ids):
+                best_fit[candidate_id] = [
+                    {'job_id': jobs[column].id, 'title': jobs[column].title, 'score': int(scores[row, column])}
+                    for column in best[row].tolist()
+                ]
+
+        result = {
+            'jobs': [{'job_id': job.id, 'title': job.title} for job in jobs],
+            'candidates': candidate_ids,
+            'best_fit': best_fit,
+            'refined': [
+                {'candidate_id': candidate_ids[row], 'job_id': jobs[column].id, 'score': score}
+                for row, column, score in refined
+            ]
+        }
+        if include_matrix:
+            result['scores'] = scores.tolist()
+        return result
+
+    def _refine(self, db: Session, scores: np.ndarray, candidate_ids: List[str], jobs: List[Job],
+                limit: int) -> List[Tuple[int, int, int]]:
+        """Re-score the highest cells with the LLM, returning (row, column, score)"""
+        if not self.ai_agent.use_ai:
+            logger.warning("No LLM providers configured - skipping match refinement")
+            return []
+
+        limit = min(limit, scores.size)
+        flat = np.argpartition(-scores, limit - 1, axis=None)[:limit]
+        cells = [(int(row), int(column)) for row, column in zip(*np.unravel_index(flat, scores.shape))]
+
+        selected = list({candidate_ids[row] for row, _ in cells})
+        rows = {candidate.id: candidate for candidate in db.query(Candidate).filter(Candidate.id.in_(selected))}
+
+        # Each resume is parsed once, however many of its cells are refined
+        parsed: Dict[str, Optional[Dict]] = {}
+        for candidate_id in selected:
+            parsed[candidate_id] = None
+            candidate = rows.get(candidate_id)
+            if candidate is None or not candidate.resume_path or not os.path.exists(candidate.resume_path):
+                continue
+            try:
+                parsed[candidate_id] = self.resume_parser.parse_resume(candidate.resume_path)
+            except ResumeRejected as e:
+                logger.warning("Cannot refine match", extra={"candidate_id": candidate.id, "error": str(e)})
+
+        def refine(cell: Tuple[int, int]) -> Optional[Tuple[int, int, int]]:
+            row, column = cell
+            resume_data = parsed.get(candidate_ids[row])
+            if resume_data is None:
+                return None
+            job = jobs[column]
+            candidate_info = dict(resume_data, job_id=job.id)
+            candidate_score = self.ai_agent.analyze_resume_match(resume_data['full_text'], job_text(job), candidate_info)
+            return row, column, int(round(candidate_score.score))
+
+        with ThreadPoolExecutor(max_workers=settings.MATCH_REFINE_CONCURRENCY) as executor:
+            return [result for result in executor.map(refine, cells) if result is not None]
@@ -0,0 +1,134 @@
+import math
+import re
+from typing import Dict, List
+from app.config import settings
+from app.services.resume_document import ResumeDocument
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    # tiktoken is optional; fall back to the usual ~4 characters per token estimate
+    _encoding = None
+
+# Sections most predictive of fit go first; the header holds contacts we pass separately
+SECTION_PRIORITY = ('skills', 'experience', 'education', 'other', 'header')
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens in text using a local tokenizer"""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return math.ceil(len(text) / 4)
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Cut text to at most budget tokens, preferring a line or word boundary"""
+    if budget <= 0:
+        return ""
+    if estimate_tokens(text) <= budget:
+        return text
+
+    if _encoding is not None:
+        cut = _encoding.decode(_encoding.encode(text)[:budget])
+    else:
+        cut = text[:budget * 4]
+
+    boundary = max(cut.rfind('\n'), cut.rfind(' '))
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary]
+    return cut.rstrip()
+
+
+def collapse_whitespace(text: str) -> str:
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+class PromptBuilder:
+    """Builds compact, section-aware LLM prompts within a token budget"""
+
+    def __init__(self, token_budget: int = None):
+        self.token_budget = token_budget or settings.LLM_PROMPT_TOKEN_BUDGET
+        # The job description may take at most a third of the budget
+        self.job_share = 1 / 3
+
+    def compact_job(self, job_description: str, budget: int) -> str:
+        return truncate_to_tokens(collapse_whitespace(job_description), budget)
+
+    def compact_resume(self, document: ResumeDocument, budget: int) -> str:
+        """Fill the budget with resume sections in priority order"""
+        if not any(section in document.sections for section in SECTION_PRIORITY[:3]):
+            # No recognizable headings, so the best we can do is the leading text
+            return truncate_to_tokens(collapse_whitespace(document.text), budget)
+
+        parts: List[str] = []
+        remaining = budget
+
+        for section in SECTION_PRIORITY:
+            body = document.sections.get(section)
+            if not body or remaining <= 0:
+                continue
+
+            block = f"{section.upper()}: {collapse_whitespace(body)}"
+            tokens = estimate_tokens(block)
+            if tokens > remaining:
+                block = truncate_to_tokens(block, remaining)
+                tokens = remaining
+            parts.append(block)
+            remaining -= tokens
+
+        return "\n".join(parts)
+
+    def build(self, template: str, document: ResumeDocument, job_description: str, **fields) -> str:
+        """Render template with compacted `job` and `resume` fields fitted to the budget"""
+        overhead = estimate_tokens(template.format(job="", resume="", **fields))
+        available = max(0, self.token_budget - overhead)
+
+        job_text = self.compact_job(job_description, int(available * self.job_share))
+        resume_budget = available - estimate_tokens(job_text)
+        resume_text = self.compact_resume(document, resume_budget)
+
+        return template.format(job=job_text, resume=resume_text, **fields)
+
+
+GEMINI_ANALYSIS_TEMPLATE = """You are an expert HR AI agent. Analyze this resume against the job description and provide a detailed assessment.
+
+JOB DESCRIPTION:
+{job}
+
+RESUME:
+{resume}
+
+CANDIDATE INFO:
+- Name: {name}
+- Email: {email}
+- Phone: {phone}
+
+INSTRUCTIONS:
+Respond with the JSON analysis: score, a brief summary of strengths and fit, matched skills, years of experience, strengths, concerns and a recommendation.
+
+Score the candidate 0-100 based on:
+- Skills alignment with job requirements (40%)
+- Relevant experience and years (30%)
+- Education and qualifications (20%)
+- Overall fit and potential (10%)
+
+Be thorough but concise in your analysis."""
+
+OPENAI_ANALYSIS_TEMPLATE = """Analyze this resume against the job description. Score the candidate 0-100 and return the JSON analysis.
+
+Job: {job}
+Resume: {resume}"""
+
+
+def candidate_fields(candidate_info: Dict) -> Dict[str, str]:
+    """Template fields describing the candidate"""
+    return {
+        'name': candidate_info.get('name') or 'Unknown',
+        'email': candidate_info.get('email') or 'No email',
+        'phone': candidate_info.get('phone') or 'No phone',
+    }
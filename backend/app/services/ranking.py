@@ -0,0 +1,148 @@
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models.schemas import CandidateScore
+from app.services.feature_store import SKILL_BITS, decode_skills, encode_skills
+from app.utils.database import Candidate
+
+# Candidates read per query when a ranking is listed; stays under SQLite's bound-parameter limit
+LOAD_BATCH = 500
+
+# Writes a row's summary from its score and matched skills
+Summarize = Callable[[float, List[str]], str]
+
+
+def _encode_skills(skills_match: List[str]) -> Tuple[int, Optional[Tuple[str, ...]]]:
+    """Skill bitset of skills_match, plus the list itself if the bitset cannot reproduce it"""
+    if all(skill in SKILL_BITS for skill in skills_match):
+        bits = encode_skills(frozenset(skills_match))
+        if decode_skills(bits) == list(skills_match):
+            return bits, None
+    # Skills named outside the taxonomy (or out of its order), as LLM analyses may
+    return 0, tuple(sys.intern(skill) for skill in skills_match)
+
+
+class Ranking:
+    """A published candidate ranking, best first, held as columns
+
+    Only what ordering and selecting candidates needs stays in memory: IDs,
+    scores, years of experience and matched skills as a bitset over the skill
+    taxonomy, a few dozen bytes per candidate. Names, contacts, summaries and
+    resume paths are read from the candidates table when the ranking is
+    listed, so large rankings do not keep a model and its text per candidate
+    alive, and resume paths moved by storage compaction are never stale.
+
+    summarize, if given, writes each summary from the row's score and skills
+    instead of reading the stored one, for rankings re-scored without the LLM.
+    Rankings are immutable; insert returns a new one.
+    """
+
+    __slots__ = ('_ids', '_scores', '_years', '_skills', '_other_skills', '_summarize')
+
+    def __init__(self, ids: np.ndarray, scores: np.ndarray, years: np.ndarray, skills: np.ndarray,
+                 other_skills: Dict[str, Tuple[str, ...]], summarize: Optional[Summarize] = None):
+        self._ids = ids
+        self._scores = scores
+        self._years = years  # -1 where unknown
+        self._skills = skills
+        self._other_skills = other_skills
+        self._summarize = summarize
+
+    @classmethod
+    def from_scores(cls, candidates: Iterable[CandidateScore], summarize: Optional[Summarize] = None) -> "Ranking":
+        """Ranking of already ordered candidates"""
+        ids, scores, years, skills = [], [], [], []
+        other_skills = {}
+        for candidate in candidates:
+            bits, other = _encode_skills(candidate.skills_match)
+            if other is not None:
+                other_skills[candidate.candidate_id] = other
+            ids.append(candidate.candidate_id.encode())
+            scores.append(candidate.score)
+            years.append(-1 if candidate.experience_years is None else candidate.experience_years)
+            skills.append(bits)
+
+        return cls(
+            np.array(ids, dtype=np.bytes_),
+            np.array(scores, dtype=np.float64),
+            np.array(years, dtype=np.int16),
+            np.array(skills, dtype=np.uint64),
+            other_skills,
+            summarize
+        )
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def insert(self, candidate: CandidateScore) -> Tuple["Ranking", int]:
+        """This ranking with candidate placed by score, replacing an earlier entry, and its 1-based rank
+
+        Ties keep arrival order, as a stable sort by score would.
+        """
+        keep = self._ids != candidate.candidate_id.encode()
+        scores = self._scores[keep]
+        at = int(np.searchsorted(-scores, -candidate.score, side='right'))
+
+        added = Ranking.from_scores([candidate])
+        other_skills = {
+            candidate_id: skills for candidate_id, skills in self._other_skills.items()
+            if candidate_id != candidate.candidate_id
+        }
+        other_skills.update(added._other_skills)
+
+        def placed(column: str) -> np.ndarray:
+            current = getattr(self, column)[keep]
+            # Concatenating also widens the ID column for a longer ID
+            return np.concatenate([current[:at], getattr(added, column), current[at:]])
+
+        ranking = Ranking(
+            placed('_ids'), placed('_scores'), placed('_years'), placed('_skills'),
+            other_skills, self._summarize
+        )
+        return ranking, at + 1
+
+    def rows_for(self, candidate_ids: Iterable[str]) -> np.ndarray:
+        """Rows of the given candidates, in ranking order; unranked IDs are skipped"""
+        wanted = np.array([candidate_id.encode() for candidate_id in candidate_ids], dtype=np.bytes_)
+        return np.flatnonzero(np.isin(self._ids, wanted))
+
+    def load(self, db: Session, rows: Optional[np.ndarray] = None) -> List[Dict]:
+        """Candidates of the ranking (or of the given rows) as CandidateScore fields, best first
+
+        Candidates deleted since they were ranked are left out.
+        """
+        if rows is None:
+            rows = np.arange(len(self))
+        ids = [candidate_id.decode() for candidate_id in self._ids[rows].tolist()]
+
+        stored = {}
+        for start in range(0, len(ids), LOAD_BATCH):
+            query = db.query(
+                Candidate.id, Candidate.name, Candidate.email, Candidate.phone, Candidate.summary, Candidate.resume_path
+            ).filter(Candidate.id.in_(ids[start:start + LOAD_BATCH]))
+            stored.update((row.id, row) for row in query)
+
+        candidates = []
+        for candidate_id, score, years, bits in zip(
+            ids, self._scores[rows].tolist(), self._years[rows].tolist(), self._skills[rows].tolist()
+        ):
+            row = stored.get(candidate_id)
+            if row is None:
+                continue
+            if candidate_id in self._other_skills:
+                skills = list(self._other_skills[candidate_id])
+            else:
+                skills = decode_skills(bits)
+            candidates.append({
+                "candidate_id": candidate_id,
+                "name": row.name,
+                "email": row.email,
+                "phone": row.phone,
+                "score": score,
+                "summary": self._summarize(score, skills) if self._summarize else row.summary or "",
+                "skills_match": skills,
+                "experience_years": years if years >= 0 else None,
+                "resume_path": row.resume_path or ""
+            })
+        return candidates
@@ -0,0 +1,138 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from app.services.extraction import DateRange, find_date_ranges, find_email, find_phone, find_stated_experience, tenure_years
+
+# Skill taxonomy used by rule-based scoring, in scoring order
+TECH_SKILLS = {
+    'programming': ['python', 'javascript', 'java', 'c++', 'react', 'node', 'angular'],
+    'data': ['sql', 'mysql', 'postgresql', 'mongodb', 'pandas', 'numpy'],
+    'cloud': ['aws', 'azure', 'gcp', 'docker', 'kubernetes'],
+    'web': ['html', 'css', 'bootstrap', 'rest api'],
+    'mobile': ['android', 'ios', 'flutter', 'react native'],
+    'devops': ['git', 'jenkins', 'ci/cd', 'linux']
+}
+ALL_SKILLS: Tuple[str, ...] = tuple(skill for skills in TECH_SKILLS.values() for skill in skills)
+
+EDUCATION_KEYWORDS = ('bachelor', 'master', 'degree', 'university', 'computer science', 'engineering')
+JOB_TITLES = ('developer', 'engineer', 'programmer', 'analyst')
+
+SECTION_HEADINGS = {
+    'experience': (
+        'experience', 'work experience', 'professional experience', 'employment',
+        'employment history', 'work history', 'career history', 'internships'
+    ),
+    'education': ('education', 'academic background', 'academics', 'qualifications'),
+    'skills': ('skills', 'technical skills', 'core competencies', 'technologies', 'tech stack'),
+    'other': (
+        'projects', 'certifications', 'summary', 'profile', 'objective', 'achievements',
+        'awards', 'publications', 'interests', 'languages', 'references', 'contact'
+    ),
+}
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+_SPACES = re.compile(r'[ \t\r\f\v]+')
+
+
+@dataclass
+class ResumeDocument:
+    """Resume text analyzed once and shared by every scoring and prompt stage"""
+    text: str
+    lower: str
+    sections: Dict[str, str]
+    date_ranges: List[DateRange]
+    name: str
+    email: Optional[str]
+    phone: Optional[str]
+    skill_hits: FrozenSet[str]
+    title_hits: FrozenSet[str]
+    has_education: bool
+    stated_experience_years: Optional[int] = None
+
+    @property
+    def experience_years(self) -> int:
+        if self.stated_experience_years is not None:
+            return self.stated_experience_years
+        if self.date_ranges:
+            return max(1, tenure_years(self.date_ranges))
+        return 1
+
+    @classmethod
+    def from_text(cls, raw_text: str, email: Optional[str] = None, phone: Optional[str] = None) -> "ResumeDocument":
+        """Build a document from extracted resume text
+
+        Contacts already found by the parser can be passed in to skip searching for them again.
+        """
+        lines = []
+        sections: Dict[str, List[str]] = {}
+        current = 'header'
+        name = None
+
+        for raw_line in raw_text.split('\n'):
+            line = _SPACES.sub(' ', raw_line).strip()
+            if not line:
+                continue
+
+            # Usually name is in the first few lines
+            if name is None and len(lines) < 5 and len(line) > 2 and len(line.split()) <= 4:
+                if not any(char.isdigit() for char in line) and '@' not in line:
+                    name = line
+
+            heading = _HEADING_LOOKUP.get(line.lower().rstrip(':').strip())
+            if heading and len(line) < 40:
+                current = heading
+            else:
+                sections.setdefault(current, []).append(line)
+
+            lines.append(line)
+
+        text = '\n'.join(lines)
+        lower = text.lower()
+
+        if email is None:
+            email = find_email(text)
+        if phone is None:
+            phone = find_phone(text)
+
+        section_text = {section: '\n'.join(body) for section, body in sections.items()}
+        # Dates under education or projects are not work experience
+        date_ranges = find_date_ranges(section_text.get('experience') or text)
+
+        return cls(
+            text=text,
+            lower=lower,
+            sections=section_text,
+            date_ranges=date_ranges,
+            name=name or "Unknown Candidate",
+            email=email,
+            phone=phone,
+            skill_hits=frozenset(skill for skill in ALL_SKILLS if skill in lower),
+            title_hits=frozenset(title for title in JOB_TITLES if title in lower),
+            has_education=any(keyword in lower for keyword in EDUCATION_KEYWORDS),
+            stated_experience_years=find_stated_experience(lower)
+        )
+
+
+@dataclass(frozen=True)
+class JobProfile:
+    """Job description features used by rule-based scoring"""
+    lower: str
+    skill_hits: FrozenSet[str]
+    title_hits: FrozenSet[str]
+
+
+def job_text(job) -> str:
+    """Text a job description is scored on, from a Job row or JobDescription"""
+    return f"{job.title}\n{job.description}\n{job.requirements}"
+
+
+@lru_cache(maxsize=128)
+def job_profile(job_description: str) -> JobProfile:
+    """Analyze a job description once; every resume in a batch reuses the result"""
+    lower = job_description.lower()
+    return JobProfile(
+        lower=lower,
+        skill_hits=frozenset(skill for skill in ALL_SKILLS if skill in lower),
+        title_hits=frozenset(title for title in JOB_TITLES if title in lower)
+    )
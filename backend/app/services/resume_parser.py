@@ -1,35 +1,85 @@
 import PyPDF2
 import fitz  # pymupdf
-import re
-from typing import Dict, List, Optional
+import logging
+from typing import Dict, Iterator, List, Optional
 import os
+from app.config import settings
+from app.services.extraction import find_email, find_phone
+from app.services.resume_document import ResumeDocument
+from app.utils.ids import file_content_hash
+from app.utils.metrics import STAGE_SECONDS
+from app.utils.storage import is_compressed, read_resume
+
+logger = logging.getLogger(__name__)
+
+class ResumeRejected(Exception):
+    """Raised when a PDF is too large or cannot be read as a resume"""
 
 class ResumeParser:
     def __init__(self):
-        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-        self.phone_pattern = re.compile(r'[\+]?[1-9]?[0-9]{7,15}')
+        self.max_bytes = settings.MAX_PDF_BYTES
+        self.max_pages = settings.MAX_PDF_PAGES
+        self.page_limit = settings.PDF_PAGE_LIMIT
+        self.char_budget = settings.PDF_CHAR_BUDGET
+        self.contact_pages = settings.CONTACT_SCAN_PAGES
         
+    def open_pdf(self, file_path: str) -> fitz.Document:
+        """Open a PDF, rejecting oversized, encrypted or malformed files up front"""
+        try:
+            # Cold resumes are stored compressed and opened from memory
+            data = read_resume(file_path) if is_compressed(file_path) else None
+            size = len(data) if data is not None else os.path.getsize(file_path)
+        except OSError as e:
+            raise ResumeRejected(f"Cannot read file: {e}")
+        if size > self.max_bytes:
+            raise ResumeRejected(f"PDF too large ({size} bytes, limit {self.max_bytes})")
+
+        try:
+            doc = fitz.open(stream=data, filetype="pdf") if data is not None else fitz.open(file_path, filetype="pdf")
+        except Exception as e:
+            raise ResumeRejected(f"Malformed PDF: {e}")
+
+        if doc.needs_pass:
+            doc.close()
+            raise ResumeRejected("PDF is password protected")
+        if doc.page_count == 0:
+            doc.close()
+            raise ResumeRejected("PDF has no pages")
+        if doc.page_count > self.max_pages:
+            doc.close()
+            raise ResumeRejected(f"PDF has {doc.page_count} pages, limit is {self.max_pages}")
+
+        return doc
+
+    def iter_page_text(self, doc: fitz.Document) -> Iterator[str]:
+        """Yield page text one page at a time within the page and character budget"""
+        remaining = self.char_budget
+        for page_number in range(min(doc.page_count, self.page_limit)):
+            text = doc.load_page(page_number).get_text()
+            if len(text) >= remaining:
+                yield text[:remaining]
+                return
+            remaining -= len(text)
+            yield text
+
+    @STAGE_SECONDS.labels("pdf_extract").time()
     def extract_text_from_pdf(self, file_path: str) -> str:
         """Extract text from PDF using pymupdf"""
         try:
-            doc = fitz.open(file_path)
-            text = ""
-            for page in doc:
-                text += page.get_text()
-            doc.close()
-            return text
+            doc = self.open_pdf(file_path)
+            try:
+                return "".join(self.iter_page_text(doc))
+            finally:
+                doc.close()
         except Exception as e:
-            print(f"Error extracting text from {file_path}: {e}")
+            logger.warning("Cannot extract text", extra={"file": file_path, "error": str(e)})
             return ""
     
     def extract_contact_info(self, text: str) -> Dict[str, Optional[str]]:
         """Extract email and phone from resume text"""
-        email_match = self.email_pattern.search(text)
-        phone_match = self.phone_pattern.search(text)
-        
         return {
-            "email": email_match.group() if email_match else None,
-            "phone": phone_match.group() if phone_match else None
+            "email": find_email(text),
+            "phone": find_phone(text)
         }
     
     def extract_name(self, text: str) -> str:
@@ -45,15 +95,37 @@ class ResumeParser:
         return "Unknown Candidate"
     
     def parse_resume(self, file_path: str) -> Dict:
-        """Parse complete resume and return structured data"""
-        text = self.extract_text_from_pdf(file_path)
-        contact_info = self.extract_contact_info(text)
-        name = self.extract_name(text)
-        
+        """Parse complete resume and return structured data
+
+        Raises ResumeRejected for files that are too large or unreadable.
+        """
+        pages: List[str] = []
+        contact_info = {"email": None, "phone": None}
+
+        with STAGE_SECONDS.labels("pdf_extract").time():
+            doc = self.open_pdf(file_path)
+            try:
+                for page_number, page_text in enumerate(self.iter_page_text(doc)):
+                    pages.append(page_text)
+
+                    # Contact details live near the top, so stop looking once both are found
+                    if page_number < self.contact_pages and not (contact_info["email"] and contact_info["phone"]):
+                        found = self.extract_contact_info(page_text)
+                        contact_info["email"] = contact_info["email"] or found["email"]
+                        contact_info["phone"] = contact_info["phone"] or found["phone"]
+            except Exception as e:
+                raise ResumeRejected(f"Malformed PDF: {e}")
+            finally:
+                doc.close()
+
+        document = ResumeDocument.from_text("".join(pages), **contact_info)
+
         return {
-            "name": name,
-            "email": contact_info["email"],
-            "phone": contact_info["phone"],
-            "full_text": text,
-            "file_path": file_path
-        }
\ No newline at end of file
+            "name": document.name,
+            "email": document.email,
+            "phone": document.phone,
+            "full_text": document.text,
+            "file_path": file_path,
+            "content_hash": file_content_hash(file_path),
+            "document": document
+        }
@@ -0,0 +1,235 @@
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.schemas import CandidateScore
+from app.services.ai_agent import AIAgent
+from app.services.dedup import DuplicateDetector, reuse_score
+from app.services.feature_store import FeatureStore
+from app.services.resume_parser import ResumeParser
+from app.services.thumbnails import ThumbnailService
+from app.utils.database import Candidate, ScreeningJob, ScreeningTask, upsert
+from app.utils.metrics import cache_lookup
+from app.utils.tracing import span
+
+Notify = Callable[[str, Dict], None]
+
+
+class ScreeningPipeline:
+    """Parse, score and store one resume against a job description
+
+    Shared by the API process and the screening workers so both store exactly
+    the same rows, signatures and features.
+    """
+
+    def __init__(self, resume_parser: ResumeParser, ai_agent: AIAgent, duplicate_detector: DuplicateDetector,
+                 feature_store: FeatureStore, thumbnail_service: Optional[ThumbnailService] = None):
+        self.resume_parser = resume_parser
+        self.ai_agent = ai_agent
+        self.duplicate_detector = duplicate_detector
+        self.feature_store = feature_store
+        self.thumbnail_service = thumbnail_service
+
+    def process(self, file_path: str, db: Session, job_id: str, job_text: str,
+                notify: Optional[Notify] = None) -> CandidateScore:
+        """Screen the resume at file_path; notify, if given, gets (event, data) per stage
+
+        The resume is committed as soon as it is stored, so no write transaction
+        is held while other resumes wait on scoring; SQLite allows one writer at
+        a time. Raises ResumeRejected for files that cannot be read as a resume.
+        """
+        with span("parse"):
+            resume_data = self.resume_parser.parse_resume(file_path)
+        resume_data['job_id'] = job_id
+        if notify:
+            notify("parsed", {"name": resume_data['name']})
+
+        # Near-duplicates of a resume already scored for this job reuse that score
+        duplicate = None
+        if settings.DEDUP_ENABLED:
+            with span("dedup"):
+                duplicate = self.duplicate_detector.check(db, resume_data, job_id)
+            cache_lookup("dedup_scores", duplicate is not None)
+
+        with span("score"):
+            if duplicate is not None:
+                candidate_score = reuse_score(duplicate, resume_data)
+            else:
+                candidate_score = self.ai_agent.analyze_resume_match(
+                    resume_data['full_text'],
+                    job_text,
+                    resume_data,
+                    on_score=(lambda info, score: notify("early_score", {"name": info.get('name'), "score": score})) if notify else None
+                )
+
+        with span("persist"):
+            # Re-uploads of the same resume update the existing row, even when they race
+            candidate = Candidate.from_score(candidate_score, job_id=job_id, content_hash=resume_data['content_hash'])
+            upsert(db, candidate)
+
+            if settings.DEDUP_ENABLED:
+                self.duplicate_detector.record(db, candidate, resume_data, duplicate.id if duplicate else None)
+            self.feature_store.record(db, candidate, resume_data['document'])
+            db.commit()
+
+        # Previews render in the background so screening is not delayed
+        if settings.THUMBNAILS_ENABLED and self.thumbnail_service is not None:
+            self.thumbnail_service.schedule(file_path, resume_data['content_hash'])
+
+        return candidate_score
+
+
+class ScreeningQueue:
+    """Durable screening queue stored in the screening_jobs and screening_tasks tables
+
+    Workers claim tasks with a conditional UPDATE, so any number of worker
+    processes can share one database. A claim is a lease: tasks whose worker
+    died are handed out again after SCREENING_LEASE_SECONDS.
+    """
+
+    def enqueue(self, db: Session, job_id: str, files: List[Tuple[str, str]]) -> ScreeningJob:
+        """Queue (filename, file_path) pairs for screening against job_id"""
+        screening_job = ScreeningJob(job_id=job_id, status="queued", total=len(files), created_at=datetime.now())
+        db.add(screening_job)
+        db.flush()
+        db.add_all(
+            ScreeningTask(screening_job_id=screening_job.id, filename=filename, file_path=file_path, status="queued")
+            for filename, file_path in files
+        )
+        db.commit()
+        return screening_job
+
+    def claim(self, db: Session, worker_id: str, limit: int) -> List[int]:
+        """Atomically take up to limit queued tasks for this worker and return their ids"""
+        candidates = [
+            task_id for (task_id,) in
+            db.query(ScreeningTask.id).filter(ScreeningTask.status == "queued")
+            .order_by(ScreeningTask.id).limit(limit * 2)
+        ]
+
+        claimed = []
+        for task_id in candidates:
+            if len(claimed) >= limit:
+                break
+            # Another worker may have taken it since the SELECT; only one UPDATE wins
+            result = db.execute(
+                update(ScreeningTask)
+                .where(ScreeningTask.id == task_id, ScreeningTask.status == "queued")
+                .values(
+                    status="running",
+                    claimed_by=worker_id,
+                    claimed_at=datetime.now(),
+                    attempts=ScreeningTask.attempts + 1
+                )
+            )
+            if result.rowcount == 1:
+                claimed.append(task_id)
+        db.commit()
+
+        if not claimed:
+            return []
+
+        job_ids = {
+            job_id for (job_id,) in
+            db.query(ScreeningTask.screening_job_id).filter(ScreeningTask.id.in_(claimed)).distinct()
+        }
+        db.execute(
+            update(ScreeningJob)
+            .where(ScreeningJob.id.in_(job_ids), ScreeningJob.status == "queued")
+            .values(status="running", started_at=datetime.now())
+        )
+        db.commit()
+        return claimed
+
+    def finish(self, db: Session, task: ScreeningTask, status: str,
+               candidate_score: Optional[CandidateScore] = None, error: Optional[str] = None):
+        """Record a task outcome: done, skipped, failed, or queued again for a retry"""
+        task.status = status
+        task.error = error
+        if candidate_score is not None:
+            task.candidate_id = candidate_score.candidate_id
+            task.score = candidate_score.score
+
+        counter = {"done": "processed", "skipped": "skipped", "failed": "failed"}.get(status)
+        if counter:
+            db.execute(
+                update(ScreeningJob)
+                .where(ScreeningJob.id == task.screening_job_id)
+                .values({counter: getattr(ScreeningJob, counter) + 1})
+            )
+        db.commit()
+
+        remaining = db.query(ScreeningTask).filter(
+            ScreeningTask.screening_job_id == task.screening_job_id,
+            ScreeningTask.status.in_(("queued", "running"))
+        ).count()
+        if remaining == 0:
+            db.execute(
+                update(ScreeningJob)
+                .where(ScreeningJob.id == task.screening_job_id, ScreeningJob.status != "done")
+                .values(status="done", finished_at=datetime.now())
+            )
+            db.commit()
+
+    def release_expired(self, db: Session) -> int:
+        """Requeue tasks whose worker stopped before finishing them"""
+        cutoff = datetime.now() - timedelta(seconds=settings.SCREENING_LEASE_SECONDS)
+        expired = db.query(ScreeningTask).filter(
+            ScreeningTask.status == "running",
+            ScreeningTask.claimed_at < cutoff
+        ).all()
+
+        for task in expired:
+            if task.attempts >= settings.SCREENING_MAX_ATTEMPTS:
+                self.finish(db, task, "failed", error="Worker lease expired too many times")
+            else:
+                task.status = "queued"
+                task.claimed_by = None
+        db.commit()
+        return len(expired)
+
+    def depths(self, db: Session) -> Dict[str, int]:
+        """Number of queued and running tasks across all screening jobs"""
+        counts = dict(
+            db.query(ScreeningTask.status, func.count(ScreeningTask.id))
+            .filter(ScreeningTask.status.in_(("queued", "running")))
+            .group_by(ScreeningTask.status)
+        )
+        return {status: counts.get(status, 0) for status in ("queued", "running")}
+
+    def progress(self, db: Session, screening_job_id: str, include_tasks: bool = False) -> Optional[Dict]:
+        screening_job = db.get(ScreeningJob, screening_job_id)
+        if screening_job is None:
+            return None
+
+        finished = screening_job.processed + screening_job.skipped + screening_job.failed
+        progress = {
+            "id": screening_job.id,
+            "job_id": screening_job.job_id,
+            "status": screening_job.status,
+            "total": screening_job.total,
+            "processed": screening_job.processed,
+            "skipped": screening_job.skipped,
+            "failed": screening_job.failed,
+            "percent": round(100 * finished / screening_job.total, 1) if screening_job.total else 100.0,
+            "created_at": screening_job.created_at.isoformat() if screening_job.created_at else None,
+            "started_at": screening_job.started_at.isoformat() if screening_job.started_at else None,
+            "finished_at": screening_job.finished_at.isoformat() if screening_job.finished_at else None,
+        }
+
+        if include_tasks:
+            tasks = db.query(ScreeningTask).filter(
+                ScreeningTask.screening_job_id == screening_job_id
+            ).order_by(ScreeningTask.id)
+            progress["tasks"] = [
+                {
+                    "file": task.filename,
+                    "status": task.status,
+                    "candidate_id": task.candidate_id,
+                    "score": task.score,
+                    "error": task.error
+                }
+                for task in tasks
+            ]
+        return progress
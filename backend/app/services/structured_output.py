@@ -0,0 +1,152 @@
+from typing import Dict, List, Optional
+
+# Field order matters: score comes first so it can be read off the stream early
+ANALYSIS_FIELDS = ('score', 'summary', 'skills_match', 'experience_years', 'strengths', 'concerns', 'recommendation')
+
+# Gemini response_schema (OpenAPI subset). Without propertyOrdering Gemini emits
+# keys alphabetically, which would stream concerns and recommendation before score.
+GEMINI_RESPONSE_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'score': {'type': 'NUMBER'},
+        'summary': {'type': 'STRING'},
+        'skills_match': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'experience_years': {'type': 'INTEGER'},
+        'strengths': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'concerns': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'recommendation': {'type': 'STRING'},
+    },
+    'required': list(ANALYSIS_FIELDS),
+    'propertyOrdering': list(ANALYSIS_FIELDS),
+}
+
+# OpenAI structured outputs (strict JSON Schema)
+OPENAI_RESPONSE_FORMAT = {
+    'type': 'json_schema',
+    'json_schema': {
+        'name': 'candidate_analysis',
+        'strict': True,
+        'schema': {
+            'type': 'object',
+            'properties': {
+                'score': {'type': 'number'},
+                'summary': {'type': 'string'},
+                'skills_match': {'type': 'array', 'items': {'type': 'string'}},
+                'experience_years': {'type': 'integer'},
+                'strengths': {'type': 'array', 'items': {'type': 'string'}},
+                'concerns': {'type': 'array', 'items': {'type': 'string'}},
+                'recommendation': {'type': 'string'},
+            },
+            'required': list(ANALYSIS_FIELDS),
+            'additionalProperties': False,
+        },
+    },
+}
+
+_NUMBER_CHARS = frozenset('+-0123456789.eE')
+
+
+class IncrementalScoreParser:
+    """Pulls the top-level "score" out of a streamed JSON object as soon as it is complete
+
+    Tracks just enough JSON state (nesting depth, strings and escapes) to tell a
+    top-level key from the same text inside a string value.
+    """
+
+    def __init__(self):
+        self.score: Optional[float] = None
+        self._chunks: List[str] = []
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key_chars: List[str] = []
+        self._key: Optional[str] = None
+        self._value_for: Optional[str] = None
+        self._number: Optional[List[str]] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> Optional[float]:
+        """Consume the next piece of the response; returns the score once known"""
+        self._chunks.append(chunk)
+        if self.score is None:
+            self._buffer += chunk
+            self._scan()
+        return self.score
+
+    def _scan(self):
+        text = self._buffer
+
+        while self._pos < len(text):
+            ch = text[self._pos]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key:
+                        self._key = "".join(self._key_chars)
+                        self._expect_key = False
+                elif self._depth == 1 and self._expect_key:
+                    self._key_chars.append(ch)
+                continue
+
+            if self._number is not None:
+                if ch in _NUMBER_CHARS:
+                    self._number.append(ch)
+                    continue
+                try:
+                    self.score = float("".join(self._number))
+                except ValueError:
+                    self._number = None
+                    self._pos -= 1
+                    continue
+                self._buffer = ""
+                return
+
+            if ch.isspace():
+                continue
+
+            if self._value_for is not None:
+                # First character of a top-level value
+                if self._value_for == 'score' and ch in _NUMBER_CHARS:
+                    self._value_for = None
+                    self._number = [ch]
+                    continue
+                self._value_for = None
+
+            if ch == '"':
+                self._in_string = True
+                self._key_chars = []
+            elif ch in '{[':
+                self._depth += 1
+                if self._depth == 1 and ch == '{':
+                    self._expect_key = True
+            elif ch in '}]':
+                self._depth -= 1
+            elif ch == ',' and self._depth == 1:
+                self._expect_key = True
+            elif ch == ':' and self._depth == 1:
+                self._value_for = self._key
+
+
+def coerce_analysis(analysis: Dict) -> Dict:
+    """Fill defaults for any fields a truncated or partial response is missing"""
+    return {
+        'score': float(analysis.get('score', 0)),
+        'summary': analysis.get('summary') or 'AI analysis completed',
+        'skills_match': list(analysis.get('skills_match') or []),
+        'experience_years': int(analysis.get('experience_years') or 0),
+        'strengths': list(analysis.get('strengths') or []),
+        'concerns': list(analysis.get('concerns') or []),
+        'recommendation': analysis.get('recommendation') or '',
+    }
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Sequence
+import fitz  # pymupdf
+from app.config import settings
+from app.utils.metrics import cache_lookup
+from app.utils.storage import is_compressed, read_resume
+
+logger = logging.getLogger(__name__)
+
+# Output formats PyMuPDF can encode without extra imaging libraries
+THUMBNAIL_FORMATS = {
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+}
+
+
+def thumbnail_path(cache_dir: str, content_hash: str, width: int, fmt: str) -> str:
+    """Cache location of a thumbnail; sharded by hash prefix to keep directories small"""
+    return os.path.join(cache_dir, content_hash[:2], f"{content_hash}_{width}.{fmt}")
+
+
+def render_thumbnails(pdf_path: str, content_hash: str, cache_dir: str,
+                      widths: Sequence[int], formats: Sequence[str]) -> int:
+    """Render the first page of a PDF at each width and format, skipping cached files
+
+    Runs in worker processes, so it only touches its arguments and the disk.
+    Returns the number of images written.
+    """
+    pending = [
+        (width, fmt) for width in widths for fmt in formats
+        if not os.path.exists(thumbnail_path(cache_dir, content_hash, width, fmt))
+    ]
+    if not pending:
+        return 0
+
+    os.makedirs(os.path.join(cache_dir, content_hash[:2]), exist_ok=True)
+    if is_compressed(pdf_path):
+        doc = fitz.open(stream=read_resume(pdf_path), filetype="pdf")
+    else:
+        doc = fitz.open(pdf_path, filetype="pdf")
+    try:
+        page = doc.load_page(0)
+        pixmaps = {}
+        for width, fmt in pending:
+            if width not in pixmaps:
+                zoom = width / page.rect.width
+                pixmaps[width] = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+
+            # Write then rename, so readers never see a partial image
+            path = thumbnail_path(cache_dir, content_hash, width, fmt)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(pixmaps[width].tobytes(fmt))
+            os.replace(temp_path, path)
+    finally:
+        doc.close()
+
+    return len(pending)
+
+
+class ThumbnailService:
+    """First-page PDF previews rendered in a process pool and cached on disk
+
+    Thumbnails are keyed by the resume's content hash, so a cached image never
+    goes stale and can be served with immutable cache headers.
+    """
+
+    def __init__(self, cache_dir: str = None, widths: Sequence[int] = None, workers: int = None):
+        self.cache_dir = cache_dir or settings.THUMBNAIL_DIR
+        self.widths = tuple(widths or settings.THUMBNAIL_WIDTHS)
+        self.formats = tuple(THUMBNAIL_FORMATS)
+        self.workers = workers or settings.THUMBNAIL_WORKERS
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def start(self):
+        """Launch the worker processes now
+
+        Called before the server accepts connections: forked workers inherit
+        the parent's open sockets, and a worker started mid-request would keep
+        that client's connection from ever closing.
+        """
+        self._pool().submit(os.getpid).result()
+
+    def path_for(self, content_hash: str, width: int, fmt: str) -> str:
+        return thumbnail_path(self.cache_dir, content_hash, width, fmt)
+
+    def is_cached(self, content_hash: str, width: int, fmt: str) -> bool:
+        return os.path.exists(self.path_for(content_hash, width, fmt))
+
+    def schedule(self, pdf_path: str, content_hash: str) -> Future:
+        """Start rendering every size in the background; concurrent requests share one job"""
+        with self._lock:
+            future = self._in_flight.get(content_hash)
+            if future is not None:
+                return future
+            future = self._pool().submit(
+                render_thumbnails, pdf_path, content_hash, self.cache_dir, self.widths, self.formats
+            )
+            self._in_flight[content_hash] = future
+
+        # Outside the lock: the callback runs immediately if the job already finished
+        future.add_done_callback(lambda _: self._finished(content_hash))
+        return future
+
+    def _finished(self, content_hash: str):
+        with self._lock:
+            future = self._in_flight.pop(content_hash, None)
+        if future is not None and future.exception() is not None:
+            logger.warning("Thumbnail rendering failed", extra={"content_hash": content_hash[:12], "error": str(future.exception())})
+
+    async def get(self, pdf_path: str, content_hash: str, width: int, fmt: str) -> str:
+        """Path of a cached thumbnail, rendering it first if needed"""
+        path = self.path_for(content_hash, width, fmt)
+        cached = os.path.exists(path)
+        cache_lookup("thumbnails", cached)
+        if not cached:
+            await asyncio.wrap_future(self.schedule(pdf_path, content_hash))
+        return path
+
+    @property
+    def pending(self) -> int:
+        """Resumes whose thumbnails are still rendering"""
+        with self._lock:
+            return len(self._in_flight)
+
+    def etag(self, content_hash: str, width: int, fmt: str) -> str:
+        return f'"{content_hash[:32]}-{width}-{fmt}"'
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
@@ -6,22 +6,53 @@ It includes database configurations, common utilities, and shared functionality.
 
 Modules:
     database: Database connection, models, and session management
+    archive: Safe streaming extraction of uploaded ZIP archives
+    uploads: Non-blocking, size-limited storage of uploaded PDFs
+    storage: Content-addressed, hash-sharded resume files, optionally gzip-compressed
+    ids: Deterministic candidate IDs and resume content hashes
+    payload_cache: Pre-serialized, compressed JSON responses with ETags
+    metrics: Prometheus metrics for stages, LLM calls, queues and caches
+    tracing: Per-request trace spans, Server-Timing headers and slow-trace log
+    log: Structured, queue-backed logging configuration
+    export: Streaming CSV, NDJSON and Parquet exports of ranked candidates
 """
 
 from app.utils.database import (
     get_db,
     Candidate,
     Job,
+    CandidateSignature,
+    CandidateFeatures,
+    ScreeningJob,
+    ScreeningTask,
     Base,
     engine,
     SessionLocal
 )
+from app.utils.archive import iter_zip_pdfs, ArchiveLimitError
+from app.utils.uploads import save_upload, UploadRejected
+from app.utils.ids import content_hash, file_content_hash, make_candidate_id, candidate_id_for
+from app.utils.payload_cache import PayloadCache, payload_response
 
 __all__ = [
     'get_db',
     'Candidate',
     'Job', 
+    'CandidateSignature',
+    'CandidateFeatures',
+    'ScreeningJob',
+    'ScreeningTask',
     'Base',
     'engine',
-    'SessionLocal'
+    'SessionLocal',
+    'iter_zip_pdfs',
+    'ArchiveLimitError',
+    'save_upload',
+    'UploadRejected',
+    'content_hash',
+    'file_content_hash',
+    'make_candidate_id',
+    'candidate_id_for',
+    'PayloadCache',
+    'payload_response'
 ]
\ No newline at end of file
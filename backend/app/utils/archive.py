@@ -0,0 +1,94 @@
+import hashlib
+import os
+import zipfile
+from typing import BinaryIO, Iterator, Tuple
+from app.config import settings
+from app.utils.storage import commit_file, incoming_path
+from app.utils.uploads import is_pdf_header
+
+class ArchiveLimitError(Exception):
+    """Raised when an archive as a whole exceeds the configured safety limits"""
+
+
+def iter_zip_pdfs(fileobj: BinaryIO, dest_dir: str) -> Iterator[Tuple[str, str, str]]:
+    """Extract PDF members one at a time, yielding (member name, file path, error)
+
+    Members are streamed into storage under dest_dir in fixed-size chunks so
+    memory stays flat no matter how large the archive is; they are stored by
+    content hash, so member paths never reach the file system. The caller is
+    expected to process each yielded file before the next one is extracted.
+    `file path` is None and `error` is set for members that were skipped.
+    """
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        raise ArchiveLimitError("File is not a valid ZIP archive")
+
+    with archive:
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith('__MACOSX/')
+            and info.filename.lower().endswith('.pdf')
+        ]
+
+        if len(members) > settings.MAX_ZIP_MEMBERS:
+            raise ArchiveLimitError(
+                f"Archive contains {len(members)} PDFs, limit is {settings.MAX_ZIP_MEMBERS}"
+            )
+
+        declared_total = sum(info.file_size for info in members)
+        if declared_total > settings.MAX_ZIP_UNCOMPRESSED_BYTES:
+            raise ArchiveLimitError(
+                f"Archive expands to {declared_total} bytes, limit is {settings.MAX_ZIP_UNCOMPRESSED_BYTES}"
+            )
+
+        extracted_total = 0
+
+        for info in members:
+            if info.file_size > settings.MAX_ZIP_MEMBER_BYTES:
+                yield info.filename, None, "File too large"
+                continue
+
+            if info.compress_size and info.file_size / info.compress_size > settings.MAX_ZIP_COMPRESSION_RATIO:
+                yield info.filename, None, "Suspicious compression ratio"
+                continue
+
+            file_path = incoming_path(dest_dir)
+            digest = hashlib.sha256()
+            written = 0
+            error = None
+
+            # Declared sizes can lie, so enforce the limits on the bytes actually inflated
+            try:
+                with archive.open(info) as src, open(file_path, 'wb') as dst:
+                    while True:
+                        chunk = src.read(settings.UPLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        if not written and not is_pdf_header(chunk):
+                            error = "Not a PDF file"
+                            break
+                        written += len(chunk)
+                        if written > settings.MAX_ZIP_MEMBER_BYTES:
+                            error = "File too large"
+                            break
+                        if extracted_total + written > settings.MAX_ZIP_UNCOMPRESSED_BYTES:
+                            error = "Archive uncompressed size limit exceeded"
+                            break
+                        digest.update(chunk)
+                        dst.write(chunk)
+            except (zipfile.BadZipFile, RuntimeError, NotImplementedError) as e:
+                # Corrupt, encrypted or unsupported member
+                error = f"Could not extract: {e}"
+
+            if error:
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                if extracted_total + written > settings.MAX_ZIP_UNCOMPRESSED_BYTES:
+                    raise ArchiveLimitError(error)
+                yield info.filename, None, error
+                continue
+
+            extracted_total += written
+            yield info.filename, commit_file(file_path, dest_dir, digest.hexdigest()), None
@@ -1,15 +1,86 @@
-from sqlalchemy import create_engine, Column, String, Float, DateTime, Text, Integer
+from sqlalchemy import create_engine, event, func, inspect, select, text, Column, Index, String, Float, DateTime, Text, Integer, BigInteger, Boolean, LargeBinary
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import ClauseElement
 from app.config import settings
+from app.models.schemas import CandidateScore
+from app.utils.metrics import STAGE_SECONDS
+from app.utils.tracing import record_span
+from datetime import datetime
+from typing import Callable, Hashable, List
+import ast
+import time
 import uuid
 
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Commit latency (including the final flush) for every session
+@event.listens_for(SessionLocal, "before_commit")
+def _commit_started(session):
+    session.info["commit_started"] = time.perf_counter()
+
+@event.listens_for(SessionLocal, "after_commit")
+def _commit_finished(session):
+    started = session.info.pop("commit_started", None)
+    if started is not None:
+        duration = time.perf_counter() - started
+        STAGE_SECONDS.labels("db_commit").observe(duration)
+        record_span("commit", started, duration)
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _commit_abandoned(session):
+    session.info.pop("commit_started", None)
+
+def stage_for_commit(db: Session, key: Hashable, apply: Callable[[List], None]) -> List:
+    """List of changes to apply once db's open transaction commits
+
+    The list for key is created on first use in a transaction; apply gets it
+    after the commit, and a rollback or close discards it. In-memory indexes of
+    table rows stage their updates here, so rolled-back rows never reach them.
+    """
+    staged = db.info.setdefault("staged_for_commit", {})
+    if key not in staged:
+        staged[key] = ([], apply)
+    return staged[key][0]
+
+# Registered on Session rather than SessionLocal so staging works in every session
+@event.listens_for(Session, "after_commit")
+def _apply_staged(session):
+    for changes, apply in session.info.pop("staged_for_commit", {}).values():
+        apply(changes)
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_staged(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("staged_for_commit", None)
+
+def next_sequence(column):
+    """SQL for a number above every value stored in column, evaluated in the INSERT
+
+    SQLite holds its write lock from a transaction's first write until it
+    commits, so numbers drawn this way follow commit order: a reader that has
+    seen everything up to N finds every later commit above N, however long
+    the transaction ran. That relies on writes being serialized, as on SQLite.
+    """
+    return select(func.coalesce(func.max(column), 0) + 1).scalar_subquery()
+
+def parse_skills(skills_match: str) -> list:
+    """skills_match is stored as the repr of a list"""
+    try:
+        return list(ast.literal_eval(skills_match or '[]'))
+    except (ValueError, SyntaxError):
+        return []
+
 class Candidate(Base):
     __tablename__ = "candidates"
+    __table_args__ = (
+        # Ranked reads of one job's candidates or of all of them, e.g. exports
+        Index("ix_candidates_job_score", "job_id", "score", "id"),
+        Index("ix_candidates_score", "score", "id"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False)
@@ -19,10 +90,50 @@ class Candidate(Base):
     summary = Column(Text)
     skills_match = Column(Text)  # JSON string
     experience_years = Column(Integer)
-    resume_path = Column(String)
+    resume_path = Column(String, index=True)
     job_id = Column(String)
+    content_hash = Column(String, index=True)  # SHA-256 of the resume file
     created_at = Column(DateTime)
     interview_scheduled = Column(DateTime)
+    
+    @classmethod
+    def from_score(cls, candidate_score, job_id: str = None, content_hash: str = None) -> "Candidate":
+        """Build a database row from an analyzed CandidateScore
+
+        The row is keyed by the score's deterministic candidate_id, so storing
+        it with upsert replaces an earlier upload of the same resume.
+        """
+        return cls(
+            id=candidate_score.candidate_id,
+            name=candidate_score.name,
+            email=candidate_score.email,
+            phone=candidate_score.phone,
+            score=candidate_score.score,
+            summary=candidate_score.summary,
+            skills_match=str(candidate_score.skills_match),
+            experience_years=candidate_score.experience_years,
+            resume_path=candidate_score.resume_path,
+            job_id=job_id,
+            content_hash=content_hash,
+            created_at=datetime.now()
+        )
+    
+    def skills_list(self) -> list:
+        return parse_skills(self.skills_match)
+    
+    def to_score(self) -> CandidateScore:
+        """The stored analysis as a CandidateScore"""
+        return CandidateScore(
+            candidate_id=self.id,
+            name=self.name,
+            email=self.email,
+            phone=self.phone,
+            score=self.score or 0.0,
+            summary=self.summary or "",
+            skills_match=self.skills_list(),
+            experience_years=self.experience_years,
+            resume_path=self.resume_path or ""
+        )
 
 class Job(Base):
     __tablename__ = "jobs"
@@ -35,11 +146,117 @@ class Job(Base):
     department = Column(String)
     created_at = Column(DateTime)
 
+class CandidateSignature(Base):
+    __tablename__ = "candidate_signatures"
+    
+    candidate_id = Column(String, primary_key=True)
+    job_id = Column(String, index=True)
+    signature = Column(LargeBinary, nullable=False)  # MinHash, uint32 array
+    duplicate_of = Column(String)
+    seq = Column(Integer, index=True)  # Commit order (see next_sequence); lets other processes pick up new rows
+
+class CandidateFeatures(Base):
+    __tablename__ = "candidate_features"
+    
+    candidate_id = Column(String, primary_key=True)
+    content_hash = Column(String, index=True)
+    skills = Column(BigInteger, nullable=False)  # Bitset over the skill taxonomy
+    titles = Column(Integer, nullable=False)  # Bitset over job titles
+    experience_years = Column(Integer, nullable=False)
+    has_education = Column(Boolean, nullable=False)
+    seq = Column(Integer, index=True)  # Commit order (see next_sequence); lets other processes pick up new rows
+
+class ScreeningJob(Base):
+    """A queued batch of resumes to screen against one job description"""
+    __tablename__ = "screening_jobs"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    job_id = Column(String, nullable=False)  # Job description screened against
+    status = Column(String, nullable=False, default="queued")  # queued, running, done
+    total = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+class ScreeningTask(Base):
+    """One resume of a ScreeningJob; claimed and processed by a worker"""
+    __tablename__ = "screening_tasks"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    screening_job_id = Column(String, nullable=False, index=True)
+    filename = Column(String)
+    file_path = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued", index=True)  # queued, running, done, skipped, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    claimed_by = Column(String)
+    claimed_at = Column(DateTime)
+    candidate_id = Column(String)
+    score = Column(Float)
+    error = Column(Text)
+
+def _add_missing_columns():
+    """Add columns introduced after a table was first created
+
+    create_all only creates missing tables, so existing databases would
+    otherwise never see new columns.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
 Base.metadata.create_all(bind=engine)
+_add_missing_columns()
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+def upsert(db: Session, row: Base):
+    """Store row, replacing a stored row with the same primary key
+
+    Session.merge reads the row first and inserts it if none was found, so two
+    sessions storing the same content-derived key at once both insert and the
+    later one fails with IntegrityError. Here the store is a single
+    INSERT ... ON CONFLICT DO UPDATE instead. Columns not set on row keep their
+    stored values, as with merge. SQL expressions set on row, such as
+    next_sequence, are evaluated in the statement.
+
+    The statement runs immediately, so on SQLite the write lock is held from
+    here until the commit; commit promptly rather than across slow work.
+    """
+    insert = _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is None:
+        db.merge(row)
+        return
+    
+    table = row.__table__
+    state = inspect(row).dict
+    values = {column.name: state[column.key] for column in table.columns if column.key in state}
+    primary_key = [column.name for column in table.primary_key.columns]
+    
+    inline = {name: value for name, value in values.items() if isinstance(value, ClauseElement)}
+    
+    statement = insert(table).values(inline)
+    statement = statement.on_conflict_do_update(
+        index_elements=primary_key,
+        set_={name: statement.excluded[name] for name in values if name not in primary_key}
+    )
+    db.execute(statement, {name: value for name, value in values.items() if name not in inline})
@@ -0,0 +1,230 @@
+import csv
+import io
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+import orjson
+from sqlalchemy import select, tuple_
+from app.utils.database import Candidate, SessionLocal, parse_skills
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    # pyarrow is optional; only Parquet exports need it
+    pyarrow = None
+
+EXPORT_COLUMNS = (
+    "rank", "candidate_id", "name", "email", "phone", "score", "experience_years",
+    "skills_match", "summary", "job_id", "created_at", "interview_scheduled"
+)
+
+# Format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+@dataclass
+class ExportFilter:
+    """Which stored candidates to export; unset fields do not filter"""
+    job_id: Optional[str] = None
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    min_experience: Optional[int] = None
+    skill: Optional[str] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    scheduled: Optional[bool] = None
+    limit: Optional[int] = None
+
+    def apply(self, query):
+        # Every stored analysis has a score; rows without one cannot be ranked
+        query = query.where(Candidate.score.isnot(None))
+        if self.job_id is not None:
+            query = query.where(Candidate.job_id == self.job_id)
+        if self.min_score is not None:
+            query = query.where(Candidate.score >= self.min_score)
+        if self.max_score is not None:
+            query = query.where(Candidate.score <= self.max_score)
+        if self.min_experience is not None:
+            query = query.where(Candidate.experience_years >= self.min_experience)
+        if self.skill:
+            # skills_match holds the repr of a list, so a quoted name matches one whole skill
+            query = query.where(Candidate.skills_match.ilike(f"%'{self.skill}'%"))
+        if self.created_after is not None:
+            query = query.where(Candidate.created_at >= self.created_after)
+        if self.created_before is not None:
+            query = query.where(Candidate.created_at < self.created_before)
+        if self.scheduled is not None:
+            query = query.where(
+                Candidate.interview_scheduled.isnot(None) if self.scheduled else Candidate.interview_scheduled.is_(None)
+            )
+        return query
+
+
+@lru_cache(maxsize=4096)
+def _skills(skills_match: str) -> tuple:
+    # The same few skill lists repeat across many candidates
+    return tuple(parse_skills(skills_match))
+
+
+def iter_candidate_pages(filters: ExportFilter, page_size: int = 1000) -> Iterator[List[Dict]]:
+    """Matching candidates, best score first, a page of rows at a time
+
+    Each page is a separate short query that resumes after the last row of the
+    previous one (keyset pagination on score and id), so memory stays flat
+    however many rows match and no read transaction stays open while a slow
+    client downloads; on SQLite that would block every writer. Rows written
+    during an export may or may not be included.
+    """
+    columns = (
+        Candidate.id, Candidate.name, Candidate.email, Candidate.phone, Candidate.score,
+        Candidate.experience_years, Candidate.skills_match, Candidate.summary, Candidate.job_id,
+        Candidate.created_at, Candidate.interview_scheduled
+    )
+    base = filters.apply(select(*columns)).order_by(Candidate.score.desc(), Candidate.id.desc())
+
+    rank = 0
+    last = None
+    while filters.limit is None or rank < filters.limit:
+        size = page_size if filters.limit is None else min(page_size, filters.limit - rank)
+        query = base if last is None else base.where(tuple_(Candidate.score, Candidate.id) < last)
+        with SessionLocal() as db:
+            rows = db.execute(query.limit(size)).all()
+        if not rows:
+            return
+
+        page = []
+        for row in rows:
+            rank += 1
+            page.append({
+                "rank": rank,
+                "candidate_id": row.id,
+                "name": row.name,
+                "email": row.email,
+                "phone": row.phone,
+                "score": row.score,
+                "experience_years": row.experience_years,
+                "skills_match": list(_skills(row.skills_match)),
+                "summary": row.summary,
+                "job_id": row.job_id,
+                "created_at": row.created_at,
+                "interview_scheduled": row.interview_scheduled
+            })
+        yield page
+
+        if len(rows) < size:
+            return
+        last = (rows[-1].score, rows[-1].id)
+
+
+def _spreadsheet_safe(value):
+    # Text starting with these is run as a formula by spreadsheet apps
+    if isinstance(value, str) and value[:1] in ("=", "+", "-", "@", "\t", "\r"):
+        return "'" + value
+    return value
+
+
+def csv_chunks(pages: Iterator[List[Dict]]) -> Iterator[bytes]:
+    """CSV with a header row, one chunk per page
+
+    Starts with a UTF-8 byte order mark so spreadsheet apps detect the encoding.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield ("\ufeff" + buffer.getvalue()).encode()
+
+    for page in pages:
+        buffer.seek(0)
+        buffer.truncate()
+        for row in page:
+            writer.writerow([
+                "; ".join(row[column]) if column == "skills_match"
+                else row[column].isoformat() if isinstance(row[column], datetime)
+                else _spreadsheet_safe(row[column])
+                for column in EXPORT_COLUMNS
+            ])
+        yield buffer.getvalue().encode()
+
+
+def ndjson_chunks(pages: Iterator[List[Dict]]) -> Iterator[bytes]:
+    """One JSON object per line, one chunk per page"""
+    for page in pages:
+        yield b"".join(orjson.dumps(row) + b"\n" for row in page)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file whose contents are taken out as they are written
+
+    Keeps its own position, which the Parquet writer asks for to record offsets.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def parquet_chunks(pages: Iterator[List[Dict]], row_group_size: int = 10000) -> Iterator[bytes]:
+    """A Parquet file written one row group at a time; needs pyarrow"""
+    schema = pyarrow.schema([
+        ("rank", pyarrow.int64()),
+        ("candidate_id", pyarrow.string()),
+        ("name", pyarrow.string()),
+        ("email", pyarrow.string()),
+        ("phone", pyarrow.string()),
+        ("score", pyarrow.float64()),
+        ("experience_years", pyarrow.int32()),
+        ("skills_match", pyarrow.list_(pyarrow.string())),
+        ("summary", pyarrow.string()),
+        ("job_id", pyarrow.string()),
+        ("created_at", pyarrow.timestamp("us")),
+        ("interview_scheduled", pyarrow.timestamp("us")),
+    ])
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression="zstd")
+
+    pending: List[Dict] = []
+    for page in pages:
+        pending.extend(page)
+        if len(pending) >= row_group_size:
+            writer.write_table(pyarrow.Table.from_pylist(pending, schema=schema))
+            pending = []
+            yield sink.take()
+    if pending:
+        writer.write_table(pyarrow.Table.from_pylist(pending, schema=schema))
+    writer.close()
+    yield sink.take()
+
+
+def export_chunks(fmt: str, filters: ExportFilter) -> Iterator[bytes]:
+    """The encoded export, produced lazily as the response is sent"""
+    pages = iter_candidate_pages(filters)
+    if fmt == "csv":
+        return csv_chunks(pages)
+    if fmt == "ndjson":
+        return ndjson_chunks(pages)
+    if fmt == "parquet":
+        return parquet_chunks(pages)
+    raise ValueError(f"Unsupported export format: {fmt}")
@@ -0,0 +1,44 @@
+import gzip
+import hashlib
+from typing import Dict, Optional
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 of a resume's bytes, the stable identity of its content"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_content_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Content hash of a file, read in chunks; of the original content if gzip-compressed"""
+    digest = hashlib.sha256()
+    with (gzip.open if file_path.endswith('.gz') else open)(file_path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_candidate_id(resume_hash: str, job_id: Optional[str] = None) -> str:
+    """Deterministic candidate ID for a resume screened against a job
+
+    Unlike the built-in hash(), this is the same in every process and across
+    restarts, so it can be used as the database key and in shared caches.
+    """
+    key = f"{job_id or ''}:{resume_hash}".encode()
+    return f"cand_{hashlib.sha256(key).hexdigest()[:24]}"
+
+
+def candidate_id_for(candidate_info: Dict, resume_text: Optional[str] = None) -> str:
+    """Candidate ID for parsed resume data, deriving it from the content if unset
+
+    Resumes without a file content hash fall back to hashing their text.
+    """
+    if candidate_info.get('candidate_id'):
+        return candidate_info['candidate_id']
+
+    resume_hash = candidate_info.get('content_hash')
+    if not resume_hash:
+        resume_hash = content_hash((resume_text or candidate_info.get('full_text', '')).encode())
+        candidate_info['content_hash'] = resume_hash
+
+    candidate_info['candidate_id'] = make_candidate_id(resume_hash, candidate_info.get('job_id'))
+    return candidate_info['candidate_id']
@@ -0,0 +1,101 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime
+from typing import Optional
+import orjson
+from app.config import settings
+from app.utils.tracing import current_trace_id
+
+# Attributes every LogRecord has; anything else was passed with extra= and is a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+class StructuredFormatter(logging.Formatter):
+    """One line per record with extra= fields and the current trace id
+
+    json_lines emits JSON objects for log shippers; otherwise fields are
+    appended to the message as key=value pairs.
+    """
+
+    def __init__(self, json_lines: bool = False):
+        super().__init__()
+        self.json_lines = json_lines
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+        if getattr(record, "trace_id", None) is None:
+            fields.pop("trace_id", None)
+
+        timestamp = datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds")
+        if self.json_lines:
+            entry = {
+                "ts": timestamp,
+                "level": record.levelname,
+                "logger": record.name,
+                "msg": record.getMessage(),
+                **fields
+            }
+            if record.exc_info:
+                entry["exc"] = self.formatException(record.exc_info)
+            return orjson.dumps(entry, default=str).decode()
+
+        line = f"{timestamp} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class _TraceIdFilter(logging.Filter):
+    # Runs on the calling thread, where the request's trace is still current
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "trace_id", None) is None:
+            record.trace_id = current_trace_id()
+        return True
+
+
+def configure_logging(level: str = None, fmt: str = None):
+    """Send the app's logs through a queue so writing them never blocks a request
+
+    Safe to call more than once; only the first call installs handlers.
+    """
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(StructuredFormatter(json_lines=(fmt or settings.LOG_FORMAT) == "json"))
+
+    records = queue.SimpleQueue()
+    _handler = logging.handlers.QueueHandler(records)
+    _handler.addFilter(_TraceIdFilter())
+
+    logger = logging.getLogger("app")
+    logger.setLevel((level or settings.LOG_LEVEL).upper())
+    logger.addHandler(_handler)
+    logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(records, output)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def _reconfigure_in_child():
+    # The listener thread does not survive fork, so worker processes start their own
+    global _listener
+    if _listener is None:
+        return
+    logging.getLogger("app").removeHandler(_handler)
+    _listener = None
+    configure_logging()
+
+
+os.register_at_fork(after_in_child=_reconfigure_in_child)
@@ -0,0 +1,87 @@
+from typing import Callable, Dict
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily
+
+# Processing stages: pdf_extract, rule_scoring, vector_scoring, db_commit,
+# calendar_insert, smtp_send
+STAGE_SECONDS = Histogram(
+    "hr_agent_stage_seconds",
+    "Time spent in each processing stage",
+    ["stage"]
+)
+
+LLM_CALL_SECONDS = Histogram(
+    "hr_agent_llm_call_seconds",
+    "LLM provider call latency, including streaming the whole response",
+    ["provider", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+)
+LLM_TOKENS = Counter(
+    "hr_agent_llm_tokens_total",
+    "LLM tokens sent (in) and received (out)",
+    ["provider", "direction"]
+)
+LLM_ERRORS = Counter(
+    "hr_agent_llm_errors_total",
+    "Failed LLM provider calls by exception type",
+    ["provider", "type"]
+)
+
+QUEUE_DEPTH = Gauge(
+    "hr_agent_queue_depth",
+    "Work waiting to be processed, by queue",
+    ["queue"]
+)
+
+# Hit ratio = hit / (hit + miss)
+CACHE_REQUESTS = Counter(
+    "hr_agent_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss)",
+    ["cache", "result"]
+)
+
+
+def cache_lookup(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_tokens(provider: str, tokens_in: int, tokens_out: int):
+    if tokens_in:
+        LLM_TOKENS.labels(provider, "in").inc(tokens_in)
+    if tokens_out:
+        LLM_TOKENS.labels(provider, "out").inc(tokens_out)
+
+
+class _MemoCacheCollector:
+    """Reports functools.lru_cache statistics, which are read rather than counted"""
+
+    def __init__(self):
+        self.caches: Dict[str, Callable] = {}
+
+    def collect(self):
+        family = CounterMetricFamily(
+            "hr_agent_memo_cache_requests",
+            "In-process memoization lookups by cache and result (hit or miss)",
+            labels=["cache", "result"]
+        )
+        for name, function in self.caches.items():
+            info = function.cache_info()
+            family.add_metric([name, "hit"], info.hits)
+            family.add_metric([name, "miss"], info.misses)
+        yield family
+
+
+_memo_caches = _MemoCacheCollector()
+REGISTRY.register(_memo_caches)
+
+
+def register_memo_cache(name: str, function: Callable):
+    """Export hits and misses of a functools.lru_cache-wrapped function"""
+    _memo_caches.caches[name] = function
+
+
+def render_metrics() -> bytes:
+    return generate_latest(REGISTRY)
+
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
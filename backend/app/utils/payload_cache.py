@@ -0,0 +1,96 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+import orjson
+from fastapi import Request, Response
+from app.utils.metrics import cache_lookup
+
+try:
+    import brotli
+except ImportError:
+    # brotli is optional; clients then get gzip
+    brotli = None
+
+
+class CachedPayload:
+    """A JSON body serialized once, with its compressed variants and ETag"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self.gzip = gzip.compress(body, compresslevel=6)
+        self._brotli: Optional[bytes] = None
+        self._lock = threading.Lock()
+
+    @property
+    def brotli(self) -> bytes:
+        # Only compressed for clients that ask for it
+        with self._lock:
+            if self._brotli is None:
+                self._brotli = brotli.compress(self.body, quality=5)
+            return self._brotli
+
+
+class PayloadCache:
+    """Serialized responses keyed by whatever identifies their content
+
+    Callers use a key that changes whenever the data does (for example job id
+    and ranking version), so entries never need invalidating; old keys simply
+    fall out of the small LRU.
+    """
+
+    def __init__(self, name: str = "payload", max_entries: int = 16):
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> CachedPayload:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+        cache_lookup(self.name, payload is not None)
+        if payload is not None:
+            return payload
+
+        payload = CachedPayload(orjson.dumps(build()))
+        with self._lock:
+            self._entries[key] = payload
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+
+def _accepts(request: Request, encoding: str) -> bool:
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip() == encoding and params.replace(" ", "") != "q=0":
+            return True
+    return False
+
+
+def payload_response(request: Request, payload: CachedPayload) -> Response:
+    """Serve a cached payload, answering conditional requests with 304"""
+    headers = {
+        "ETag": payload.etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and payload.etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    if brotli is not None and _accepts(request, "br"):
+        body = payload.brotli
+        headers["Content-Encoding"] = "br"
+    elif _accepts(request, "gzip"):
+        body = payload.gzip
+        headers["Content-Encoding"] = "gzip"
+    else:
+        body = payload.body
+
+    return Response(content=body, media_type="application/json", headers=headers)
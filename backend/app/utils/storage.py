@@ -0,0 +1,82 @@
+import gzip
+import hashlib
+import os
+import uuid
+from typing import IO
+from app.config import settings
+
+# Partially received files; never served and cleaned up by compaction
+INCOMING_DIR = ".incoming"
+COMPRESSED_SUFFIX = ".gz"
+
+
+def shard_path(root: str, content_hash: str, compressed: bool = False) -> str:
+    """Where a resume is stored: <root>/ab/cd/<sha256>.pdf, or .pdf.gz once compressed
+
+    Two levels of hash-prefix directories keep every directory small even
+    with millions of resumes, and identical uploads share one file.
+    """
+    name = f"{content_hash}.pdf{COMPRESSED_SUFFIX if compressed else ''}"
+    return os.path.join(root, content_hash[:2], content_hash[2:4], name)
+
+
+def is_sharded(root: str, path: str) -> bool:
+    """Whether path is in the sharded layout, rather than a legacy flat upload"""
+    relative = os.path.relpath(path, root).split(os.sep)
+    return len(relative) == 3 and relative[2].startswith(relative[0] + relative[1])
+
+
+def is_compressed(path: str) -> bool:
+    return path.endswith(COMPRESSED_SUFFIX)
+
+
+def incoming_path(root: str) -> str:
+    """A new temporary path to receive a file in before it is committed"""
+    directory = os.path.join(root, INCOMING_DIR)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{uuid.uuid4().hex}.part")
+
+
+def commit_file(temp_path: str, root: str, content_hash: str) -> str:
+    """Move a completely written temporary file into place; returns the stored path
+
+    When the same content is already stored (possibly compressed) the new copy
+    is dropped and the stored file is touched, so it counts as recently used.
+    """
+    for existing in (shard_path(root, content_hash), shard_path(root, content_hash, compressed=True)):
+        try:
+            os.utime(existing)
+        except FileNotFoundError:
+            continue
+        os.remove(temp_path)
+        return existing
+
+    path = shard_path(root, content_hash)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(temp_path, path)
+    return path
+
+
+def store_file(source: IO[bytes], root: str) -> str:
+    """Copy a readable binary file into storage; returns the stored path"""
+    temp_path = incoming_path(root)
+    digest = hashlib.sha256()
+    try:
+        with open(temp_path, 'wb') as dst:
+            while chunk := source.read(settings.UPLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+                dst.write(chunk)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return commit_file(temp_path, root, digest.hexdigest())
+
+
+def open_resume(path: str) -> IO[bytes]:
+    """Open a stored resume for reading, decompressing it if it was compressed"""
+    return gzip.open(path, 'rb') if is_compressed(path) else open(path, 'rb')
+
+
+def read_resume(path: str) -> bytes:
+    with open_resume(path) as f:
+        return f.read()
@@ -0,0 +1,206 @@
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+from starlette.datastructures import Headers, MutableHeaders
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("trace", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    start_ms: float
+    duration_ms: float
+    attributes: Dict = field(default_factory=dict)
+
+
+class Trace:
+    """Timed spans of one request or background task
+
+    Spans may be added from worker threads; run_in_threadpool copies the
+    request's context, so they land in the right trace.
+    """
+
+    def __init__(self, name: str, trace_id: str = None):
+        self.name = name
+        self.trace_id = trace_id or uuid.uuid4().hex[:16]
+        self.started_at = time.time()
+        self.duration_ms: Optional[float] = None
+        self.attributes: Dict = {}
+        self.spans: List[Span] = []
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add(self, name: str, started: float, duration: float, attributes: Dict = None):
+        """Record a span from perf_counter start and duration in seconds"""
+        span = Span(name, (started - self._started) * 1000, duration * 1000, attributes or {})
+        with self._lock:
+            self.spans.append(span)
+
+    def finish(self):
+        """Stop the clock; later calls keep the first duration"""
+        if self.duration_ms is None:
+            self.duration_ms = (time.perf_counter() - self._started) * 1000
+
+    def totals(self) -> Dict[str, float]:
+        """Milliseconds per span name; repeated stages (one per resume) are summed"""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for span in self.spans:
+                totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        return totals
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: one metric per stage plus the total so far"""
+        elapsed = (time.perf_counter() - self._started) * 1000
+        parts = [f"{name};dur={ms:.1f}" for name, ms in self.totals().items()]
+        parts.append(f"total;dur={elapsed:.1f}")
+        return ", ".join(parts)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 1) if self.duration_ms is not None else None,
+            "attributes": self.attributes,
+            "totals_ms": {name: round(ms, 1) for name, ms in self.totals().items()},
+            "spans": [
+                {
+                    "name": span.name,
+                    "start_ms": round(span.start_ms, 1),
+                    "duration_ms": round(span.duration_ms, 1),
+                    **({"attributes": span.attributes} if span.attributes else {})
+                }
+                for span in spans
+            ]
+        }
+
+
+class SlowTraceLog:
+    """The most recent traces that took at least threshold_ms"""
+
+    def __init__(self, threshold_ms: float = 1000, keep: int = 100):
+        self.threshold_ms = threshold_ms
+        self._traces = deque(maxlen=keep)
+        self._lock = threading.Lock()
+
+    def offer(self, trace: Trace):
+        if trace.duration_ms is not None and trace.duration_ms >= self.threshold_ms:
+            with self._lock:
+                self._traces.append(trace)
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        with self._lock:
+            traces = list(self._traces)[-limit:]
+        return [trace.to_dict() for trace in reversed(traces)]
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+@contextmanager
+def start_trace(name: str, trace_id: str = None) -> Iterator[Trace]:
+    """Make a new trace current for the enclosed block"""
+    trace = Trace(name, trace_id)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finish()
+        _current_trace.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[None]:
+    """Time the enclosed block as a span of the current trace, if there is one"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, started, time.perf_counter() - started, attributes)
+
+
+def record_span(name: str, started: float, duration: float, **attributes):
+    """Add an already-timed span (perf_counter start, seconds) to the current trace"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, started, duration, attributes)
+
+
+class TracingMiddleware:
+    """Runs every HTTP request inside a trace
+
+    Responses get a Server-Timing header with the time spent per stage (as
+    of when the response started) and an X-Request-ID header with the trace
+    id, which is reused from the request's X-Request-ID if it has one.
+    A trace finishes when the last of the response body has been sent, so
+    background tasks Starlette runs afterwards are not counted in it. Finished
+    traces are offered to slow_traces; event streams are skipped, since they
+    stay open by design.
+    """
+
+    def __init__(self, app, slow_traces: SlowTraceLog, logger):
+        self.app = app
+        self.slow_traces = slow_traces
+        self.logger = logger
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id")
+        if request_id and not (len(request_id) <= 64 and request_id.replace("-", "").isalnum()):
+            request_id = None
+        streaming = False
+        reported = False
+
+        async def send_with_timing(message):
+            nonlocal streaming, reported
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", trace.server_timing())
+                headers.append("X-Request-ID", trace.trace_id)
+                trace.attributes["status"] = message["status"]
+                streaming = headers.get("content-type", "").startswith("text/event-stream")
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                reported = True
+                self._report(trace, streaming)
+
+        with start_trace(f"{scope['method']} {scope['path']}", request_id) as trace:
+            await self.app(scope, receive, send_with_timing)
+
+        # Apps that returned without completing a response
+        if not reported:
+            self._report(trace, streaming)
+
+    def _report(self, trace: Trace, streaming: bool):
+        trace.finish()
+        if streaming:
+            return
+        self.slow_traces.offer(trace)
+        if trace.duration_ms >= self.slow_traces.threshold_ms:
+            self.logger.warning(
+                "Slow request",
+                extra={"trace_id": trace.trace_id, "request": trace.name, "duration_ms": round(trace.duration_ms, 1),
+                       **{f"{name}_ms": round(ms, 1) for name, ms in trace.totals().items()}}
+            )
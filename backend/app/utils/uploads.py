@@ -0,0 +1,76 @@
+import hashlib
+import os
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.utils.storage import commit_file, incoming_path
+from app.utils.tracing import span
+
+# PDF readers accept the header anywhere in the first 1024 bytes
+PDF_MAGIC = b'%PDF-'
+PDF_HEADER_WINDOW = 1024
+
+
+class UploadRejected(Exception):
+    """Raised when an uploaded file fails validation and was not stored"""
+
+
+def is_pdf_header(head: bytes) -> bool:
+    """Check the leading bytes of a file for the PDF signature"""
+    return PDF_MAGIC in head[:PDF_HEADER_WINDOW]
+
+
+def safe_filename(filename: str) -> str:
+    """Strip any client-supplied directories from an upload filename"""
+    name = os.path.basename((filename or '').replace('\\', '/'))
+    if not name or name in ('.', '..'):
+        raise UploadRejected("Missing filename")
+    return name
+
+
+async def save_upload(file: UploadFile, dest_dir: str, max_bytes: int = None) -> str:
+    """Stream an uploaded PDF into storage under dest_dir in fixed-size chunks
+
+    The file is stored by content hash (see app/utils/storage.py), not under
+    its client-supplied name. Disk writes run in the threadpool so a large
+    upload never blocks the event loop. Files that are not PDFs or exceed
+    max_bytes are rejected as early as possible and any partial output is
+    removed.
+    """
+    with span("upload"):
+        return await _store_upload(file, dest_dir, max_bytes or settings.MAX_UPLOAD_BYTES)
+
+
+async def _store_upload(file: UploadFile, dest_dir: str, max_bytes: int) -> str:
+    chunk_size = settings.UPLOAD_CHUNK_SIZE
+    # Stored by content, but a nameless upload is still malformed
+    safe_filename(file.filename)
+
+    # Multipart parsing usually knows the size up front
+    if file.size is not None and file.size > max_bytes:
+        raise UploadRejected(f"File too large (limit {max_bytes} bytes)")
+
+    chunk = await file.read(chunk_size)
+    if not is_pdf_header(chunk):
+        raise UploadRejected("Not a PDF file")
+
+    temp_path = await run_in_threadpool(incoming_path, dest_dir)
+    buffer = await run_in_threadpool(open, temp_path, "wb")
+    digest = hashlib.sha256()
+    written = 0
+
+    try:
+        while chunk:
+            written += len(chunk)
+            if written > max_bytes:
+                raise UploadRejected(f"File too large (limit {max_bytes} bytes)")
+            digest.update(chunk)
+            await run_in_threadpool(buffer.write, chunk)
+            chunk = await file.read(chunk_size)
+    except BaseException:
+        await run_in_threadpool(buffer.close)
+        await run_in_threadpool(os.remove, temp_path)
+        raise
+
+    await run_in_threadpool(buffer.close)
+    return await run_in_threadpool(commit_file, temp_path, dest_dir, digest.hexdigest())
@@ -0,0 +1,11 @@
+"""
+Benchmarks Package
+
+Micro-benchmarks for the resume processing hot paths, run from the backend
+directory with `python -m benchmarks.run`.
+
+Modules:
+    synthetic: Seeded generator of realistic resume text and PDFs (PyMuPDF)
+    run: Benchmark runner with JSON output and baseline regression checks
+    extraction: Correctness corpus and linear-cost checks for contact and experience extraction
+"""
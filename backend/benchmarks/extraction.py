@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Contact and Experience Extraction Checks
+
+Three checks of app/services/extraction.py, each failing the run (exit
+status 1) when it does not hold:
+
+    corpus      every labelled case in benchmarks/extraction_corpus.json
+                (phone formats, dates that look like phones, date range
+                styles, overlapping jobs, ...) extracts as expected
+    synthetic   emails, phones and stated experience of generated resumes
+                (see benchmarks/synthetic.py) match what was generated
+    cost        time on adversarial inputs grows linearly: each extractor
+                runs on inputs built to make backtracking patterns blow up,
+                at a base size and --growth times that, and the time may grow
+                by at most twice --growth
+
+Throughput on ordinary resumes is part of the hot-path benchmarks
+(`python -m benchmarks.run --only contact_regex,experience_regex`).
+
+Run from the backend directory.
+
+Usage:
+    python -m benchmarks.extraction
+    python -m benchmarks.extraction --only corpus,cost --output extraction.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date
+from typing import Callable, Dict, List
+
+# Keep the app away from the real database and log output
+_WORKDIR = tempfile.mkdtemp(prefix="hr-agent-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_WORKDIR, 'app.db')}")
+os.environ.setdefault("THUMBNAIL_DIR", os.path.join(_WORKDIR, "thumbnails"))
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+# Add the backend directory to Python path to import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.extraction import find_date_ranges, find_email, find_phone, find_stated_experience, tenure_years
+from app.services.resume_document import ResumeDocument
+from benchmarks.synthetic import SIZES, SIZE_WEIGHTS, make_resume
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "extraction_corpus.json")
+
+# Inputs that make naive patterns retry a long run from each of its positions
+ADVERSARIAL = {
+    "local_part_run": "a." * 4000,
+    "at_without_domain": ("ab@" + "c" * 30) * 300,
+    "digit_run": "1" * 8000,
+    "spaced_digits": "1 " * 4000,
+    "dashed_digits": "12-" * 3000,
+    "parenthesized_digits": "(1)" * 3000,
+    "year_runs": "2019 - " * 1500,
+    "month_years": "jan 2019 " * 1000,
+    "years_without_experience": "9 years " * 1000,
+}
+EXTRACTORS: Dict[str, Callable[[str], object]] = {
+    "email": find_email,
+    "phone": find_phone,
+    "stated_experience": find_stated_experience,
+    "date_ranges": find_date_ranges,
+}
+
+
+def check_corpus(path: str) -> List[Dict]:
+    """Labelled cases whose extraction differs from the label"""
+    with open(path) as f:
+        corpus = json.load(f)
+    today = date.fromisoformat(corpus["today"])
+    fields = {
+        "email": find_email,
+        "phone": find_phone,
+        "stated_years": find_stated_experience,
+        "tenure_years": lambda text: tenure_years(find_date_ranges(text), today),
+        "document_tenure_years": lambda text: tenure_years(ResumeDocument.from_text(text).date_ranges, today),
+    }
+
+    failures = []
+    for case in corpus["cases"]:
+        for field, extract in fields.items():
+            if field in case:
+                got = extract(case["text"])
+                if got != case[field]:
+                    failures.append({"id": case["id"], "field": field, "expected": case[field], "got": got})
+    return failures
+
+
+def check_synthetic(count: int, seed: int) -> List[Dict]:
+    """Generated resumes whose email, phone or stated experience is not found"""
+    rng = random.Random(seed)
+    failures = []
+    for index in range(count):
+        resume = make_resume(rng, rng.choices(tuple(SIZES), weights=SIZE_WEIGHTS)[0])
+        document = ResumeDocument.from_text(resume.text())
+        expected = {
+            "email": resume.email,
+            "phone": resume.phone,
+            "stated_years": resume.meta["experience_years"],
+        }
+        got = {"email": document.email, "phone": document.phone, "stated_years": document.stated_experience_years}
+        for field in expected:
+            if got[field] != expected[field]:
+                failures.append({"id": f"synthetic_{index}", "field": field, "expected": expected[field], "got": got[field]})
+    return failures
+
+
+def _seconds(extract: Callable[[str], object], text: str, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        extract(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def check_cost(growth: int, repeats: int) -> List[Dict]:
+    """Time of every extractor on every adversarial input, at base size and growth times it"""
+    results = []
+    for input_name, text in ADVERSARIAL.items():
+        for extractor_name, extract in EXTRACTORS.items():
+            small = _seconds(extract, text, repeats)
+            large = _seconds(extract, text * growth, repeats)
+            results.append({
+                "input": input_name,
+                "extractor": extractor_name,
+                "chars": len(text) * growth,
+                "small_ms": round(small * 1000, 3),
+                "large_ms": round(large * 1000, 3),
+                "ratio": round(large / small, 2) if small else None,
+            })
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check contact and experience extraction for correctness and cost")
+    parser.add_argument("--only", help="Comma-separated checks to run (corpus, synthetic, cost)")
+    parser.add_argument("--synthetic", type=int, default=2000, help="Generated resumes to check")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--growth", type=int, default=8, help="How much larger the second adversarial input is")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per adversarial input; the best counts")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    checks = [name.strip() for name in args.only.split(",")] if args.only else ["corpus", "synthetic", "cost"]
+    report = {}
+    failed = False
+
+    if "corpus" in checks:
+        failures = check_corpus(CORPUS)
+        report["corpus"] = {"failures": failures}
+        print(f"{'✅' if not failures else '❌'} Corpus: {len(failures)} mismatches")
+        for failure in failures:
+            print(f"   {failure['id']} {failure['field']}: expected {failure['expected']!r}, got {failure['got']!r}")
+        failed |= bool(failures)
+
+    if "synthetic" in checks:
+        failures = check_synthetic(args.synthetic, args.seed)
+        report["synthetic"] = {"resumes": args.synthetic, "failures": failures}
+        print(f"{'✅' if not failures else '❌'} Synthetic: {len(failures)} mismatches in {args.synthetic} resumes")
+        for failure in failures[:20]:
+            print(f"   {failure['id']} {failure['field']}: expected {failure['expected']!r}, got {failure['got']!r}")
+        failed |= bool(failures)
+
+    if "cost" in checks:
+        results = check_cost(args.growth, args.repeats)
+        limit = 2 * args.growth
+        superlinear = [entry for entry in results if entry["ratio"] and entry["ratio"] > limit]
+        report["cost"] = {"growth": args.growth, "limit": limit, "results": results}
+        print(f"\n{'input':<26}{'extractor':<20}{'chars':>9}{'small ms':>11}{'large ms':>11}{'ratio':>8}")
+        for entry in results:
+            print(f"{entry['input']:<26}{entry['extractor']:<20}{entry['chars']:>9}{entry['small_ms']:>11.3f}"
+                  f"{entry['large_ms']:>11.3f}{entry['ratio'] or 0:>8.1f}")
+        print(f"{'✅' if not superlinear else '❌'} Cost: {len(superlinear)} inputs grew by more than {limit}x")
+        failed |= bool(superlinear)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Hot-Path Micro-Benchmarks
+
+Times the resume parser, the contact and experience regexes, rule-based
+scoring, candidate ranking and database inserts at several scales on
+synthetic resumes (see benchmarks/synthetic.py). Everything runs against a
+temporary SQLite database and corpus directory; nothing in the working
+database is touched.
+
+Results are written as JSON. Passing a previous results file as --baseline
+compares the per-operation median of every benchmark and exits with status 1
+when any is slower than --threshold (e.g. 0.15 = 15%), so a change to one of
+these paths can be checked against the numbers before it.
+
+Run from the backend directory. Parsing 100k PDFs takes a few minutes; use
+--scales 10,1000 for a quick run.
+
+Usage:
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --baseline bench.json --threshold 0.15
+    python -m benchmarks.run --only parse_resume,rule_based_analysis --scales 10,1000
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Keep the app away from the real database, uploads and log output
+_WORKDIR = tempfile.mkdtemp(prefix="hr-agent-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_WORKDIR, 'app.db')}")
+os.environ.setdefault("THUMBNAIL_DIR", os.path.join(_WORKDIR, "thumbnails"))
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+# Add the backend directory to Python path to import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.models.schemas import CandidateScore
+from app.services.ai_agent import AIAgent
+from app.services.extraction import find_date_ranges, find_email, find_phone, find_stated_experience
+from app.services.resume_document import ResumeDocument
+from app.services.resume_parser import ResumeParser
+from app.utils.database import Base, Candidate, upsert
+from benchmarks.synthetic import generate_corpus, generate_texts
+
+DEFAULT_SCALES = (10, 1000, 100000)
+JOB_DESCRIPTION = (
+    "Senior Python Developer\n"
+    "Build and scale REST API services with Python, SQL and Docker on AWS.\n"
+    "5+ years of experience as a software engineer; React and Kubernetes are a plus. "
+    "Bachelor's degree in computer science or engineering."
+)
+
+# Distinct PDFs per parse run; larger scales cycle through the same files
+PDF_POOL = 200
+
+
+@dataclass
+class Case:
+    """A prepared benchmark run: calling it processes `scale` items once
+
+    setup and teardown run around every timed run, outside the timing.
+    """
+    run: Callable[[], None]
+    setup: Optional[Callable[[], None]] = None
+    teardown: Optional[Callable[[], None]] = None
+
+
+def _candidate_infos(texts: List[str]) -> List[Dict]:
+    infos = []
+    for index, text in enumerate(texts):
+        document = ResumeDocument.from_text(text)
+        infos.append({
+            "name": document.name,
+            "email": document.email,
+            "phone": document.phone,
+            "file_path": f"uploads/resume_{index}.pdf",
+            "content_hash": f"{index:064x}",
+            "job_id": "bench",
+            "document": document,
+        })
+    return infos
+
+
+def _scores(count: int, seed: int = 0) -> List[CandidateScore]:
+    rng = random.Random(seed)
+    return [
+        CandidateScore(
+            candidate_id=f"cand_{index:024x}",
+            name=f"Candidate {index}",
+            email=f"candidate{index}@example.com",
+            phone=None,
+            score=round(rng.uniform(0, 100), 1),
+            summary="Rule-based analysis",
+            skills_match=["python", "sql"],
+            experience_years=rng.randint(0, 20),
+            resume_path=f"uploads/resume_{index}.pdf",
+        )
+        for index in range(count)
+    ]
+
+
+def _texts(scale: int) -> List[str]:
+    # Text generation is slower than the regexes, so large scales repeat a pool
+    pool = generate_texts(min(scale, 2000))
+    return [pool[index % len(pool)] for index in range(scale)]
+
+
+def prepare_parse_resume(scale: int) -> Case:
+    parser = ResumeParser()
+    pool = generate_corpus(os.path.join(_WORKDIR, "corpus"), min(scale, PDF_POOL))
+    paths = [pool[index % len(pool)] for index in range(scale)]
+
+    def run():
+        for path in paths:
+            parser.parse_resume(path)
+    return Case(run)
+
+
+def prepare_contact_regex(scale: int) -> Case:
+    texts = _texts(scale)
+
+    def run():
+        for text in texts:
+            find_email(text)
+            find_phone(text)
+    return Case(run)
+
+
+def prepare_experience_regex(scale: int) -> Case:
+    texts = [text.lower() for text in _texts(scale)]
+
+    def run():
+        for text in texts:
+            find_stated_experience(text)
+            find_date_ranges(text)
+    return Case(run)
+
+
+def prepare_resume_document(scale: int) -> Case:
+    texts = _texts(scale)
+
+    def run():
+        for text in texts:
+            ResumeDocument.from_text(text)
+    return Case(run)
+
+
+def prepare_rule_based_analysis(scale: int) -> Case:
+    agent = AIAgent(providers=[])
+    texts = _texts(scale)
+    infos = _candidate_infos(texts)
+
+    def run():
+        for text, info in zip(texts, infos):
+            agent._rule_based_analysis(text, JOB_DESCRIPTION, info)
+    return Case(run)
+
+
+def prepare_rank_candidates(scale: int) -> Case:
+    agent = AIAgent(providers=[])
+    scores = _scores(scale)
+
+    def run():
+        agent.rank_candidates(scores)
+    return Case(run)
+
+
+class _FreshDatabase:
+    """An empty SQLite database file with the app's schema, recreated for every run"""
+
+    def __init__(self, name: str):
+        self.path = os.path.join(_WORKDIR, f"{name}.db")
+        self.engine = None
+        self.Session = None
+
+    def setup(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.engine = create_engine(f"sqlite:///{self.path}")
+        Base.metadata.create_all(bind=self.engine)
+        self.Session = sessionmaker(bind=self.engine)
+
+    def teardown(self):
+        self.engine.dispose()
+
+
+def prepare_db_bulk_insert(scale: int) -> Case:
+    """Core INSERT of Candidate rows in batches, as a bulk import would do"""
+    rows = [
+        {
+            "id": score.candidate_id,
+            "name": score.name,
+            "email": score.email,
+            "score": score.score,
+            "summary": score.summary,
+            "skills_match": str(score.skills_match),
+            "experience_years": score.experience_years,
+            "resume_path": score.resume_path,
+            "job_id": "bench",
+            "content_hash": f"{index:064x}",
+            "created_at": datetime.now(),
+        }
+        for index, score in enumerate(_scores(scale))
+    ]
+    database = _FreshDatabase("bulk_insert")
+
+    def run():
+        with database.Session() as db:
+            for start in range(0, len(rows), 1000):
+                db.execute(insert(Candidate), rows[start:start + 1000])
+            db.commit()
+    return Case(run, database.setup, database.teardown)
+
+
+def prepare_db_upsert(scale: int) -> Case:
+    """Candidate.from_score + upsert per row, the path ingest.py and uploads use"""
+    scores = _scores(scale)
+    database = _FreshDatabase("upsert")
+
+    def run():
+        with database.Session() as db:
+            for start in range(0, len(scores), 500):
+                for index, score in enumerate(scores[start:start + 500], start):
+                    upsert(db, Candidate.from_score(score, job_id="bench", content_hash=f"{index:064x}"))
+                db.commit()
+    return Case(run, database.setup, database.teardown)
+
+
+BENCHMARKS: Dict[str, Callable[[int], Case]] = {
+    "parse_resume": prepare_parse_resume,
+    "contact_regex": prepare_contact_regex,
+    "experience_regex": prepare_experience_regex,
+    "resume_document": prepare_resume_document,
+    "rule_based_analysis": prepare_rule_based_analysis,
+    "rank_candidates": prepare_rank_candidates,
+    "db_bulk_insert": prepare_db_bulk_insert,
+    "db_upsert": prepare_db_upsert,
+}
+
+
+def measure(case: Case, repeats: int, budget: float) -> List[float]:
+    """Time case.run up to repeats times, stopping early once budget seconds are spent"""
+    timings = []
+    spent = 0.0
+    for _ in range(repeats):
+        if case.setup:
+            case.setup()
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            case.run()
+            elapsed = time.perf_counter() - started
+        finally:
+            gc.enable()
+            if case.teardown:
+                case.teardown()
+        timings.append(elapsed)
+        spent += elapsed
+        if spent >= budget:
+            break
+    return timings
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict], baseline: Dict, threshold: float) -> List[Dict]:
+    """Benchmarks whose per-op median grew by more than threshold over the baseline"""
+    previous = {(entry["name"], entry["scale"]): entry for entry in baseline.get("results", [])}
+    regressions = []
+    for entry in results:
+        before = previous.get((entry["name"], entry["scale"]))
+        if before is None or not before["per_op_us"]:
+            continue
+        change = entry["per_op_us"] / before["per_op_us"] - 1
+        entry["baseline_per_op_us"] = before["per_op_us"]
+        entry["change"] = round(change, 4)
+        if change > threshold:
+            regressions.append(entry)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the parser, scorer and ranking hot paths")
+    parser.add_argument("--scales", default=",".join(str(scale) for scale in DEFAULT_SCALES),
+                        help="Comma-separated item counts to run each benchmark at")
+    parser.add_argument("--only", help=f"Comma-separated benchmarks to run ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per benchmark and scale")
+    parser.add_argument("--budget", type=float, default=20.0,
+                        help="Stop repeating a case once its runs took this many seconds")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Allowed per-op slowdown against the baseline (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    scales = [int(scale) for scale in args.scales.split(",") if scale.strip()]
+    names = [name.strip() for name in args.only.split(",")] if args.only else list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"❌ Unknown benchmarks: {', '.join(unknown)}")
+        return 2
+
+    results = []
+    print(f"{'benchmark':<22}{'scale':>8}{'runs':>6}{'median s':>12}{'per op µs':>12}{'ops/s':>14}")
+    for name in names:
+        for scale in scales:
+            case = BENCHMARKS[name](scale)
+            # One untimed pass warms caches and the page cache; large runs warm themselves
+            if scale <= 10000:
+                measure(case, 1, 0)
+            timings = measure(case, args.repeats, args.budget)
+            median = statistics.median(timings)
+            entry = {
+                "name": name,
+                "scale": scale,
+                "runs": len(timings),
+                "median_s": round(median, 6),
+                "min_s": round(min(timings), 6),
+                "max_s": round(max(timings), 6),
+                "per_op_us": round(median / scale * 1e6, 3),
+                "ops_per_s": round(scale / median, 1) if median else None,
+            }
+            results.append(entry)
+            print(f"{name:<22}{scale:>8}{entry['runs']:>6}{median:>12.4f}{entry['per_op_us']:>12.2f}{entry['ops_per_s']:>14,.0f}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        report["baseline"] = {"file": args.baseline, "threshold": args.threshold, "regressions": len(regressions)}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for entry in regressions:
+            print(f"   {entry['name']} @ {entry['scale']}: {entry['baseline_per_op_us']:.2f} → "
+                  f"{entry['per_op_us']:.2f} µs/op ({entry['change']:+.0%})")
+        return 1
+    if args.baseline:
+        print(f"✅ No regressions over {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
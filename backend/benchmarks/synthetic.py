@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Synthetic Resume Generator
+
+Builds realistic resume text and PDFs with PyMuPDF for benchmarks and load
+tests, so no real applicant data is needed. Output is fully determined by the
+seed.
+
+Layouts:
+    classic     single column, 10-11pt, the most common shape
+    two_column  sidebar with contact, skills and education next to experience
+    dense       small type, long experience and project sections
+
+Sizes control how much content is generated: short (~1 page), standard
+(~2 pages) and long (3-5 pages).
+
+Usage:
+    python -m benchmarks.synthetic /tmp/resumes --count 500
+"""
+
+import argparse
+import os
+import random
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+import fitz  # pymupdf
+
+LAYOUTS = ("classic", "two_column", "dense")
+SIZES = {"short": (1, 2, 3), "standard": (3, 4, 6), "long": (6, 9, 10)}  # jobs, bullets per job, projects
+
+# Mix of layouts and sizes seen in a typical applicant pool
+LAYOUT_WEIGHTS = (0.6, 0.25, 0.15)
+SIZE_WEIGHTS = (0.3, 0.55, 0.15)
+
+FIRST_NAMES = (
+    "Aarav", "Maya", "Liam", "Sofia", "Noah", "Priya", "Ethan", "Chloe", "Lucas", "Ananya",
+    "Mateo", "Hannah", "Omar", "Isabella", "Kenji", "Fatima", "Daniel", "Zara", "Leo", "Grace"
+)
+LAST_NAMES = (
+    "Sharma", "Nguyen", "Garcia", "Smith", "Okafor", "Rossi", "Kim", "Muller", "Haddad", "Silva",
+    "Johnson", "Tanaka", "Kowalski", "Patel", "Brown", "Dubois", "Lopez", "Chen", "Ivanova", "Walker"
+)
+COMPANIES = (
+    "Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Digital",
+    "Cyberdyne Systems", "Soylent Tech", "Wonka Analytics", "Tyrell Software", "Vandelay Imports"
+)
+TITLES = (
+    "Software Engineer", "Senior Software Engineer", "Backend Developer", "Full Stack Developer",
+    "Data Analyst", "DevOps Engineer", "Frontend Developer", "Mobile Developer", "Programmer Analyst",
+    "Site Reliability Engineer", "Machine Learning Engineer", "QA Engineer"
+)
+UNIVERSITIES = (
+    "State University", "Institute of Technology", "National University", "City College",
+    "University of Engineering", "Polytechnic University"
+)
+DEGREES = (
+    "Bachelor of Science in Computer Science", "Bachelor of Engineering in Information Technology",
+    "Master of Science in Software Engineering", "Master of Computer Applications",
+    "Bachelor of Technology in Electronics"
+)
+SKILLS = (
+    "Python", "JavaScript", "Java", "C++", "React", "Node", "Angular", "SQL", "MySQL", "PostgreSQL",
+    "MongoDB", "Pandas", "NumPy", "AWS", "Azure", "GCP", "Docker", "Kubernetes", "HTML", "CSS",
+    "Bootstrap", "REST API", "Android", "iOS", "Flutter", "React Native", "Git", "Jenkins", "CI/CD",
+    "Linux", "Go", "Rust", "Kafka", "Redis", "Terraform", "GraphQL", "TypeScript", "Spark"
+)
+VERBS = (
+    "Built", "Designed", "Led", "Migrated", "Optimized", "Automated", "Maintained", "Shipped",
+    "Refactored", "Scaled", "Introduced", "Owned"
+)
+OBJECTS = (
+    "a payments service", "the customer dashboard", "an internal data pipeline", "CI pipelines",
+    "a recommendation engine", "the mobile checkout flow", "search indexing", "a reporting API",
+    "the authentication system", "monitoring and alerting", "a microservices platform"
+)
+OUTCOMES = (
+    "cutting latency by 40%", "serving 2M requests a day", "reducing cloud costs by 25%",
+    "improving test coverage to 85%", "halving deployment time", "supporting 10x traffic growth",
+    "for a team of 8 engineers", "used by 50k monthly users"
+)
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+@dataclass
+class SyntheticResume:
+    name: str
+    email: str
+    phone: str
+    header: List[str]
+    sidebar: List[Tuple[str, List[str]]]
+    body: List[Tuple[str, List[str]]]
+    layout: str = "classic"
+    size: str = "standard"
+    meta: Dict = field(default_factory=dict)
+
+    @property
+    def sections(self) -> List[Tuple[str, List[str]]]:
+        return self.sidebar + self.body
+
+    def text(self) -> str:
+        """Plain-text rendering in reading order, as a PDF extractor would return it"""
+        lines = list(self.header)
+        for heading, section_lines in self.sections:
+            lines.append("")
+            lines.append(heading)
+            lines.extend(section_lines)
+        return "\n".join(lines) + "\n"
+
+
+def _date_range(rng: random.Random, start_year: int, end_year: int, current: bool) -> str:
+    style = rng.random()
+    end = "Present" if current else None
+    if style < 0.4:
+        return f"{rng.choice(MONTHS)} {start_year} - {end or rng.choice(MONTHS) + ' ' + str(end_year)}"
+    if style < 0.7:
+        return f"{start_year} – {end or end_year}"
+    if style < 0.85:
+        return f"{rng.randint(1, 12):02d}/{start_year} - {end or f'{rng.randint(1, 12):02d}/{end_year}'}"
+    return f"{start_year}-{(end or str(end_year)).lower()}"
+
+
+def make_resume(rng: random.Random, size: str = "standard", layout: str = "classic") -> SyntheticResume:
+    """Generate the content of one resume"""
+    jobs, bullets, projects = SIZES[size]
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    name = f"{first} {last}"
+    email = f"{first.lower()}.{last.lower()}{rng.randint(1, 999)}@{rng.choice(('gmail.com', 'outlook.com', 'example.org'))}"
+    phone = rng.choice((
+        f"+1 {rng.randint(200, 999)}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        f"{rng.randint(6, 9)}{rng.randint(100000000, 999999999)}",
+        f"+91{rng.randint(7000000000, 9999999999)}",
+    ))
+    skills = rng.sample(SKILLS, rng.randint(6, 16))
+    title = rng.choice(TITLES)
+
+    # Most recent job first, ending now or a little while ago
+    year = 2025
+    experience = []
+    total_years = 0
+    for index in range(jobs):
+        span = rng.randint(1, 4)
+        start = year - span
+        total_years += span
+        experience.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)}")
+        experience.append(_date_range(rng, start, year, current=index == 0))
+        for _ in range(bullets):
+            experience.append(
+                f"• {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {', '.join(rng.sample(skills, 2))}, {rng.choice(OUTCOMES)}."
+            )
+        year = start - rng.randint(0, 1)
+
+    graduation = year - rng.randint(0, 2)
+    education = [
+        rng.choice(DEGREES),
+        f"{rng.choice(UNIVERSITIES)}, {graduation - 4} - {graduation}",
+    ]
+    project_lines = []
+    for _ in range(projects):
+        project_lines.append(f"{rng.choice(('Open-source', 'Side', 'Hackathon'))} project: {rng.choice(OBJECTS)}")
+        project_lines.append(f"• {rng.choice(VERBS)} it with {', '.join(rng.sample(skills, 3))}.")
+
+    summary = [
+        f"{title} with {total_years}+ years of experience in {', '.join(skills[:3])}.",
+        f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(OUTCOMES)}.",
+    ]
+
+    header = [name, title, f"{email} | {phone} | {rng.choice(('Remote', 'Bengaluru', 'Berlin', 'Austin', 'Toronto'))}"]
+    sidebar = [("Skills", [", ".join(skills[i:i + 4]) for i in range(0, len(skills), 4)]), ("Education", education)]
+    body = [("Summary", summary), ("Experience", experience)]
+    if project_lines:
+        body.append(("Projects", project_lines))
+
+    return SyntheticResume(
+        name=name, email=email, phone=phone, header=header, sidebar=sidebar, body=body,
+        layout=layout, size=size, meta={"experience_years": total_years, "skills": skills}
+    )
+
+
+class _PageWriter:
+    """Writes lines top to bottom in one column, adding pages as they fill"""
+
+    def __init__(self, doc: fitz.Document, rect: fitz.Rect, fontsize: float, pages: List[fitz.Page]):
+        self.doc = doc
+        self.rect = rect
+        self.fontsize = fontsize
+        self.pages = pages
+        self.page_index = 0
+        self.y = rect.y0
+
+    def _page(self) -> fitz.Page:
+        while self.page_index >= len(self.pages):
+            self.pages.append(self.doc.new_page())
+        return self.pages[self.page_index]
+
+    def _wrap(self, line: str, fontsize: float) -> List[str]:
+        max_chars = max(20, int(self.rect.width / (fontsize * 0.5)))
+        words, wrapped, current = line.split(" "), [], ""
+        for word in words:
+            if current and len(current) + len(word) + 1 > max_chars:
+                wrapped.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        wrapped.append(current)
+        return wrapped
+
+    def write(self, line: str, bold: bool = False, scale: float = 1.0):
+        fontsize = self.fontsize * scale
+        for piece in self._wrap(line, fontsize) if line else [""]:
+            if self.y + fontsize * 1.4 > self.rect.y1:
+                self.page_index += 1
+                self.y = self.rect.y0
+            if piece:
+                self._page().insert_text(
+                    (self.rect.x0, self.y + fontsize),
+                    piece,
+                    fontsize=fontsize,
+                    fontname="hebo" if bold else "helv"
+                )
+            self.y += fontsize * 1.4
+
+
+def render_pdf(resume: SyntheticResume, path: str):
+    """Lay the resume out as a PDF at path"""
+    doc = fitz.open()
+    pages: List[fitz.Page] = [doc.new_page()]  # A4-ish default (595 x 842)
+    width, height = pages[0].rect.width, pages[0].rect.height
+    fontsize = 8 if resume.layout == "dense" else 10.5
+
+    if resume.layout == "two_column":
+        sidebar = _PageWriter(doc, fitz.Rect(36, 120, 200, height - 36), fontsize, pages)
+        main = _PageWriter(doc, fitz.Rect(220, 120, width - 36, height - 36), fontsize, pages)
+        header = _PageWriter(doc, fitz.Rect(36, 36, width - 36, 118), fontsize, pages)
+        for index, line in enumerate(resume.header):
+            header.write(line, bold=index == 0, scale=1.8 if index == 0 else 1.0)
+        columns = ((sidebar, resume.sidebar), (main, resume.body))
+    else:
+        margin = 28 if resume.layout == "dense" else 48
+        main = _PageWriter(doc, fitz.Rect(margin, margin, width - margin, height - margin), fontsize, pages)
+        for index, line in enumerate(resume.header):
+            main.write(line, bold=index == 0, scale=1.8 if index == 0 else 1.0)
+        columns = ((main, resume.body[:1] + resume.sidebar + resume.body[1:]),)
+
+    for writer, sections in columns:
+        for heading, lines in sections:
+            writer.write("")
+            writer.write(heading.upper(), bold=True, scale=1.15)
+            for line in lines:
+                writer.write(line)
+
+    doc.set_metadata({"title": f"Resume - {resume.name}", "producer": "synthetic resume generator"})
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+
+def generate_corpus(directory: str, count: int, seed: int = 0) -> List[str]:
+    """Write count resume PDFs with a realistic mix of layouts and sizes; returns their paths"""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index in range(count):
+        layout = rng.choices(LAYOUTS, weights=LAYOUT_WEIGHTS)[0]
+        size = rng.choices(tuple(SIZES), weights=SIZE_WEIGHTS)[0]
+        resume = make_resume(rng, size, layout)
+        path = os.path.join(directory, f"resume_{seed}_{index:06d}_{layout}_{size}.pdf")
+        if not os.path.exists(path):
+            render_pdf(resume, path)
+        paths.append(path)
+    return paths
+
+
+def generate_texts(count: int, seed: int = 0) -> List[str]:
+    """Resume texts with the same mix as generate_corpus, without rendering PDFs"""
+    rng = random.Random(seed)
+    return [
+        make_resume(rng, rng.choices(tuple(SIZES), weights=SIZE_WEIGHTS)[0]).text()
+        for _ in range(count)
+    ]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate synthetic resume PDFs")
+    parser.add_argument("directory", help="Output directory")
+    parser.add_argument("--count", type=int, default=100, help="Number of resumes")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args(argv)
+
+    paths = generate_corpus(args.directory, args.count, args.seed)
+    print(f"📄 Wrote {len(paths)} resumes to {args.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Upload Storage Compaction
+
+Deletes uploaded files no candidate refers to, moves flat uploads from before
+content-addressed storage into their hash shards, applies the resume retention
+policy and compresses cold resumes (see StorageCompactor). Retention and
+compression are off unless RESUME_RETENTION_DAYS, RESUME_RETENTION_SCHEDULED_DAYS
+or RESUME_COMPRESS_AFTER_DAYS are set.
+
+Safe to run while the API and workers are running, e.g. nightly from cron.
+Run from the backend directory, where the uploads directory is.
+
+Usage:
+    python compact.py --dry-run
+    python compact.py
+"""
+
+import argparse
+import os
+import sys
+
+# Add the current directory to Python path to import from app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import settings
+from app.services.compaction import StorageCompactor
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compact the uploads directory and apply resume retention")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be done")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(settings.UPLOAD_DIR):
+        print(f"❌ Upload directory not found: {os.path.abspath(settings.UPLOAD_DIR)}")
+        return 1
+
+    stats = StorageCompactor().run(dry_run=args.dry_run)
+    prefix = "🔎 Dry run" if args.dry_run else "🧹 Compaction complete"
+    print(
+        f"{prefix}: {stats.get('files', 0)} files checked: "
+        f"{stats.get('orphans_removed', 0)} orphans removed, {stats.get('expired', 0)} expired, "
+        f"{stats.get('migrated', 0)} migrated, {stats.get('compressed', 0)} compressed, "
+        f"{stats.get('incoming_removed', 0)} partial uploads removed"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
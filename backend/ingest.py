@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Bulk Resume Ingestion Script
+
+Screens a directory tree or ZIP archive of PDF resumes offline, without going
+through the /api/upload-resumes endpoint. Resumes are parsed in a process pool,
+scored with the AIAgent (rule-based or LLM) under a concurrency limit and
+bulk-inserted into the database in batches.
+
+Progress is checkpointed after every committed batch, so an interrupted run can
+simply be started again with the same arguments and will skip finished files.
+Files that failed (for example on an LLM rate limit) are tried again; files
+rejected as unusable (corrupt, oversized, not a PDF) are not.
+
+Usage:
+    python ingest.py /path/to/resumes --job-id <job id>
+    python ingest.py applications.zip --rule-based --workers 8
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Add the current directory to Python path to import from app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import settings
+from app.services.ai_agent import AIAgent
+from app.services.resume_parser import ResumeParser, ResumeRejected
+from app.services.dedup import DuplicateDetector, MinHasher, reuse_score
+from app.services.feature_store import FeatureStore
+from app.services.thumbnails import THUMBNAIL_FORMATS, render_thumbnails
+from app.utils.database import SessionLocal, Candidate, Job, upsert
+from app.utils.log import configure_logging
+from app.utils.storage import store_file
+
+logger = logging.getLogger("app.ingest")
+
+# Per-process parser and hasher, created once by the pool initializer
+_parser = None
+_hasher = None
+
+
+def _init_parse_worker():
+    global _parser, _hasher
+    _parser = ResumeParser()
+    _hasher = MinHasher()
+
+
+def _parse_worker(file_path: str) -> Dict:
+    resume_data = _parser.parse_resume(file_path)
+    if settings.DEDUP_ENABLED:
+        # Signatures are CPU-bound too, so compute them off the main process
+        resume_data['signature'] = _hasher.signature(resume_data['full_text'])
+    if settings.THUMBNAILS_ENABLED:
+        # The file is already hot in this worker, so render its previews here too
+        try:
+            render_thumbnails(file_path, resume_data['content_hash'], settings.THUMBNAIL_DIR,
+                              settings.THUMBNAIL_WIDTHS, tuple(THUMBNAIL_FORMATS))
+        except Exception as e:
+            logger.warning("Could not render thumbnails", extra={"file": file_path, "error": str(e)})
+    return resume_data
+
+
+def iter_sources(source: str) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """Yield (checkpoint key, display name, zip member) for every PDF in source"""
+    source = os.path.abspath(source)
+
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not info.filename.lower().endswith('.pdf'):
+                    continue
+                key = f"{source}!{info.filename}:{info.file_size}:{info.CRC}"
+                yield key, info.filename, info.filename
+        return
+
+    for root, _, files in os.walk(source):
+        for name in sorted(files):
+            if not name.lower().endswith('.pdf'):
+                continue
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            key = f"{path}:{stat.st_size}:{int(stat.st_mtime)}"
+            yield key, path, None
+
+
+class Checkpoint:
+    """Append-only record of processed files, one JSON object per line
+
+    Files stored ('done') or rejected as unusable ('rejected') count as done;
+    'failed' ones are retried.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[str] = set()
+
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        key = entry['key']
+                    except (ValueError, KeyError):
+                        # A torn last line from an interrupted write
+                        continue
+                    if entry.get('status') == 'failed':
+                        self.done.discard(key)
+                    else:
+                        self.done.add(key)
+
+    def record(self, entries: List[Tuple[str, str]]):
+        with open(self.path, 'a') as f:
+            for key, status in entries:
+                f.write(json.dumps({'key': key, 'status': status}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(key for key, status in entries if status != 'failed')
+
+
+class Progress:
+    """Throughput and ETA reporting"""
+
+    def __init__(self, total: int, interval: float = 5.0):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self.rejected = 0
+        self.started = time.monotonic()
+        self.last_report = 0.0
+
+    def advance(self, failed: bool = False, rejected: bool = False):
+        self.done += 1
+        if failed:
+            self.failed += 1
+        if rejected:
+            self.rejected += 1
+
+    def report(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+
+        elapsed = max(now - self.started, 1e-6)
+        rate = self.done / elapsed
+        remaining = self.total - self.done
+        eta = remaining / rate if rate > 0 else float('inf')
+        eta_text = time.strftime('%H:%M:%S', time.gmtime(eta)) if eta != float('inf') else '--:--:--'
+
+        print(
+            f"📊 {self.done}/{self.total} resumes "
+            f"({self.failed} failed, {self.rejected} rejected) | {rate:.1f} files/s | ETA {eta_text}"
+        )
+
+
+def stage_file(source: str, name: str, member: Optional[str], archive: Optional[zipfile.ZipFile]) -> str:
+    """Copy a source PDF into UPLOAD_DIR so it can be served like an uploaded resume"""
+    if archive is not None:
+        with archive.open(member) as src:
+            return store_file(src, settings.UPLOAD_DIR)
+    with open(name, 'rb') as src:
+        return store_file(src, settings.UPLOAD_DIR)
+
+
+def resolve_job(db, job_id: Optional[str]) -> Job:
+    if job_id:
+        job = db.query(Job).filter(Job.id == job_id).first()
+    else:
+        job = db.query(Job).order_by(Job.created_at.desc()).first()
+
+    if job is None:
+        raise SystemExit("❌ No job description found. Create one first or pass --job-id.")
+    return job
+
+
+def run(args) -> int:
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+
+    db = SessionLocal()
+    job = resolve_job(db, args.job_id)
+    job_text = f"{job.title}\n{job.description}\n{job.requirements}"
+    print(f"🎯 Screening against job: {job.title} ({job.id})")
+
+    checkpoint = Checkpoint(args.checkpoint)
+    sources = list(iter_sources(args.source))
+    pending = [item for item in sources if item[0] not in checkpoint.done]
+    skipped = len(sources) - len(pending)
+    print(f"📁 {len(pending)} resumes to process ({skipped} already in checkpoint)")
+
+    if not pending:
+        db.close()
+        return 0
+
+    ai_agent = AIAgent()
+    if args.rule_based:
+        ai_agent.use_ai = False
+    duplicate_detector = DuplicateDetector()
+    feature_store = FeatureStore()
+    # Loaded up front rather than inside the first batch's write transaction
+    feature_store.ensure_loaded(db)
+
+    archive = zipfile.ZipFile(args.source) if zipfile.is_zipfile(args.source) else None
+    progress = Progress(len(pending))
+    max_in_flight = args.workers * 4
+
+    # Keyed by candidate ID: identical files map to the same row. Nothing is
+    # written before flush, so no write transaction is held while resumes are
+    # scored and the API and workers can keep storing theirs
+    batch: Dict[str, Tuple[Candidate, Dict, Optional[str]]] = {}
+    unsaved: Dict[str, Tuple[Candidate, np.ndarray]] = {}
+    batch_keys: List[Tuple[str, str]] = []
+
+    def store(key: str, candidate_score, resume_data: Dict, duplicate_of: Optional[str] = None):
+        candidate = Candidate.from_score(candidate_score, job_id=job.id, content_hash=resume_data['content_hash'])
+        batch[candidate.id] = (candidate, resume_data, duplicate_of)
+        if settings.DEDUP_ENABLED:
+            unsaved[candidate.id] = (candidate, resume_data['signature'])
+        batch_keys.append((key, 'done'))
+        progress.advance()
+
+    def flush():
+        if batch:
+            # Upserted, so re-ingesting a resume (or the API storing it meanwhile) updates its row
+            for candidate, resume_data, duplicate_of in batch.values():
+                upsert(db, candidate)
+                if settings.DEDUP_ENABLED:
+                    duplicate_detector.record(db, candidate, resume_data, duplicate_of)
+                feature_store.record(db, candidate, resume_data['document'])
+            db.commit()
+        if batch_keys:
+            checkpoint.record(batch_keys)
+        batch.clear()
+        unsaved.clear()
+        batch_keys.clear()
+
+    parse_pool = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_parse_worker)
+    score_pool = ThreadPoolExecutor(max_workers=args.concurrency)
+
+    parsing = {}
+    scoring = {}
+    queue = iter(pending)
+    exhausted = False
+
+    try:
+        while not exhausted or parsing or scoring:
+            # Keep the pools busy without materializing every parse result at once
+            while not exhausted and len(parsing) + len(scoring) < max_in_flight:
+                item = next(queue, None)
+                if item is None:
+                    exhausted = True
+                    break
+                key, name, member = item
+                file_path = stage_file(os.path.abspath(args.source), name, member, archive)
+                parsing[parse_pool.submit(_parse_worker, file_path)] = key
+
+            finished, _ = wait(list(parsing) + list(scoring), return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                if future in parsing:
+                    key = parsing.pop(future)
+                    try:
+                        resume_data = future.result()
+                    except ResumeRejected as e:
+                        # Unusable files fail the same way every time, so they are not retried
+                        print(f"🚫 Rejected {key}: {e}")
+                        batch_keys.append((key, 'rejected'))
+                        progress.advance(rejected=True)
+                        continue
+                    except Exception as e:
+                        print(f"❌ Failed to parse {key}: {e}")
+                        batch_keys.append((key, 'failed'))
+                        progress.advance(failed=True)
+                        continue
+                    resume_data['job_id'] = job.id
+
+                    # Near-duplicates of an already scored resume skip the scoring call
+                    duplicate = None
+                    if settings.DEDUP_ENABLED:
+                        duplicate = duplicate_detector.check(db, resume_data, job.id, unsaved=unsaved)
+                    if duplicate is not None:
+                        store(key, reuse_score(duplicate, resume_data), resume_data, duplicate.id)
+                        continue
+
+                    scoring[score_pool.submit(
+                        ai_agent.analyze_resume_match,
+                        resume_data['full_text'],
+                        job_text,
+                        resume_data
+                    )] = (key, resume_data)
+                else:
+                    key, resume_data = scoring.pop(future)
+                    try:
+                        candidate_score = future.result()
+                    except Exception as e:
+                        print(f"❌ Failed to score {key}: {e}")
+                        batch_keys.append((key, 'failed'))
+                        progress.advance(failed=True)
+                        continue
+
+                    store(key, candidate_score, resume_data)
+
+            if len(batch_keys) >= args.batch_size:
+                flush()
+
+            progress.report()
+
+        flush()
+    except KeyboardInterrupt:
+        print("\n⏹️ Interrupted - saving finished batch before exiting...")
+        for future in list(parsing) + list(scoring):
+            future.cancel()
+        flush()
+        return 130
+    finally:
+        parse_pool.shutdown(cancel_futures=True)
+        score_pool.shutdown(cancel_futures=True)
+        if archive is not None:
+            archive.close()
+        db.close()
+
+    progress.report(force=True)
+    stored = progress.done - progress.failed - progress.rejected
+    print(f"🎉 Ingestion complete: {stored} stored, {progress.rejected} rejected, {progress.failed} failed")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-ingest PDF resumes from a directory or ZIP archive")
+    parser.add_argument("source", help="Directory or ZIP archive containing PDF resumes")
+    parser.add_argument("--job-id", help="Job to screen against (defaults to the most recent job)")
+    parser.add_argument("--checkpoint", default="ingest_checkpoint.jsonl",
+                        help="Checkpoint file used to resume interrupted runs")
+    parser.add_argument("--workers", type=int, default=settings.INGEST_PARSE_WORKERS,
+                        help="Number of PDF parsing processes")
+    parser.add_argument("--concurrency", type=int, default=settings.INGEST_SCORE_CONCURRENCY,
+                        help="Maximum concurrent scoring calls")
+    parser.add_argument("--batch-size", type=int, default=settings.INGEST_BATCH_SIZE,
+                        help="Resumes per database commit")
+    parser.add_argument("--rule-based", action="store_true",
+                        help="Skip LLM calls and use rule-based scoring only")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        print(f"❌ Source not found: {args.source}")
+        return 1
+
+    configure_logging()
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+"""
+Load Test Package
+
+End-to-end load test of the API with local stand-ins for the LLM providers,
+Google Calendar and SMTP, run from the backend directory with
+`python -m loadtest.run`.
+
+Modules:
+    standins: Fake LLM and Calendar servers with injected faults, and an SMTP sink
+    driver: Recruiter-session load driver and latency report
+    run: Starts the stand-ins and the app, drives the load and prints the report
+"""
@@ -0,0 +1,189 @@
+"""
+Recruiter-session load driver
+
+Each virtual recruiter replays what the frontend does: create a job
+description, upload resumes in batches while polling the ranking, and
+schedule interviews for the top candidates. Sessions start at a steady rate
+and overlap, with randomized think time between steps. Every request is timed
+and grouped by endpoint (method plus route template), so the report reads
+like the API rather than like a list of candidate ids.
+"""
+
+import asyncio
+import math
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+JOB_TITLES = ("Senior Python Developer", "Data Engineer", "Backend Engineer", "ML Engineer", "Platform Engineer")
+
+
+@dataclass
+class SessionPlan:
+    """Shape of one recruiter session"""
+    batches: int = 3
+    batch_size: int = 5
+    polls_per_batch: int = 3
+    schedule_top: int = 2
+    think_time: float = 1.0  # Mean seconds between steps, exponentially distributed
+
+
+@dataclass
+class Sample:
+    endpoint: str
+    status: int  # 0 when the request failed without a response
+    seconds: float
+
+
+@dataclass
+class LoadStats:
+    samples: List[Sample] = field(default_factory=list)
+    sessions_started: int = 0
+    sessions_completed: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    finished: Optional[float] = None
+
+    def record(self, endpoint: str, status: int, seconds: float):
+        self.samples.append(Sample(endpoint, status, seconds))
+
+    def report(self) -> Dict:
+        """Throughput and latency percentiles per endpoint and overall"""
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        by_endpoint: Dict[str, List[Sample]] = defaultdict(list)
+        for sample in self.samples:
+            by_endpoint[sample.endpoint].append(sample)
+
+        endpoints = {name: _summarize(samples, elapsed) for name, samples in sorted(by_endpoint.items())}
+        return {
+            "duration_s": round(elapsed, 2),
+            "sessions_started": self.sessions_started,
+            "sessions_completed": self.sessions_completed,
+            "overall": _summarize(self.samples, elapsed),
+            "endpoints": endpoints
+        }
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _summarize(samples: List[Sample], elapsed: float) -> Dict:
+    latencies = sorted(sample.seconds * 1000 for sample in samples)
+    statuses: Dict[str, int] = defaultdict(int)
+    for sample in samples:
+        statuses[str(sample.status)] += 1
+    errors = sum(count for status, count in statuses.items() if status == "0" or int(status) >= 500)
+    return {
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 1),
+        "p95_ms": round(percentile(latencies, 0.95), 1),
+        "p99_ms": round(percentile(latencies, 0.99), 1),
+        "max_ms": round(latencies[-1], 1) if latencies else 0.0,
+        "errors": errors,
+        "rejected": statuses.get("429", 0),
+        "statuses": dict(sorted(statuses.items()))
+    }
+
+
+class RecruiterSession:
+    """One recruiter working through a hiring round"""
+
+    def __init__(self, client: httpx.AsyncClient, stats: LoadStats, plan: SessionPlan, resumes: List[bytes],
+                 user: str, rng: random.Random):
+        self.client = client
+        self.stats = stats
+        self.plan = plan
+        self.resumes = resumes
+        self.user = user
+        self.rng = rng
+        self.candidates_etag = None
+        self.candidates: List[Dict] = []
+
+    async def request(self, method: str, endpoint: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        headers = {"X-User-Id": self.user, **kwargs.pop("headers", {})}
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(endpoint, 0, time.perf_counter() - started)
+            return None
+        self.stats.record(endpoint, response.status_code, time.perf_counter() - started)
+        return response
+
+    async def think(self):
+        if self.plan.think_time:
+            await asyncio.sleep(self.rng.expovariate(1 / self.plan.think_time))
+
+    async def run(self):
+        self.stats.sessions_started += 1
+        title = self.rng.choice(JOB_TITLES)
+        await self.request("POST", "POST /api/job-description", "/api/job-description", json={
+            "title": title,
+            "description": f"We are hiring a {title} to build and run our hiring platform.",
+            "requirements": "Python, FastAPI, SQL, Docker, AWS, 5+ years of experience",
+            "location": "Remote",
+            "department": "Engineering"
+        })
+
+        for _ in range(self.plan.batches):
+            await self.think()
+            await self.upload_batch()
+            for _ in range(self.plan.polls_per_batch):
+                await self.think()
+                await self.poll_candidates()
+
+        if self.plan.schedule_top and self.candidates:
+            await self.think()
+            candidate_ids = [candidate["candidate_id"] for candidate in self.candidates[:self.plan.schedule_top]]
+            await self.request("POST", "POST /api/schedule-interviews", "/api/schedule-interviews", json=candidate_ids)
+
+        self.stats.sessions_completed += 1
+
+    async def upload_batch(self):
+        chosen = self.rng.sample(range(len(self.resumes)), min(self.plan.batch_size, len(self.resumes)))
+        files = [("files", (f"resume_{index}.pdf", self.resumes[index], "application/pdf")) for index in chosen]
+        response = await self.request("POST", "POST /api/upload-resumes", "/api/upload-resumes", files=files)
+
+        # With the screening queue enabled, uploads answer 202 and are followed until done
+        if response is not None and response.status_code == 202:
+            status_url = response.json()["status_url"]
+            while True:
+                await asyncio.sleep(0.5)
+                progress = await self.request("GET", "GET /api/jobs/{id}", status_url)
+                if progress is None or progress.status_code != 200 or progress.json()["status"] == "done":
+                    break
+
+    async def poll_candidates(self):
+        # Like a browser, revalidate with the ETag of the last ranking seen
+        headers = {"If-None-Match": self.candidates_etag} if self.candidates_etag else {}
+        response = await self.request("GET", "GET /api/candidates", "/api/candidates", headers=headers)
+        if response is not None and response.status_code == 200:
+            self.candidates_etag = response.headers.get("etag")
+            self.candidates = response.json()["candidates"]
+
+
+async def drive(base_url: str, resumes: List[bytes], sessions: int, arrival_rate: float,
+                plan: SessionPlan, concurrency: int = 50, seed: int = 0, timeout: float = 120.0) -> LoadStats:
+    """Start sessions at arrival_rate per second until `sessions` have run; returns the collected stats"""
+    rng = random.Random(seed)
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        tasks = []
+        for index in range(sessions):
+            session = RecruiterSession(client, stats, plan, resumes, f"recruiter-{index}", random.Random(rng.random()))
+            tasks.append(asyncio.create_task(session.run()))
+            if arrival_rate:
+                await asyncio.sleep(rng.expovariate(arrival_rate))
+        await asyncio.gather(*tasks)
+    stats.finished = time.perf_counter()
+    return stats
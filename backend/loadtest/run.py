@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+End-to-End Load Test
+
+Runs the FastAPI app (uvicorn, in a subprocess) against local stand-ins for
+every external service: a fake LLM server in place of Gemini or OpenAI, a
+fake Google Calendar API and an SMTP sink (see loadtest/standins.py). Then
+replays overlapping recruiter sessions against it (see loadtest/driver.py)
+and reports throughput and p50/p95/p99 latency per endpoint.
+
+The app runs in a temporary directory with its own SQLite database and
+uploads; nothing in the working tree is touched. With --queue, uploads go
+through the screening queue and worker.py processes run alongside the app.
+
+Note that the app keeps a single current job, so concurrent sessions replace
+each other's job description just as concurrent recruiters would today.
+
+Exits with status 1 if any endpoint answered with errors (5xx or no
+response), so it can gate CI. Needs the dev requirements
+(pip install -r requirements-dev.txt). Run from the backend directory.
+
+Usage:
+    python -m loadtest.run --sessions 20 --arrival-rate 2
+    python -m loadtest.run --llm-latency-ms 800 --llm-429-rate 0.05 --output load.json
+    python -m loadtest.run --provider gemini --queue --worker-processes 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import httpx
+
+# Add the backend directory to Python path to import the harness and corpus generator
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from benchmarks.synthetic import generate_corpus
+from loadtest.driver import SessionPlan, drive
+from loadtest.standins import BackgroundServer, FaultProfile, SMTPSink, create_calendar_app, create_llm_app
+
+HOST = "127.0.0.1"
+
+
+def app_environment(args, workdir: str) -> dict:
+    """Environment pointing the app at the stand-ins"""
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": BACKEND_DIR,
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'hr_agent.db')}",
+        "THUMBNAIL_DIR": os.path.join(workdir, "thumbnails"),
+        "LOG_LEVEL": args.log_level,
+        "LLM_PROVIDERS": args.provider,
+        "GEMINI_API_KEY": "loadtest",
+        "GEMINI_API_ENDPOINT": f"http://{HOST}:{args.llm_port}",
+        "OPENAI_API_KEY": "loadtest",
+        "OPENAI_BASE_URL": f"http://{HOST}:{args.llm_port}/v1",
+        "GOOGLE_CALENDAR_API_ENDPOINT": f"http://{HOST}:{args.calendar_port}/calendar/v3/",
+        "SMTP_HOST": HOST,
+        "SMTP_PORT": str(args.smtp_port),
+        "SMTP_STARTTLS": "false",
+        "EMAIL_USER": "hr@loadtest.example",
+        "EMAIL_PASSWORD": "",
+        "SCREENING_QUEUE_ENABLED": "true" if args.queue else "false",
+    })
+    return env
+
+
+def wait_until_healthy(base_url: str, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited with status {process.returncode} during startup")
+        try:
+            if httpx.get(f"{base_url}/api/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError("App did not become healthy in time")
+
+
+def print_report(report: dict):
+    print(f"\n{'endpoint':<34}{'requests':>9}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}{'429':>6}")
+    rows = list(report["endpoints"].items()) + [("overall", report["overall"])]
+    for name, entry in rows:
+        print(f"{name:<34}{entry['requests']:>9}{entry['throughput_rps']:>9.2f}{entry['p50_ms']:>10.1f}"
+              f"{entry['p95_ms']:>10.1f}{entry['p99_ms']:>10.1f}{entry['errors']:>8}{entry['rejected']:>6}")
+    print(f"\n⏱️  {report['sessions_completed']}/{report['sessions_started']} sessions completed in {report['duration_s']}s")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the app against local stand-ins for its external services")
+    parser.add_argument("--sessions", type=int, default=10, help="Recruiter sessions to run")
+    parser.add_argument("--arrival-rate", type=float, default=1.0, help="New sessions per second")
+    parser.add_argument("--batches", type=int, default=3, help="Upload batches per session")
+    parser.add_argument("--batch-size", type=int, default=5, help="Resumes per upload batch")
+    parser.add_argument("--polls", type=int, default=3, help="Candidate list polls after each batch")
+    parser.add_argument("--schedule-top", type=int, default=2, help="Top candidates to schedule per session")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean seconds between session steps")
+    parser.add_argument("--resumes", type=int, default=50, help="Synthetic resumes to upload from")
+    parser.add_argument("--seed", type=int, default=0)
+
+    parser.add_argument("--provider", choices=("openai", "gemini"), default="openai",
+                        help="Which provider client talks to the fake LLM server")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=100.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Fraction of LLM calls answered 503")
+    parser.add_argument("--llm-429-rate", type=float, default=0.0, help="Fraction of LLM calls answered 429")
+    parser.add_argument("--calendar-latency-ms", type=float, default=150.0)
+    parser.add_argument("--calendar-error-rate", type=float, default=0.0)
+    parser.add_argument("--smtp-latency-ms", type=float, default=50.0)
+
+    parser.add_argument("--queue", action="store_true", help="Screen uploads through the queue and worker.py")
+    parser.add_argument("--worker-processes", type=int, default=1)
+    parser.add_argument("--app-port", type=int, default=8600)
+    parser.add_argument("--llm-port", type=int, default=8601)
+    parser.add_argument("--calendar-port", type=int, default=8602)
+    parser.add_argument("--smtp-port", type=int, default=8625)
+    parser.add_argument("--log-level", default="WARNING", help="Log level of the app and workers")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary working directory")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="hr-agent-load-")
+    os.makedirs(os.path.join(workdir, "uploads"))
+    print(f"📁 Working directory: {workdir}")
+
+    print(f"📄 Rendering {args.resumes} synthetic resumes...")
+    resumes = []
+    for path in generate_corpus(os.path.join(workdir, "corpus"), args.resumes, args.seed):
+        with open(path, "rb") as f:
+            resumes.append(f.read())
+
+    llm_profile = FaultProfile(args.llm_latency_ms, args.llm_jitter_ms, args.llm_error_rate, args.llm_429_rate,
+                               seed=args.seed)
+    calendar_profile = FaultProfile(args.calendar_latency_ms, args.calendar_latency_ms / 3, args.calendar_error_rate,
+                                    seed=args.seed)
+    llm_server = BackgroundServer(create_llm_app(llm_profile), HOST, args.llm_port)
+    calendar_server = BackgroundServer(create_calendar_app(calendar_profile), HOST, args.calendar_port)
+    smtp_sink = SMTPSink(HOST, args.smtp_port, args.smtp_latency_ms)
+
+    processes = []
+    try:
+        llm_server.start()
+        calendar_server.start()
+        smtp_sink.start()
+
+        env = app_environment(args, workdir)
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", HOST, "--port", str(args.app_port),
+             "--log-level", "warning"],
+            cwd=workdir, env=env
+        ))
+        if args.queue:
+            processes.append(subprocess.Popen(
+                [sys.executable, os.path.join(BACKEND_DIR, "worker.py"), "--processes", str(args.worker_processes)],
+                cwd=workdir, env=env
+            ))
+
+        base_url = f"http://{HOST}:{args.app_port}"
+        wait_until_healthy(base_url, processes[0])
+        print(f"🚀 App up at {base_url}; running {args.sessions} sessions at {args.arrival_rate}/s")
+
+        plan = SessionPlan(args.batches, args.batch_size, args.polls, args.schedule_top, args.think_time)
+        stats = asyncio.run(drive(base_url, resumes, args.sessions, args.arrival_rate, plan, seed=args.seed))
+        report = stats.report()
+        print_report(report)
+
+        report["standins"] = {
+            "llm": httpx.get(f"http://{HOST}:{args.llm_port}/stats").json(),
+            "calendar": httpx.get(f"http://{HOST}:{args.calendar_port}/stats").json(),
+            "smtp": smtp_sink.stats()
+        }
+        print(f"🧪 Stand-ins served: {json.dumps(report['standins'])}")
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        smtp_sink.stop()
+        calendar_server.stop()
+        llm_server.stop()
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        report["meta"] = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "config": vars(args)
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report written to {args.output}")
+
+    failing = {name: entry["errors"] for name, entry in report["endpoints"].items() if entry["errors"]}
+    if failing:
+        print(f"❌ Requests failed: {json.dumps(failing)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
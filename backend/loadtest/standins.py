@@ -0,0 +1,308 @@
+"""
+Local stand-ins for the external services the app talks to
+
+- A fake LLM server speaking the parts of the OpenAI chat completions and
+  Gemini REST APIs the providers use, streaming included
+- A fake Google Calendar API (event insert, free/busy, calendar list)
+- An SMTP sink built on aiosmtpd that accepts and counts every message
+
+The HTTP stand-ins inject latency, server errors and 429 rate limiting
+according to a FaultProfile, and report what they served at GET /stats.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class FaultProfile:
+    """Latency and failure behaviour of a stand-in
+
+    latency_ms is the mean response time and jitter_ms its standard
+    deviation; error_rate and rate_limit_rate are the fractions of requests
+    answered with a 503 and a 429 respectively.
+    """
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: int = 1
+    seed: Optional[int] = None
+
+
+class _FaultInjector:
+    def __init__(self, profile: FaultProfile):
+        self.profile = profile
+        self.rng = random.Random(profile.seed)
+        self.counts = Counter()
+
+    async def __call__(self, kind: str) -> Optional[JSONResponse]:
+        """Sleep for the sampled latency; returns a failure response if this request should fail"""
+        self.counts[kind] += 1
+        delay = max(0.0, self.rng.gauss(self.profile.latency_ms, self.profile.jitter_ms)) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+
+        draw = self.rng.random()
+        if draw < self.profile.rate_limit_rate:
+            self.counts["rate_limited"] += 1
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"code": 429, "message": "Rate limit exceeded", "status": "RESOURCE_EXHAUSTED"}},
+                headers={"Retry-After": str(self.profile.retry_after)}
+            )
+        if draw < self.profile.rate_limit_rate + self.profile.error_rate:
+            self.counts["errors"] += 1
+            return JSONResponse(
+                status_code=503,
+                content={"error": {"code": 503, "message": "Service unavailable", "status": "UNAVAILABLE"}}
+            )
+        return None
+
+    def stats(self) -> Dict:
+        return dict(self.counts)
+
+
+def _analysis(prompt: str) -> str:
+    """Deterministic analysis JSON for a prompt, in the shape the structured-output schemas ask for"""
+    digest = int(hashlib.sha256(prompt.encode()).hexdigest(), 16)
+    return json.dumps({
+        "score": round((digest % 10001) / 100, 1),
+        "summary": "Stand-in analysis",
+        "skills_match": ["Python", "SQL"][:digest % 3],
+        "experience_years": digest % 15,
+        "strengths": ["Relevant experience"],
+        "concerns": [],
+        "recommendation": "review"
+    })
+
+
+_EMAIL_TEXT = "Thank you for your application. We would like to invite you to an interview."
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _chunks(text: str, size: int = 24):
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def create_llm_app(profile: FaultProfile) -> FastAPI:
+    """Fake OpenAI and Gemini endpoints
+
+    Streamed requests get an analysis (the providers only stream analyses);
+    plain requests get the text of an interview email.
+    """
+    app = FastAPI(title="Fake LLM")
+    inject = _FaultInjector(profile)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        failure = await inject("openai")
+        if failure:
+            return failure
+
+        prompt = body["messages"][-1]["content"]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        model = body.get("model", "gpt-4o-mini")
+
+        if not body.get("stream"):
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": _EMAIL_TEXT}}],
+                "usage": {"prompt_tokens": _tokens(prompt), "completion_tokens": _tokens(_EMAIL_TEXT),
+                          "total_tokens": _tokens(prompt) + _tokens(_EMAIL_TEXT)}
+            }
+
+        text = _analysis(prompt)
+
+        def events():
+            base = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model}
+            for piece in _chunks(text):
+                chunk = {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield f"data: {json.dumps({**base, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})}\n\n"
+            if (body.get("stream_options") or {}).get("include_usage"):
+                usage = {"prompt_tokens": _tokens(prompt), "completion_tokens": _tokens(text),
+                         "total_tokens": _tokens(prompt) + _tokens(text)}
+                yield f"data: {json.dumps({**base, 'choices': [], 'usage': usage})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    # Gemini paths look like /v1beta/models/gemini-1.5-flash:streamGenerateContent
+    @app.post("/{version}/models/{model_method}")
+    async def gemini(version: str, model_method: str, request: Request):
+        body = await request.json()
+        failure = await inject("gemini")
+        if failure:
+            return failure
+
+        prompt = "".join(part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", []))
+        streaming = model_method.endswith(":streamGenerateContent")
+        text = _analysis(prompt) if streaming else _EMAIL_TEXT
+
+        def response(piece: str, finished: bool) -> Dict:
+            candidate = {"content": {"parts": [{"text": piece}], "role": "model"}, "index": 0}
+            if finished:
+                candidate["finishReason"] = "STOP"
+            return {
+                "candidates": [candidate],
+                "usageMetadata": {"promptTokenCount": _tokens(prompt), "candidatesTokenCount": _tokens(text),
+                                  "totalTokenCount": _tokens(prompt) + _tokens(text)}
+            }
+
+        if not streaming:
+            return response(text, True)
+
+        # Without alt=sse, as the REST transport asks, the stream is one JSON array sent piecewise
+        def elements():
+            pieces = list(_chunks(text))
+            for index, piece in enumerate(pieces):
+                yield ("[" if index == 0 else ",\r\n") + json.dumps(response(piece, index == len(pieces) - 1))
+            yield "]"
+
+        return StreamingResponse(elements(), media_type="application/json")
+
+    @app.get("/stats")
+    async def stats():
+        return inject.stats()
+
+    return app
+
+
+def create_calendar_app(profile: FaultProfile) -> FastAPI:
+    """Fake Google Calendar v3 API, mounted at /calendar/v3"""
+    app = FastAPI(title="Fake Google Calendar")
+    inject = _FaultInjector(profile)
+    events: Dict[str, Dict] = {}
+
+    @app.post("/calendar/v3/calendars/{calendar_id}/events")
+    async def insert_event(calendar_id: str, request: Request):
+        body = await request.json()
+        failure = await inject("events_insert")
+        if failure:
+            return failure
+
+        event_id = uuid.uuid4().hex
+        now = datetime.now(timezone.utc).isoformat()
+        event = {
+            **body,
+            "id": event_id,
+            "status": "confirmed",
+            "htmlLink": f"https://calendar.example/event?eid={event_id}",
+            "created": now,
+            "updated": now
+        }
+        if "conferenceData" in body:
+            event["conferenceData"] = {
+                **body["conferenceData"],
+                "entryPoints": [{"entryPointType": "video", "uri": f"https://meet.example/{event_id[:10]}"}]
+            }
+        events[event_id] = event
+        return event
+
+    @app.post("/calendar/v3/freeBusy")
+    async def free_busy(request: Request):
+        body = await request.json()
+        failure = await inject("freebusy")
+        if failure:
+            return failure
+        return {
+            "kind": "calendar#freeBusy",
+            "timeMin": body.get("timeMin"),
+            "timeMax": body.get("timeMax"),
+            "calendars": {item["id"]: {"busy": []} for item in body.get("items", [])}
+        }
+
+    @app.get("/calendar/v3/users/me/calendarList")
+    async def calendar_list():
+        failure = await inject("calendar_list")
+        if failure:
+            return failure
+        return {"kind": "calendar#calendarList",
+                "items": [{"id": "primary", "summary": "Load test", "primary": True}]}
+
+    @app.get("/stats")
+    async def stats():
+        return {**inject.stats(), "events": len(events)}
+
+    return app
+
+
+class SMTPSink:
+    """Accepts every message on host:port and keeps count
+
+    Needs aiosmtpd (see requirements-dev.txt). No STARTTLS or AUTH is offered, so
+    the app must run with SMTP_STARTTLS=false and no EMAIL_PASSWORD.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8625, latency_ms: float = 0.0):
+        from aiosmtpd.controller import Controller
+
+        self.messages = 0
+        self.recipients = 0
+        self.latency = latency_ms / 1000
+        self.controller = Controller(self, hostname=host, port=port)
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.messages += 1
+        self.recipients += len(envelope.rcpt_tos)
+        return "250 Message accepted for delivery"
+
+    def start(self):
+        self.controller.start()
+
+    def stop(self):
+        self.controller.stop()
+
+    def stats(self) -> Dict:
+        return {"messages": self.messages, "recipients": self.recipients}
+
+
+class BackgroundServer:
+    """Runs an ASGI app with uvicorn on a daemon thread
+
+    Idle connections are kept open for a while, as the real APIs do; clients
+    such as httplib2 reuse them without retrying if they were closed.
+    """
+
+    def __init__(self, app, host: str, port: int, keep_alive: int = 75):
+        config = uvicorn.Config(app, host=host, port=port, log_level="warning", timeout_keep_alive=keep_alive)
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def start(self, timeout: float = 10.0):
+        self.thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if not self.thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("Stand-in server did not start")
+            time.sleep(0.05)
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
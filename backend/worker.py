@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Screening Worker
+
+Runs the resume screening pipeline for jobs queued by /api/upload-resumes when
+SCREENING_QUEUE_ENABLED is set. Workers claim tasks from the database, so any
+number of them can run next to the API, on the same machine or elsewhere, and
+a worker that dies only delays its claimed tasks until their lease expires.
+
+Each worker process screens up to --concurrency resumes at a time. SIGINT or
+SIGTERM stops claiming new work and lets the running tasks finish.
+
+Usage:
+    python worker.py
+    python worker.py --processes 4 --concurrency 8
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from prometheus_client import start_http_server
+
+# Add the current directory to Python path to import from app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import settings
+from app.services.ai_agent import AIAgent
+from app.services.dedup import DuplicateDetector
+from app.services.feature_store import FeatureStore
+from app.services.resume_document import job_text
+from app.services.resume_parser import ResumeParser, ResumeRejected
+from app.services.screening import ScreeningPipeline, ScreeningQueue
+from app.services.thumbnails import ThumbnailService
+from app.utils.database import SessionLocal, Job, ScreeningJob, ScreeningTask, engine
+from app.utils.tracing import start_trace
+
+logger = logging.getLogger("app.worker")
+
+
+def run_task(pipeline: ScreeningPipeline, queue: ScreeningQueue, task_id: int):
+    with start_trace(f"task {task_id}") as trace:
+        _run_task(pipeline, queue, task_id)
+
+    level = logging.WARNING if trace.duration_ms >= settings.TRACE_SLOW_MS else logging.DEBUG
+    logger.log(level, "Task finished", extra={
+        "trace_id": trace.trace_id,
+        "task_id": task_id,
+        "duration_ms": round(trace.duration_ms, 1),
+        **{f"{name}_ms": round(ms, 1) for name, ms in trace.totals().items()}
+    })
+
+
+def _run_task(pipeline: ScreeningPipeline, queue: ScreeningQueue, task_id: int):
+    db = SessionLocal()
+    try:
+        task = db.get(ScreeningTask, task_id)
+        screening_job = db.get(ScreeningJob, task.screening_job_id)
+        job = db.get(Job, screening_job.job_id)
+        if job is None:
+            queue.finish(db, task, "failed", error="Job description no longer exists")
+            return
+
+        try:
+            candidate_score = pipeline.process(task.file_path, db, job.id, job_text(job))
+        except ResumeRejected as e:
+            db.rollback()
+            queue.finish(db, task, "skipped", error=str(e))
+            return
+        except Exception as e:
+            db.rollback()
+            retry = task.attempts < settings.SCREENING_MAX_ATTEMPTS
+            logger.warning("Failed to screen resume", extra={"file": task.filename, "attempt": task.attempts, "error": str(e)})
+            queue.finish(db, task, "queued" if retry else "failed", error=str(e))
+            return
+
+        queue.finish(db, task, "done", candidate_score)
+        logger.debug("Screened resume", extra={"file": task.filename, "score": candidate_score.score})
+    finally:
+        db.close()
+
+
+def run_worker(worker_id: str, concurrency: int, poll_interval: float, stop, metrics_port: int = 0):
+    """Claim and screen tasks until stop is set"""
+    # Connections must not be shared with the parent process
+    engine.dispose(close=False)
+
+    if metrics_port:
+        start_http_server(metrics_port)
+        logger.info("Serving metrics", extra={"worker": worker_id, "port": metrics_port})
+
+    pipeline = ScreeningPipeline(
+        ResumeParser(), AIAgent(), DuplicateDetector(), FeatureStore(), ThumbnailService()
+    )
+    queue = ScreeningQueue()
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="screen")
+    in_flight = set()
+    last_release = 0.0
+    logger.info("Worker started", extra={"worker": worker_id, "concurrency": concurrency})
+
+    try:
+        while not stop.is_set():
+            db = SessionLocal()
+            try:
+                if time.monotonic() - last_release > 30:
+                    released = queue.release_expired(db)
+                    if released:
+                        logger.warning("Released tasks with expired leases", extra={"count": released})
+                    last_release = time.monotonic()
+
+                free = concurrency - len(in_flight)
+                task_ids = queue.claim(db, worker_id, free) if free > 0 else []
+            finally:
+                db.close()
+
+            for task_id in task_ids:
+                in_flight.add(executor.submit(run_task, pipeline, queue, task_id))
+
+            if in_flight:
+                done, in_flight = wait(in_flight, timeout=0 if task_ids else poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        logger.error("Worker task crashed", extra={"error": str(future.exception())})
+            elif not task_ids:
+                stop.wait(poll_interval)
+    finally:
+        logger.info("Worker stopping", extra={"worker": worker_id, "running": len(in_flight)})
+        executor.shutdown(wait=True)
+        if pipeline.thumbnail_service is not None:
+            pipeline.thumbnail_service.shutdown()
+
+
+def _child(worker_id: str, concurrency: int, poll_interval: float, stop, metrics_port: int):
+    # The parent handles signals and tells children to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    run_worker(worker_id, concurrency, poll_interval, stop, metrics_port)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run resume screening workers for the job queue")
+    parser.add_argument("--processes", type=int, default=settings.WORKER_PROCESSES,
+                        help="Number of worker processes")
+    parser.add_argument("--concurrency", type=int, default=settings.WORKER_CONCURRENCY,
+                        help="Resumes screened at once per process")
+    parser.add_argument("--poll-interval", type=float, default=settings.WORKER_POLL_INTERVAL,
+                        help="Seconds between queue polls when idle")
+    parser.add_argument("--metrics-port", type=int, default=settings.WORKER_METRICS_PORT,
+                        help="Serve Prometheus metrics from this port (one per process, counting up)")
+    args = parser.parse_args(argv)
+
+    stop = multiprocessing.Event()
+
+    def request_stop(signum, frame):
+        logger.info("Stopping workers after their running tasks")
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    base_id = f"{socket.gethostname()}:{os.getpid()}"
+    if args.processes <= 1:
+        run_worker(base_id, args.concurrency, args.poll_interval, stop, args.metrics_port)
+        return 0
+
+    workers = [
+        multiprocessing.Process(
+            target=_child,
+            args=(
+                f"{base_id}/{index}", args.concurrency, args.poll_interval, stop,
+                args.metrics_port + index if args.metrics_port else 0
+            ),
+            name=f"screening-worker-{index}"
+        )
+        for index in range(args.processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -67,17 +67,37 @@ function App() {
     setError(null);
     
     try {
-      const response = await apiService.uploadResumes(formData);
+      const response = await apiService.startBatch(formData);
       console.log('Resumes uploaded:', response.data);
       
-      setCandidates(response.data.candidates || response.data);
+      // Show candidates as they are scored instead of waiting for the whole batch
+      setCandidates([]);
       setCurrentStep('candidate-review');
       
-      // Show success message
-      const candidateCount = response.data.candidates?.length || response.data.length || 0;
-      setTimeout(() => {
-        alert(`Successfully processed ${candidateCount} resumes!`);
-      }, 500);
+      const events = new EventSource(apiService.batchEventsUrl(response.data.batch_id));
+      
+      events.addEventListener('scored', (event) => {
+        const { candidate } = JSON.parse(event.data);
+        setCandidates(prev => [
+          ...prev.filter(c => c.candidate_id !== candidate.candidate_id),
+          candidate
+        ].sort((a, b) => b.score - a.score));
+      });
+      
+      events.addEventListener('done', (event) => {
+        const { processed, skipped } = JSON.parse(event.data);
+        events.close();
+        setTimeout(() => {
+          alert(`Successfully processed ${processed} resumes${skipped ? ` (${skipped} skipped)` : ''}!`);
+        }, 500);
+      });
+      
+      events.onerror = () => {
+        // The browser reconnects on its own; a closed stream means the batch is gone
+        if (events.readyState === EventSource.CLOSED) {
+          setError('Lost connection to the screening progress stream.');
+        }
+      };
       
     } catch (error) {
       console.error('Error uploading resumes:', error);
@@ -1,4 +1,5 @@
 import React, { useState } from 'react';
+import { apiService } from '../services/api';
 
 const CandidatePanel = ({ candidates, onSelectCandidates }) => {
   const [selectedCandidates, setSelectedCandidates] = useState(new Set());
@@ -98,6 +99,13 @@ const CandidatePanel = ({ candidates, onSelectCandidates }) => {
                     onChange={() => toggleCandidateSelection(candidate.candidate_id)}
                     onClick={(e) => e.stopPropagation()}
                   />
+                  <img
+                    className="candidate-thumbnail"
+                    src={apiService.thumbnailUrl(candidate.candidate_id)}
+                    alt={`${candidate.name} resume preview`}
+                    loading="lazy"
+                    onError={(e) => { e.target.style.display = 'none'; }}
+                  />
                   <div>
                     <h3>{candidate.name}</h3>
                     <div className="candidate-email">{candidate.email}</div>
@@ -20,9 +20,21 @@ export const apiService = {
     },
   }),
   
+  // Background screening: returns a batch id whose progress streams over SSE
+  startBatch: (formData) => api.post('/batches', formData, {
+    headers: {
+      'Content-Type': 'multipart/form-data',
+    },
+  }),
+  batchEventsUrl: (batchId) => `${API_BASE_URL}/batches/${batchId}/events`,
+  
   // Candidates
   getCandidates: () => api.get('/candidates'),
   
+  // Resume preview image, cached by the browser for as long as the resume is unchanged
+  thumbnailUrl: (candidateId, width = 160) =>
+    `${API_BASE_URL}/candidates/${encodeURIComponent(candidateId)}/thumbnail?width=${width}`,
+  
   // Interview Scheduling
   scheduleInterviews: (candidateIds) => api.post('/schedule-interviews', candidateIds),
   